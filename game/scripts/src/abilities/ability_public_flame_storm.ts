@@ -8,12 +8,13 @@
  */
 
 import { BaseAbility, BaseModifier, registerAbility, registerModifier } from '../utils/dota_ts_adapter';
+import { GetAbilityValue } from '../utils/ability_values';
 import { CustomStats } from '../systems/CustomStats';
 
 @registerAbility('ability_public_flame_storm')
 export class ability_public_flame_storm extends BaseAbility {
     GetAOERadius(): number {
-        return this.GetSpecialValueFor('radius') || 350;
+        return GetAbilityValue(this, 'radius') || 350;
     }
 
     Precache(context: CScriptPrecacheContext) {
@@ -32,10 +33,10 @@ export class ability_public_flame_storm extends BaseAbility {
         const caster = this.GetCaster();
         const targetPoint = this.GetCursorPosition();
 
-        const radius = this.GetSpecialValueFor('radius') || 350;
-        const dmg_multiplier = this.GetSpecialValueFor('dmg_multiplier') || 4;
-        const wave_count = this.GetSpecialValueFor('wave_count') || 3;
-        const wave_interval = this.GetSpecialValueFor('wave_interval') || 0.8;
+        const radius = GetAbilityValue(this, 'radius') || 350;
+        const dmg_multiplier = GetAbilityValue(this, 'dmg_multiplier') || 4;
+        const wave_count = GetAbilityValue(this, 'wave_count') || 3;
+        const wave_interval = GetAbilityValue(this, 'wave_interval') || 0.8;
 
         // 播放施法音效 — Phoenix 火灵施放的「嗖」声（蓄力感）
         EmitSoundOnLocationWithCaster(targetPoint, 'Hero_Phoenix.FireSpirits.Cast', caster);
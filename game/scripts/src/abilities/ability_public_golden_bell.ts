@@ -8,6 +8,7 @@
  */
 
 import { BaseAbility, BaseModifier, registerAbility, registerModifier } from '../utils/dota_ts_adapter';
+import { GetAbilityValue } from '../utils/ability_values';
 import { CustomStats } from '../systems/CustomStats';
 
 @registerAbility('ability_public_golden_bell')
@@ -30,9 +31,9 @@ export class ability_public_golden_bell extends BaseAbility {
         const stats = CustomStats.GetAllStats(caster);
         const constitution = stats.constitution || 0;
 
-        const dmg_multiplier = this.GetSpecialValueFor('dmg_multiplier') || 5;
-        const shield_multiplier = this.GetSpecialValueFor('shield_multiplier') || 5;
-        const shield_duration = this.GetSpecialValueFor('shield_duration') || 3;
+        const dmg_multiplier = GetAbilityValue(this, 'dmg_multiplier') || 5;
+        const shield_multiplier = GetAbilityValue(this, 'shield_multiplier') || 5;
+        const shield_duration = GetAbilityValue(this, 'shield_duration') || 3;
 
         const shieldAmount = constitution * shield_multiplier;
 
@@ -142,7 +143,7 @@ export class modifier_golden_bell_shield extends BaseModifier {
         const caster = this.GetCaster()!;
         const ability = this.GetAbility()!;
         const pos = parent.GetAbsOrigin();
-        const radius = ability.GetSpecialValueFor('explosion_radius') || 400;
+        const radius = GetAbilityValue(ability, 'explosion_radius') || 400;
 
         const damage = this.constitution * this.dmg_multiplier;
 
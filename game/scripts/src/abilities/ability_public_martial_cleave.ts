@@ -7,6 +7,7 @@
  */
 
 import { BaseAbility, BaseModifier, registerAbility, registerModifier } from '../utils/dota_ts_adapter';
+import { GetAbilityValue } from '../utils/ability_values';
 
 @registerAbility('ability_public_martial_cleave')
 export class ability_public_martial_cleave extends BaseAbility {
@@ -29,16 +30,16 @@ export class modifier_public_martial_cleave extends BaseModifier {
     OnCreated(params: any): void {
         const ability = this.GetAbility();
         if (ability) {
-            const percent = ability.GetSpecialValueFor('cleave_percent');
+            const percent = GetAbilityValue(ability, 'cleave_percent');
             this.cleave_percent = percent && percent > 0 ? percent : 30;
 
-            const startWidth = ability.GetSpecialValueFor('cleave_start_width');
+            const startWidth = GetAbilityValue(ability, 'cleave_start_width');
             this.cleave_start_width = startWidth && startWidth > 0 ? startWidth : 150;
 
-            const endWidth = ability.GetSpecialValueFor('cleave_end_width');
+            const endWidth = GetAbilityValue(ability, 'cleave_end_width');
             this.cleave_end_width = endWidth && endWidth > 0 ? endWidth : 360;
 
-            const distance = ability.GetSpecialValueFor('cleave_distance');
+            const distance = GetAbilityValue(ability, 'cleave_distance');
             this.cleave_distance = distance && distance > 0 ? distance : 650;
         }
     }
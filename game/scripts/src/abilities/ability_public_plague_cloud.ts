@@ -8,12 +8,13 @@
  */
 
 import { BaseAbility, BaseModifier, registerAbility, registerModifier } from '../utils/dota_ts_adapter';
+import { GetAbilityValue } from '../utils/ability_values';
 import { CustomStats } from '../systems/CustomStats';
 
 @registerAbility('ability_public_plague_cloud')
 export class ability_public_plague_cloud extends BaseAbility {
     GetAOERadius(): number {
-        return this.GetSpecialValueFor('radius') || 300;
+        return GetAbilityValue(this, 'radius') || 300;
     }
 
     Precache(context: CScriptPrecacheContext) {
@@ -27,9 +28,9 @@ export class ability_public_plague_cloud extends BaseAbility {
         const caster = this.GetCaster();
         const targetPoint = this.GetCursorPosition();
 
-        const radius = this.GetSpecialValueFor('radius') || 300;
-        const duration = this.GetSpecialValueFor('duration') || 5;
-        const dmg_multiplier = this.GetSpecialValueFor('dmg_multiplier') || 1;
+        const radius = GetAbilityValue(this, 'radius') || 300;
+        const duration = GetAbilityValue(this, 'duration') || 5;
+        const dmg_multiplier = GetAbilityValue(this, 'dmg_multiplier') || 1;
 
         // 创建地面毒云修改器 (使用虚拟目标或 thinker)
         CreateModifierThinker(
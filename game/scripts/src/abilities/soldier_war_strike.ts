@@ -1,4 +1,5 @@
 import { BaseAbility, BaseModifier, registerAbility, registerModifier } from '../utils/dota_ts_adapter';
+import { GetAbilityValue } from '../utils/ability_values';
 
 @registerAbility('soldier_war_strike')
 export class soldier_war_strike extends BaseAbility {
@@ -28,16 +29,16 @@ export class modifier_soldier_war_strike extends BaseModifier {
     OnCreated(params: any): void {
         const ability = this.GetAbility();
         if (ability) {
-            const proc = ability.GetSpecialValueFor('attacks_to_proc');
+            const proc = GetAbilityValue(ability, 'attacks_to_proc');
             this.attacks_to_proc = proc && proc > 0 ? proc : 4;
 
-            const dmg = ability.GetSpecialValueFor('damage_pct');
+            const dmg = GetAbilityValue(ability, 'damage_pct');
             this.damage_pct = dmg && dmg > 0 ? dmg : 250;
 
-            const rad = ability.GetSpecialValueFor('cleave_radius');
+            const rad = GetAbilityValue(ability, 'cleave_radius');
             this.cleave_radius = rad && rad > 0 ? rad : 400;
 
-            const ang = ability.GetSpecialValueFor('cleave_angle');
+            const ang = GetAbilityValue(ability, 'cleave_angle');
             this.cleave_angle = ang && ang > 0 ? ang : 120;
         }
         if (IsServer()) {
@@ -106,9 +107,9 @@ export class modifier_soldier_war_strike extends BaseModifier {
     TriggerWarStrike(mainTarget: CDOTA_BaseNPC) {
         const ability = this.GetAbility();
 
-        const r = ability?.GetSpecialValueFor('cleave_radius');
-        const a = ability?.GetSpecialValueFor('cleave_angle');
-        const d = ability?.GetSpecialValueFor('damage_pct');
+        const r = ability && GetAbilityValue(ability, 'cleave_radius');
+        const a = ability && GetAbilityValue(ability, 'cleave_angle');
+        const d = ability && GetAbilityValue(ability, 'damage_pct');
 
         this.cleave_radius = r && r > 0 ? r : 400;
         this.cleave_angle = a && a > 0 ? a : 120;
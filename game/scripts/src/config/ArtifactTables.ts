@@ -0,0 +1,225 @@
+// this file is auto-generated by scripts/gen_artifact_tables.py
+// from npc_items_artifacts.txt / custom_units.txt
+// DO NOT EDIT MANUALLY
+
+/** 属性向量各下标对应的 ArtifactBonuses key */
+export const ARTIFACT_STAT_KEYS = [
+    'damage',
+    'armorPen',
+    'hp',
+    'armor',
+    'constitution',
+    'martial',
+    'divinity',
+    'agility',
+    'manaRegen',
+    'critChance',
+    'critDamage',
+    'moveSpeed',
+    'evasion',
+    'allStats',
+    'finalDmgReduct',
+    'spellDamage',
+    'block',
+    'finalDmgIncrease',
+] as const;
+
+/** [槽位][阶级] -> 属性向量 */
+export const ARTIFACT_STATS: number[][][] = [
+    [
+        [15, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [60, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [300, 10, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [1500, 40, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [8000, 150, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [50000, 500, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    ],
+    [
+        [0, 0, 0, 0, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 2, 20, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 8, 100, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 20, 500, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 40, 3000, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 60, 20000, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    ],
+    [
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 10, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 10, 30, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 25, 80, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 5, 50, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 10, 100, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 20, 200, 0, 0],
+    ],
+    [
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 5, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 10, 20, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 15, 30, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 20, 80, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 25, 200, 0, 0, 0, 0, 0, 0, 0],
+    ],
+    [
+        [0, 0, 0, 0, 0, 0, 0, 5, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 15, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 80, 0, 0, 0, 0, 5, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 300, 0, 0, 0, 0, 5, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 2000, 0, 0, 0, 0, 15, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 10000, 0, 0, 0, 0, 25, 0, 0, 0, 0, 0],
+    ],
+    [
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 10, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 40, 2, 0, 0, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 150, 0, 0, 0, 2],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1000, 0, 0, 0, 5],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 5000, 0, 0, 0, 10],
+    ],
+];
+
+/** [槽位][阶级] -> 物品名 */
+export const ARTIFACT_ITEM_NAMES: string[][] = [
+    [
+        'item_artifact_weapon_t0',
+        'item_artifact_weapon_tier1',
+        'item_artifact_weapon_t2',
+        'item_artifact_weapon_t3',
+        'item_artifact_weapon_t4',
+        'item_artifact_weapon_t5',
+    ],
+    [
+        'item_artifact_armor_t0',
+        'item_artifact_armor_tier1',
+        'item_artifact_armor_t2',
+        'item_artifact_armor_t3',
+        'item_artifact_armor_t4',
+        'item_artifact_armor_t5',
+    ],
+    [
+        'item_artifact_helm_t0',
+        'item_artifact_helm_tier1',
+        'item_artifact_helm_t2',
+        'item_artifact_helm_t3',
+        'item_artifact_helm_t4',
+        'item_artifact_helm_t5',
+    ],
+    [
+        'item_artifact_accessory_t0',
+        'item_artifact_accessory_tier1',
+        'item_artifact_accessory_t2',
+        'item_artifact_accessory_t3',
+        'item_artifact_accessory_t4',
+        'item_artifact_accessory_t5',
+    ],
+    [
+        'item_artifact_boots_t0',
+        'item_artifact_boots_tier1',
+        'item_artifact_boots_t2',
+        'item_artifact_boots_t3',
+        'item_artifact_boots_t4',
+        'item_artifact_boots_t5',
+    ],
+    [
+        'item_artifact_amulet_t0',
+        'item_artifact_amulet_tier1',
+        'item_artifact_amulet_t2',
+        'item_artifact_amulet_t3',
+        'item_artifact_amulet_t4',
+        'item_artifact_amulet_t5',
+    ],
+];
+
+/** 物品名 -> [槽位, 阶级] */
+export const ARTIFACT_ITEMS: Record<string, [number, number]> = {
+    item_artifact_weapon_t0: [0, 0],
+    item_artifact_weapon_tier1: [0, 1],
+    item_artifact_weapon_t2: [0, 2],
+    item_artifact_weapon_t3: [0, 3],
+    item_artifact_weapon_t4: [0, 4],
+    item_artifact_weapon_t5: [0, 5],
+    item_artifact_armor_t0: [1, 0],
+    item_artifact_armor_tier1: [1, 1],
+    item_artifact_armor_t2: [1, 2],
+    item_artifact_armor_t3: [1, 3],
+    item_artifact_armor_t4: [1, 4],
+    item_artifact_armor_t5: [1, 5],
+    item_artifact_helm_t0: [2, 0],
+    item_artifact_helm_tier1: [2, 1],
+    item_artifact_helm_t2: [2, 2],
+    item_artifact_helm_t3: [2, 3],
+    item_artifact_helm_t4: [2, 4],
+    item_artifact_helm_t5: [2, 5],
+    item_artifact_accessory_t0: [3, 0],
+    item_artifact_accessory_tier1: [3, 1],
+    item_artifact_accessory_t2: [3, 2],
+    item_artifact_accessory_t3: [3, 3],
+    item_artifact_accessory_t4: [3, 4],
+    item_artifact_accessory_t5: [3, 5],
+    item_artifact_boots_t0: [4, 0],
+    item_artifact_boots_tier1: [4, 1],
+    item_artifact_boots_t2: [4, 2],
+    item_artifact_boots_t3: [4, 3],
+    item_artifact_boots_t4: [4, 4],
+    item_artifact_boots_t5: [4, 5],
+    item_artifact_amulet_t0: [5, 0],
+    item_artifact_amulet_tier1: [5, 1],
+    item_artifact_amulet_t2: [5, 2],
+    item_artifact_amulet_t3: [5, 3],
+    item_artifact_amulet_t4: [5, 4],
+    item_artifact_amulet_t5: [5, 5],
+};
+
+/** 阶级 -> 升级所需经验 */
+export const ARTIFACT_TIER_XP: number[] = [0, 1000, 5000, 20000, 100000, 0];
+
+/** 掉落向量各下标对应的 KV 字段 */
+export const UNIT_DROP_FIELDS = [
+    'Artifact_Drop_Type',
+    'Artifact_Drop_XP',
+    'CustomDrop_Coin',
+    'CustomDrop_Faith',
+    'HaveLevel',
+    'CustomDrop_DefenderPoints',
+] as const;
+
+/** 单位名 -> 掉落向量 (没有任何掉落的单位不在表中) */
+export const UNIT_DROPS: Record<string, number[]> = {
+    npc_creep_train_tier1: [0, 0, 15, 1, 30, 0],
+    npc_creep_train_tier2: [0, 0, 45, 1, 180, 0],
+    npc_creep_train_tier3: [0, 0, 120, 1, 450, 0],
+    npc_creep_train_tier4: [0, 0, 300, 1, 900, 0],
+    npc_creep_train_tier5: [0, 0, 800, 1, 2000, 0],
+    npc_creep_train_tier6: [0, 0, 2000, 1, 5000, 0],
+    npc_creep_train_tier7: [0, 0, 5000, 1, 12000, 0],
+    npc_creep_train_tier8: [0, 0, 12000, 1, 30000, 0],
+    npc_cultivation_merchant: [0, 0, 0, 0, 0, 10],
+    npc_ability_merchant: [0, 0, 0, 0, 0, 10],
+    npc_creep_wave_1: [0, 0, 25, 5, 45, 10],
+    npc_creep_wave_2: [0, 0, 35, 5, 60, 10],
+    npc_creep_wave_3: [0, 0, 50, 5, 80, 10],
+    npc_creep_wave_4: [0, 0, 70, 5, 120, 10],
+    npc_creep_wave_5: [0, 0, 100, 5, 200, 10],
+    npc_creep_wave_6: [0, 0, 150, 5, 300, 10],
+    npc_creep_wave_7: [0, 0, 200, 5, 400, 10],
+    npc_creep_wave_8: [0, 0, 300, 5, 600, 10],
+    npc_creep_wave_9: [0, 0, 450, 5, 1000, 10],
+    npc_creep_wave_10: [0, 0, 600, 5, 1500, 10],
+    npc_creep_wave_11: [0, 0, 1000, 5, 2500, 10],
+    npc_creep_wave_12: [0, 0, 1500, 5, 4000, 10],
+    npc_creep_wave_13: [0, 0, 2500, 5, 6000, 10],
+    npc_creep_wave_14: [0, 0, 4000, 5, 10000, 10],
+    npc_creep_wave_15: [0, 0, 6000, 5, 15000, 10],
+    npc_creep_wave_16: [0, 0, 10000, 5, 25000, 10],
+    npc_creep_wave_17: [0, 0, 15000, 5, 40000, 10],
+    npc_creep_wave_18: [0, 0, 25000, 5, 60000, 10],
+    npc_creep_wave_19: [0, 0, 50000, 5, 100000, 10],
+    npc_boss_wave_5: [0, 0, 2000, 50, 5000, 200],
+    npc_boss_wave_10: [0, 0, 5000, 50, 50000, 500],
+    npc_boss_wave_15: [0, 0, 20000, 50, 200000, 500],
+    npc_boss_wave_20: [0, 0, 0, 100, 1000000, 5000],
+    npc_guardian_zone_1: [1, 50, 30, 1, 50, 0],
+    npc_guardian_zone_2: [2, 50, 30, 1, 50, 0],
+    npc_guardian_zone_3: [3, 50, 30, 1, 50, 0],
+    npc_guardian_zone_4: [4, 50, 30, 1, 50, 0],
+    npc_guardian_zone_5: [5, 50, 30, 1, 50, 0],
+    npc_guardian_zone_6: [6, 50, 30, 1, 50, 0],
+};
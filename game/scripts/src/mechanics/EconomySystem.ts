@@ -1,3 +1,4 @@
+import { UNIT_DROPS } from '../config/ArtifactTables';
 import { reloadable } from '../utils/tstl-utils';
 
 // Define OverheadAlert constants locally if missing
@@ -8,11 +9,6 @@ const OVERHEAD_ALERT_DAMAGE = 6;
 export class EconomySystem {
     private static instance: EconomySystem;
 
-    // Constants for KV Drops
-    private readonly KV_DROP_COIN = 'CustomDrop_Coin';
-    private readonly KV_DROP_FAITH = 'CustomDrop_Faith';
-    private readonly KV_DROP_DEFENDER_POINTS = 'CustomDrop_DefenderPoints';
-
     public constructor() {
         this.Initialize();
     }
@@ -37,33 +33,12 @@ export class EconomySystem {
     }
 
     private LoadUnitKVs() {
-        // Try loading the custom units file directly
-        const unitsKV = LoadKeyValues('scripts/npc/custom_units.txt');
-        if (unitsKV && typeof unitsKV === 'object') {
-            // Check if "XLSXContent" exists, otherwise assume root IS the units map
-            let dotaUnits = (unitsKV as any)['XLSXContent'];
-            if (!dotaUnits) {
-                dotaUnits = unitsKV;
-            }
-
-            if (dotaUnits) {
-                for (const unitName in dotaUnits) {
-                    const data = dotaUnits[unitName];
-                    if (data && typeof data === 'object') {
-                        const coin = data[this.KV_DROP_COIN] ? Number(data[this.KV_DROP_COIN]) : 0;
-                        const faith = data[this.KV_DROP_FAITH] ? Number(data[this.KV_DROP_FAITH]) : 0;
-                        const exp = data['HaveLevel'] ? Number(data['HaveLevel']) : 0;
-                        const defenderPoints = data[this.KV_DROP_DEFENDER_POINTS]
-                            ? Number(data[this.KV_DROP_DEFENDER_POINTS])
-                            : 0;
-
-                        if (coin > 0 || faith > 0 || exp > 0 || defenderPoints > 0) {
-                            this.unitKVCache[unitName] = { coin, faith, exp, defenderPoints };
-                        }
-                    }
-                }
+        // Drop values come from the table generated from custom_units (config/ArtifactTables.ts)
+        for (const unitName in UNIT_DROPS) {
+            const [, , coin, faith, exp, defenderPoints] = UNIT_DROPS[unitName];
+            if (coin > 0 || faith > 0 || exp > 0 || defenderPoints > 0) {
+                this.unitKVCache[unitName] = { coin, faith, exp, defenderPoints };
             }
-        } else {
         }
     }
 
@@ -1,3 +1,5 @@
+import { ARTIFACT_ITEMS, ARTIFACT_STATS, ARTIFACT_STAT_KEYS, ARTIFACT_TIER_XP, UNIT_DROPS } from '../config/ArtifactTables';
+
 /**
  * 神器系统 - 管理玩家装备的绑定神器
  *
@@ -50,10 +52,10 @@ export class ArtifactSystem {
 
     private readonly SLOT_COUNT = 6;
 
-    // 从 KV 加载的每阶所需经验 (tier -> xpRequired)
+    // 每阶所需经验 (tier -> xpRequired)
     private tierXPRequired: Record<number, number> = {};
 
-    /** 获取指定阶级升级所需经验 (从 KV 读取) */
+    /** 获取指定阶级升级所需经验 */
     public GetXPRequired(tier: number): number {
         return this.tierXPRequired[tier] ?? 0;
     }
@@ -75,57 +77,24 @@ export class ArtifactSystem {
     }
 
     /**
-     * 从 npc_items_artifacts.txt 加载装备物品的 XPRequired
-     * 按 tier 分组，取每个 tier 的 XPRequired
+     * 加载每阶升级所需经验
+     * 数据来自 npc_items_artifacts 生成的常量表 (config/ArtifactTables.ts)
      */
     private LoadArtifactItemKVs(): void {
-        const itemsKV = LoadKeyValues('scripts/npc/npc_items_artifacts.txt');
-        if (!itemsKV || typeof itemsKV !== 'object') {
-            return;
-        }
-
-        let dotaItems = (itemsKV as any)['DOTAItems'];
-        if (!dotaItems) {
-            dotaItems = itemsKV;
-        }
-
-        for (const itemName in dotaItems) {
-            const data = dotaItems[itemName];
-            if (data && typeof data === 'object') {
-                const tier = data['ArtifactTier'] ? Number(data['ArtifactTier']) : -1;
-                const xpReq = data['XPRequired'] ? Number(data['XPRequired']) : 0;
-                if (tier >= 0 && !(tier in this.tierXPRequired)) {
-                    this.tierXPRequired[tier] = xpReq;
-                }
-            }
+        for (let tier = 0; tier < ARTIFACT_TIER_XP.length; tier++) {
+            this.tierXPRequired[tier] = ARTIFACT_TIER_XP[tier];
         }
     }
 
     /**
-     * 从 KV 文件加载单位的装备经验掉落配置
-     * 读取 custom_units.txt 中的 Artifact_Drop_Type 和 Artifact_Drop_XP 字段
+     * 加载单位的装备经验掉落配置
+     * 数据来自 custom_units 生成的常量表 (Artifact_Drop_Type / Artifact_Drop_XP)
      */
     private LoadArtifactDropKVs(): void {
-        const unitsKV = LoadKeyValues('scripts/npc/custom_units.txt');
-        if (!unitsKV || typeof unitsKV !== 'object') {
-            return;
-        }
-
-        let dotaUnits = (unitsKV as any)['XLSXContent'];
-        if (!dotaUnits) {
-            dotaUnits = unitsKV;
-        }
-
-        let count = 0;
-        for (const unitName in dotaUnits) {
-            const data = dotaUnits[unitName];
-            if (data && typeof data === 'object') {
-                const dropType = data['Artifact_Drop_Type'] ? Number(data['Artifact_Drop_Type']) : 0;
-                const dropXP = data['Artifact_Drop_XP'] ? Number(data['Artifact_Drop_XP']) : 0;
-                if (dropType > 0 && dropXP > 0) {
-                    this.artifactDropCache[unitName] = { dropType, dropXP };
-                    count++;
-                }
+        for (const unitName in UNIT_DROPS) {
+            const [dropType, dropXP] = UNIT_DROPS[unitName];
+            if (dropType > 0 && dropXP > 0) {
+                this.artifactDropCache[unitName] = { dropType, dropXP };
             }
         }
     }
@@ -682,90 +651,33 @@ export class ArtifactSystem {
         for (const slot of artifacts.slots) {
             if (!slot.itemName) continue;
 
-            const info = this.GetArtifactInfo(slot.itemName);
-            if (!info) continue;
-
-            // 统一累加所有属性字段
-            bonuses.damage! += info.bonusDamage || 0;
-            bonuses.armorPen! += info.bonusArmorPen || 0;
-            bonuses.hp! += info.bonusHP || 0;
-            bonuses.armor! += info.bonusArmor || 0;
-            bonuses.constitution! += info.bonusConstitution || 0;
-            bonuses.martial! += info.bonusMartial || 0;
-            bonuses.divinity! += info.bonusDivinity || 0;
-            bonuses.agility! += info.bonusAgility || 0;
-            bonuses.manaRegen! += info.bonusManaRegen || 0;
-            bonuses.critChance! += info.bonusCritChance || 0;
-            bonuses.critDamage! += info.bonusCritDamage || 0;
-            bonuses.moveSpeed! += info.bonusMoveSpeed || 0;
-            bonuses.evasion! += info.bonusEvasion || 0;
-            bonuses.allStats! += info.bonusAllStats || 0;
-            bonuses.finalDmgReduct! += info.bonusFinalDmgReduct || 0;
-            bonuses.spellDamage! += info.bonusSpellDamage || 0;
-            bonuses.block! += info.bonusBlock || 0;
-            bonuses.finalDmgIncrease! += info.bonusFinalDmgIncrease || 0;
+            // 直接按 [槽位][阶级] 取属性向量, 不再每次刷新都查询 KV
+            const entry = ARTIFACT_ITEMS[slot.itemName];
+            if (!entry) continue;
+
+            const stats = ARTIFACT_STATS[entry[0]][entry[1]];
+            for (let i = 0; i < ARTIFACT_STAT_KEYS.length; i++) {
+                const key = ARTIFACT_STAT_KEYS[i];
+                bonuses[key] = (bonuses[key] ?? 0) + stats[i];
+            }
         }
 
         return bonuses;
     }
 
     /**
-     * 从 KV 获取神器信息
+     * 获取神器信息 (查生成的常量表)
      */
-    private GetArtifactInfo(itemName: string): {
-        slot: number;
-        tier: number;
-        displayName: string;
-        bonusDamage?: number;
-        bonusArmorPen?: number;
-        bonusHP?: number;
-        bonusArmor?: number;
-        bonusConstitution?: number;
-        bonusDivinity?: number;
-        bonusMartial?: number;
-        bonusManaRegen?: number;
-        bonusCritChance?: number;
-        bonusCritDamage?: number;
-        bonusMoveSpeed?: number;
-        bonusAgility?: number;
-        bonusEvasion?: number;
-        bonusAllStats?: number;
-        bonusFinalDmgReduct?: number;
-        bonusSpellDamage?: number;
-        bonusBlock?: number;
-        bonusFinalDmgIncrease?: number;
-    } | null {
-        // 物品也使用 GetAbilityKeyValuesByName
-        const kv = GetAbilityKeyValuesByName(itemName) as any;
-        if (!kv) {
+    private GetArtifactInfo(itemName: string): { slot: number; tier: number; displayName: string } | null {
+        const entry = ARTIFACT_ITEMS[itemName];
+        if (!entry) {
             return null;
         }
 
-        // 注意: 不能用 Number(x) || 0, 因为 TSTL 编译后 __TS__Number(nil) 返回 NaN,
-        // 而 Lua 中 NaN 是 truthy, NaN or 0 → NaN! 必须用 tonumber 返回 nil, nil or 0 → 0
-        const n = (v: any): number => tonumber(v) ?? 0;
         return {
-            slot: n(kv.ArtifactSlot),
-            tier: n(kv.ArtifactTier) || 1,
+            slot: entry[0],
+            tier: entry[1],
             displayName: `#ItemCn_${itemName}`, // 本地化 token，由 UI $.Localize() 解析
-            bonusDamage: n(kv.BonusDamage),
-            bonusArmorPen: n(kv.BonusArmorPen),
-            bonusHP: n(kv.BonusHP),
-            bonusArmor: n(kv.BonusArmor),
-            bonusConstitution: n(kv.BonusConstitution),
-            bonusDivinity: n(kv.BonusDivinity),
-            bonusMartial: n(kv.BonusMartial),
-            bonusManaRegen: n(kv.BonusManaRegen),
-            bonusCritChance: n(kv.BonusCritChance),
-            bonusCritDamage: n(kv.BonusCritDamage),
-            bonusMoveSpeed: n(kv.BonusMoveSpeed),
-            bonusAgility: n(kv.BonusAgility),
-            bonusEvasion: n(kv.BonusEvasion),
-            bonusAllStats: n(kv.BonusAllStats),
-            bonusFinalDmgReduct: n(kv.BonusFinalDmgReduct),
-            bonusSpellDamage: n(kv.BonusSpellDamage),
-            bonusBlock: n(kv.BonusBlock),
-            bonusFinalDmgIncrease: n(kv.BonusFinalDmgIncrease),
         };
     }
 
@@ -0,0 +1,42 @@
+/**
+ * ability_values.ts
+ * 按等级预展开的技能数值表
+ *
+ * 数据流: Excel → KV → scripts/gen_ability_values.py (gulp kv_tables, 在 kv_2_js 之后运行) → json/ability_values.json → 本模块
+ * 运行时直接按 [技能][字段][等级] 查表，不再拆分 "4 5 6 7" 这样的字符串
+ */
+
+import * as json_ability_values from '../json/ability_values.json';
+
+/** 单个技能的数值表 (values 中每个数组长度都等于 MaxLevel) */
+export interface AbilityValueTable {
+    MaxLevel: number;
+    values: Record<string, (number | string)[]>;
+}
+
+const tables = json_ability_values as unknown as Record<string, AbilityValueTable>;
+
+/** 获取技能的完整数值表 */
+export function GetAbilityValueTable(abilityName: string): AbilityValueTable | undefined {
+    return tables[abilityName];
+}
+
+/**
+ * 获取技能某一级的数值
+ * @param level 从 1 开始；超出范围时取最近的有效等级
+ */
+export function GetAbilityLevelValue(abilityName: string, key: string, level: number, fallback: number = 0): number {
+    const levels = tables[abilityName]?.values[key];
+    if (!levels || levels.length === 0) return fallback;
+    const index = Math.min(Math.max(level, 1), levels.length) - 1;
+    const value = levels[index];
+    return typeof value === 'number' ? value : fallback;
+}
+
+/**
+ * 按技能当前等级取值，代替 GetSpecialValueFor
+ * 未学习 (0 级) 时取 1 级的数值
+ */
+export function GetAbilityValue(ability: CDOTABaseAbility, key: string, fallback: number = 0): number {
+    return GetAbilityLevelValue(ability.GetAbilityName(), key, ability.GetLevel(), fallback);
+}
@@ -169,6 +169,11 @@ export class FlameGraphCommands {
                     this.sendMessageToPlayer(playerID, '停止记录性能数据');
                     break;
 
+                case 'export':
+                    this.profiler.exportDump();
+                    this.sendMessageToPlayer(playerID, '已导出火焰图数据到控制台');
+                    break;
+
                 //持续监听
                 case 'dev':
                     this.startRecording();
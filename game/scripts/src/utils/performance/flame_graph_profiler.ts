@@ -12,6 +12,10 @@
 
 const get_time = GetSystemTimeMS;
 const sync_time = 5;
+// 导出到控制台的行前缀, scripts/flame_graph_dump.py 按此前缀从控制台日志中提取数据
+const dump_prefix = '[FlameGraphDump]';
+// 单行打印的最大长度, 过长的数据分多行打印
+const dump_chunk_size = 1000;
 interface ProfileNode {
     name: string;
     startTime: number;
@@ -121,6 +125,8 @@ export class FlameGraphProfiler {
                 const rootNodeChildren = this.transformNode(this.rootNode);
                 rootNodeChildren.totalTime = this.getTotalTime(rootNodeChildren);
                 rootNodeChildren.rate = Math.round((rootNodeChildren.totalTime / (get_time() - this.startTime)) * 10000 * this.maxNode);
+                // 这里只同步网表; 控制台导出 (json.encode 整棵树) 开销大且会计入正在记录的数据,
+                // 只在停止记录和 -flamegraph export 时进行
                 this.syncToNetTable(rootNodeChildren);
                 return sync_time;
             });
@@ -145,6 +151,26 @@ export class FlameGraphProfiler {
         rootNodeChildren.rate = Math.round((rootNodeChildren.totalTime / (this.endTime - this.startTime)) * 10000 * this.maxNode);
         DeepPrintTable(rootNodeChildren);
         this.syncToNetTable(rootNodeChildren);
+        this.exportDump(rootNodeChildren);
+    }
+
+    /**
+     * 以 JSON 打印当前数据到控制台, 供 scripts/flame_graph_dump.py 离线分析
+     * 每行格式: [FlameGraphDump] 会话开始时间 序号/总行数 JSON片段
+     * 同一会话的多次导出是累计值, 离线分析时取最后一次
+     * @param data 已转换的同步数据，不传则按当前数据生成
+     */
+    public exportDump(data?: SyncProfileNode): void {
+        if (!data) {
+            data = this.transformNode(this.rootNode);
+            data.totalTime = this.getTotalTime(data);
+        }
+        const elapsed = Math.round((this.isRecording ? get_time() : this.endTime) - this.startTime);
+        const text = json.encode({ elapsed: elapsed, root: data });
+        const count = Math.ceil(text.length / dump_chunk_size);
+        for (let i = 0; i < count; i++) {
+            print(`${dump_prefix} ${this.startTime} ${i + 1}/${count} ${text.substring(i * dump_chunk_size, (i + 1) * dump_chunk_size)}`);
+        }
     }
 
     /**
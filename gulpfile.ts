@@ -3,6 +3,7 @@ import * as dotax from 'gulp-dotax';
 import path from 'path';
 import less from 'gulp-less';
 import replace from 'gulp-replace';
+import { spawnSync } from 'child_process';
 
 const paths: { [key: string]: string } = {
     excels: 'excels',
@@ -37,7 +38,7 @@ const sheet_2_kv =
             };
 
             if (watch) {
-                return gulp.watch(excelFiles, gulp.series(transpileSheets, postprocess_items));
+                return gulp.watch(excelFiles, gulp.series(compute_columns, transpileSheets, postprocess_items));
             } else {
                 return transpileSheets();
             }
@@ -74,6 +75,48 @@ const postprocess_items = (done: gulp.TaskFunctionCallback) => {
     done();
 };
 
+/**
+ * @description 运行 scripts/ 下的 Python 内容工具 (python -m scripts ...)，退出码非 0 时任务失败；可用 PYTHON 环境变量指定解释器
+ * @description Run a Python content tool (python -m scripts ...); a non-zero exit code fails the task. Set PYTHON to override the interpreter
+ */
+const python_tool =
+    (...args: string[]) =>
+        (done: gulp.TaskFunctionCallback) => {
+            const result = spawnSync(process.env.PYTHON || 'python', ['-m', 'scripts', ...args], { stdio: 'inherit' });
+            if (result.error || result.status !== 0) {
+                done(new Error(`python -m scripts ${args.join(' ')} failed`));
+            } else {
+                done();
+            }
+        };
+
+/**
+ * @description 与 python_tool 相同，但失败时只打印警告，不中断后续任务
+ * @description Same as python_tool, but a failure only logs a warning and does not abort the following tasks
+ */
+const optional_python_tool =
+    (...args: string[]) =>
+        (done: gulp.TaskFunctionCallback) => {
+            python_tool(...args)((error?: any) => {
+                if (error) console.warn(`WARNING: ${error.message}, 继续执行后续任务`);
+                done();
+            });
+        };
+
+/**
+ * @description 生成 KV 前按 sheet_schemas.COMPUTED_COLUMNS 计算工作簿中的派生列并写回 (没有改动时不保存)；
+ * 写回失败 (如 Excel 正占用工作簿) 不阻塞 KV 生成，计算列沿用旧值
+ * @description Evaluate the computed columns declared in sheet_schemas.COMPUTED_COLUMNS and write them back before KV emission;
+ * a failed write-back (e.g. the workbook is locked by Excel) does not block KV generation
+ */
+const compute_columns = optional_python_tool('compute', '--quiet');
+
+/**
+ * @description 由 KV 生成运行时查表数据 (按等级展开的技能数值 json/ability_values.json, 神器属性 / 单位掉落常量表 config/ArtifactTables.ts)
+ * @description Generate runtime lookup tables from the KV files (per-level ability values, artifact stat / unit drop tables)
+ */
+const kv_tables = gulp.series(python_tool('generate', 'ability-values'), python_tool('generate', 'artifact-tables'));
+
 /**
  * @description 将kv文件转换为panorama使用的json文件
  * @description Convert your kv file to panorama json file
@@ -91,7 +134,7 @@ const kv_2_js =
             };
 
             if (watch) {
-                return gulp.watch(kvFiles, transpileKVToJS);
+                return gulp.watch(kvFiles, gulp.series(transpileKVToJS, kv_tables));
             } else {
                 return transpileKVToJS();
             }
@@ -123,7 +166,8 @@ const csv_to_localization =
 const create_image_precache =
     (watch: boolean = false) =>
         () => {
-            const imageFiles = `${paths.panorama}/images/**/*.{jpg,png,psd}`;
+            // images/scaled 为 ui_textures 生成的缩放版本 (ui_textures.json 的 output), 由面板按需加载, 不预载
+            const imageFiles = [`${paths.panorama}/images/**/*.{jpg,png,psd}`, `!${paths.panorama}/images/scaled/**`];
             const createImagePrecache = () => {
                 return gulp
                     .src(imageFiles)
@@ -166,12 +210,14 @@ const compile_less =
 gulp.task(`create_image_precache`, create_image_precache());
 gulp.task('create_image_precache:watch', create_image_precache(true));
 
-gulp.task('sheet_2_kv', gulp.series(sheet_2_kv(), postprocess_items));
+gulp.task('sheet_2_kv', gulp.series(compute_columns, sheet_2_kv(), postprocess_items));
 gulp.task('sheet_2_kv:watch', sheet_2_kv(true));
 
 gulp.task('kv_2_js', kv_2_js());
 gulp.task('kv_2_js:watch', kv_2_js(true));
 
+gulp.task('kv_tables', kv_tables);
+
 gulp.task('csv_to_localization', csv_to_localization());
 gulp.task('csv_to_localization:watch', csv_to_localization(true));
 
@@ -186,6 +232,7 @@ gulp.task(
         'sheet_2_kv',
         'postprocess_items',
         'kv_2_js',
+        'kv_tables',
         'csv_to_localization',
         'create_image_precache',
         'compile_less'
@@ -202,5 +249,5 @@ gulp.task(
     )
 );
 gulp.task('build', gulp.series('predev'));
-gulp.task('jssync', gulp.series('sheet_2_kv', 'kv_2_js'));
+gulp.task('jssync', gulp.series('sheet_2_kv', 'kv_2_js', 'kv_tables'));
 gulp.task('prod', gulp.series('predev'));
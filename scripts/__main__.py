@@ -0,0 +1,113 @@
+"""
+Python 内容工具的统一入口, 在仓库根目录执行:
+
+  python -m scripts                          # 列出所有子命令
+  python -m scripts validate                 # 检查工作簿 (只依赖标准库, 适合 git hook)
+  python -m scripts generate abilities       # 技能表 -> npc_abilities_custom.txt
+  python -m scripts patch excels/单位表.xlsx custom_units AO3=200
+  python -m scripts <命令> -h                 # 查看子命令自己的参数
+
+子命令只在执行时才 import 对应的模块, openpyxl / PIL 等重依赖不会拖慢 list / validate 的启动;
+各模块内部的路径都按仓库根目录解析, 与当前工作目录无关
+"""
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(SCRIPTS_DIR)
+
+# 命令 -> (模块, 说明), 或分组命令 -> {子命令: (模块, 说明)}
+# 模块以 .py 结尾时按仓库根目录下的文件路径加载, 否则为 scripts/ 下的模块名; 模块需提供 main()
+COMMANDS = {
+    'validate': ('validate_sheets', '检查工作簿表头、块标记和重复条目'),
+    'read': ('workbook_reader', '查看工作簿内容 / 比较读取后端 (dump, bench)'),
+    'db': ('build_content_db', '把工作簿编译为 SQLite 内容数据库并查询'),
+    'patch': ('xlsx_patch', '直接修改 xlsx 单元格, 不重写整本工作簿'),
+    'compute': ('sheet_formulas', '按 sheet_schemas 声明的列公式批量计算派生列并写回工作簿 (--check)'),
+    'import': ('kv_import', '把 KV 文件导入工作簿 (按 Row 2 表头映射, 缺少的字段追加列, write-only 流式写出)'),
+    'curves': ('unit_curves', '拟合 / 生成波次、BOSS、练功房、守卫的数值曲线 (fit, show, apply)'),
+    'load': ('wave_load', '估算各波次的同时存活怪物数量, 标记超出上限的波次'),
+    'publish': ('publish_manifest', '发布清单: 只复制 / 加密有变化的文件, 按目录统计大小'),
+    'encrypt': ('lua_encrypt', '与 encrypt_file.lua 兼容的 Lua 加密 (encrypt, decrypt, check)'),
+    'profile': ('flame_graph_dump', '火焰图性能数据的离线分析 (report, export, diff)'),
+    'damage': ('damage_model', 'DamageSystem 伤害计算的 NumPy 参考实现 (check, bench)'),
+    'combat': ('combat_sim', '技能轮换对 BOSS 的离散事件战斗模拟 (击杀时间 / 各技能 DPS)'),
+    'upgrade': ('upgrade_plan', '修炼商店境界价格与波次金币收入的进度分析 (最早完成时间 / 卡点)'),
+    'artifacts': ('artifact_drops', '界域守卫神器经验掉落的蒙特卡洛模拟 (各槽位升阶的击杀数 / 时间分布)'),
+    'generate': {
+        'abilities': ('excels/generate_abilities_kv.py', '技能表 -> npc_abilities_custom.txt'),
+        'ability-values': ('gen_ability_values', '按等级展开的技能数值表 (JSON / Lua)'),
+        'hero-stats': ('hero_stats', '英雄按等级 × 神器阶级的属性成长表, 并检查与波次血量曲线的偏离'),
+        'artifact-items': ('gen_artifact_items', '物品表 -> 神器 / 通用物品 KV 和本地化'),
+        'artifact-tables': ('gen_artifact_tables', '神器属性 / 单位掉落常量表 (ArtifactTables.ts)'),
+        'kv-shards': ('export_kv_shards', '分片的 panorama KV JSON'),
+        'precache': ('precache_manifest', '去重、按波次 / 域分阶段的预载清单'),
+        'image-precache': ('image_index', '增量更新图片索引和 image_precache0.css'),
+        'ui-textures': ('ui_textures', 'panorama UI 图片的 1x / 1.5x / 2x 缩小版本和映射表'),
+        'synthetic': ('gen_synthetic_workbooks', '与项目表结构一致的合成工作簿 (测试用)'),
+    },
+    'update': {
+        'units': ('_update_units', '按数值表更新 单位表.xlsx'),
+        'artifact-stats': ('_update_artifact_stats', '按新属性表更新 物品表.xlsx 的神器属性'),
+    },
+}
+
+
+def print_commands():
+    print('用法: python -m scripts <命令> [参数 ...]\n')
+    for name, spec in COMMANDS.items():
+        if isinstance(spec, dict):
+            for sub, (_, help_text) in spec.items():
+                print(f'  {name + " " + sub:<28}{help_text}')
+        else:
+            print(f'  {name:<28}{spec[1]}')
+    print(f'  {"list":<28}列出所有子命令')
+
+
+def load_module(target):
+    if target.endswith('.py'):
+        import importlib.util
+        path = os.path.join(BASE_DIR, target)
+        name = os.path.splitext(os.path.basename(path))[0]
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    import importlib
+    return importlib.import_module(target)
+
+
+def resolve(argv):
+    """返回 (命令全名, 模块, 剩余参数); 找不到时打印命令列表并退出"""
+    if not argv or argv[0] in ('-h', '--help', 'list'):
+        print_commands()
+        sys.exit(0)
+    name, rest = argv[0], argv[1:]
+    spec = COMMANDS.get(name)
+    if spec is None:
+        print(f'ERROR: 未知命令: {name}\n')
+        print_commands()
+        sys.exit(2)
+    if isinstance(spec, dict):
+        if not rest or rest[0] not in spec:
+            if rest and rest[0] not in ('-h', '--help'):
+                print(f'ERROR: 未知命令: {name} {rest[0]}\n')
+            print(f'用法: python -m scripts {name} <{"|".join(spec)}> [参数 ...]')
+            sys.exit(0 if rest and rest[0] in ('-h', '--help') else 2)
+        name, rest, spec = f'{name} {rest[0]}', rest[1:], spec[rest[0]]
+    return name, spec[0], rest
+
+
+def main():
+    name, target, rest = resolve(sys.argv[1:])
+    if SCRIPTS_DIR not in sys.path:
+        # scripts/ 下的模块之间以顶层模块名互相 import
+        sys.path.insert(0, SCRIPTS_DIR)
+    module = load_module(target)
+    # 子命令的 argparse 以 sys.argv 为准, prog 显示为完整的调用方式
+    sys.argv = [f'python -m scripts {name}'] + rest
+    module.main()
+
+
+if __name__ == '__main__':
+    main()
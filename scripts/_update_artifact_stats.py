@@ -11,11 +11,15 @@
 | 饰品 | 暴击/爆伤  | 2/-    | 5/-    | 10/-      | 15/30      | 20/80       | 25/200       |
 | 鞋子 | 身法/闪避  | 5/-    | 15/-   | 80/-      | 300/5      | 2000/15     | 10000/25     |
 | 护符 | 全属/终伤  | 2/-    | 10/-   | 40/-      | 150/2      | 1000/5      | 5000/10      |
+
+用法: python scripts/_update_artifact_stats.py [--dry-run]
 """
-import openpyxl
+import argparse
 import os
 import sys
 
+from sheet_changes import ChangeSet, add_mutation_args, finish, open_workbook
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 EXCEL_PATH = os.path.join(BASE_DIR, 'excels', '物品表.xlsx')
 
@@ -181,99 +185,63 @@ FIELDS_TO_CLEAR = {
 }
 
 
+# 新增列的中文表头 (Row 1)
+NEW_FIELD_HEADERS = {
+    'BonusSpellDamage': '技能伤害%',
+    'BonusBlock': '格挡',
+    'BonusFinalDmgIncrease': '终伤增%',
+    'BonusConstitution': '根骨',
+    'BonusAgility': '身法',
+}
+
+
 def main():
+    parser = argparse.ArgumentParser(description='按新属性表更新 物品表.xlsx 的 npc_items_artifacts')
+    add_mutation_args(parser)
+    args = parser.parse_args()
+
     if not os.path.exists(EXCEL_PATH):
         print(f'ERROR: Excel not found: {EXCEL_PATH}')
         sys.exit(1)
 
-    wb = openpyxl.load_workbook(EXCEL_PATH)
+    wb = open_workbook(EXCEL_PATH, args)
     sheet_name = 'npc_items_artifacts'
 
     if sheet_name not in wb.sheetnames:
         print(f'ERROR: Sheet "{sheet_name}" not found')
         sys.exit(1)
 
-    ws = wb[sheet_name]
-
-    # 1. 读取表头 (Row 2 = KV field names)
-    headers = {}  # col_index -> field_name
-    field_to_col = {}  # field_name -> col_index
-    max_col = ws.max_column
-    for c in range(1, max_col + 1):
-        key = ws.cell(row=2, column=c).value
-        if key:
-            key = str(key).strip()
-            headers[c] = key
-            field_to_col[key] = c
-
-    print(f'当前表头: {list(field_to_col.keys())}')
+    # 1. 读取表头 (Row 2 = KV field names) 和 item_name -> row 映射
+    changes = ChangeSet(wb[sheet_name])
+    print(f'当前表头: {list(changes.field_to_col.keys())}')
+    print(f'找到 {len(changes.entry_rows)} 个物品')
 
     # 2. 确保新字段列存在
-    new_fields = ['BonusSpellDamage', 'BonusBlock', 'BonusFinalDmgIncrease',
-                  'BonusConstitution', 'BonusAgility']
-    for field in new_fields:
-        if field not in field_to_col:
-            max_col += 1
-            ws.cell(row=1, column=max_col).value = {
-                'BonusSpellDamage': '技能伤害%',
-                'BonusBlock': '格挡',
-                'BonusFinalDmgIncrease': '终伤增%',
-                'BonusConstitution': '根骨',
-                'BonusAgility': '身法',
-            }.get(field, field)
-            ws.cell(row=2, column=max_col).value = field
-            field_to_col[field] = max_col
-            headers[max_col] = field
-            print(f'  新增列 {max_col}: {field}')
-
-    # 3. 建立 item_name -> row 映射
-    item_rows = {}  # item_name -> row_number
-    for row in range(3, ws.max_row + 1):
-        item_name = ws.cell(row=row, column=1).value
-        if item_name:
-            item_name = str(item_name).strip()
-            item_rows[item_name] = row
+    for field, header in NEW_FIELD_HEADERS.items():
+        if field not in changes.field_to_col:
+            col = changes.add_column(field, header)
+            print(f'  新增列 {col}: {field}')
 
-    print(f'找到 {len(item_rows)} 个物品')
-
-    # 4. 清除旧字段
-    cleared = 0
+    # 3. 清除旧字段
     for item_name, fields_list in FIELDS_TO_CLEAR.items():
-        row = item_rows.get(item_name)
-        if not row:
+        if item_name not in changes.entry_rows:
             print(f'  WARNING: 找不到 {item_name}')
             continue
         for field in fields_list:
-            col = field_to_col.get(field)
-            if col:
-                old_val = ws.cell(row=row, column=col).value
-                if old_val is not None:
-                    ws.cell(row=row, column=col).value = None
-                    cleared += 1
-
-    print(f'清除了 {cleared} 个旧字段值')
+            changes.set_field(item_name, field, None)
 
-    # 5. 写入新数据
-    updated = 0
+    # 4. 写入新数据
     for item_name, stats in ARTIFACT_STATS.items():
-        row = item_rows.get(item_name)
-        if not row:
+        if item_name not in changes.entry_rows:
             print(f'  WARNING: 找不到 {item_name}')
             continue
         for field, value in stats.items():
-            col = field_to_col.get(field)
-            if not col:
+            if changes.set_field(item_name, field, value) is None:
                 print(f'  WARNING: 找不到字段 {field}')
-                continue
-            ws.cell(row=row, column=col).value = value
-            updated += 1
-
-    print(f'更新了 {updated} 个字段值')
 
-    # 6. 保存
-    wb.save(EXCEL_PATH)
-    print(f'\n已保存到 {EXCEL_PATH}')
-    print('请运行 python scripts/gen_artifact_items.py 重新生成 KV 文件')
+    # 5. 有改动才保存
+    if finish(wb, EXCEL_PATH, [changes], args.dry_run, args.quiet, args.openpyxl_save):
+        print('请运行 python scripts/gen_artifact_items.py 重新生成 KV 文件')
 
 
 if __name__ == '__main__':
@@ -14,11 +14,15 @@ Col56=ChaseDistance, Col57=CombatClassAttack, Col58=CombatClassDefend,
 Col59=CustomDrop_Coin, Col60=CustomDrop_Faith, Col61=StatLabel,
 Col62=HaveLevel, Col63=CustomDrop_DefenderPoints,
 Col64=Artifact_Drop_Type, Col65=Artifact_Drop_XP
+
+用法: python scripts/_update_units.py [--dry-run]
 """
-import openpyxl
+import argparse
 import os
 import sys
 
+from sheet_changes import ChangeSet, add_mutation_args, finish, open_workbook
+
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 EXCEL_PATH = os.path.join(BASE_DIR, 'excels', '单位表.xlsx')
 
@@ -216,45 +220,31 @@ for name, mdl, sc, ar, hp, hpR, amin, amax, atkRng, coin, faith, stat, exp, defP
 
 
 def main():
+    parser = argparse.ArgumentParser(description='按数值表更新 单位表.xlsx 的 custom_units')
+    add_mutation_args(parser)
+    args = parser.parse_args()
+
     if not os.path.exists(EXCEL_PATH):
         print(f'ERROR: Excel not found: {EXCEL_PATH}')
         sys.exit(1)
 
-    wb = openpyxl.load_workbook(EXCEL_PATH)
+    wb = open_workbook(EXCEL_PATH, args)
     ws = wb['custom_units']
 
-    # 1. 读取 Row2 表头 -> 列号映射
-    field_to_col = {}
-    for c in range(1, ws.max_column + 1):
-        key = ws.cell(row=2, column=c).value
-        if key:
-            field_to_col[str(key).strip()] = c
-
-    col_unitname = field_to_col.get('UnitName', 1)
+    # 1. 读取 Row2 表头和 UnitName -> Row 映射
+    changes = ChangeSet(ws)
     col_cnname = 2  # #LocUnitNameCn_{}
 
-    # 2. 读取现有 UnitName -> Row 映射
-    unit_rows = {}
-    for row in range(3, ws.max_row + 1):
-        val = ws.cell(row=row, column=col_unitname).value
-        if val:
-            unit_rows[str(val).strip()] = row
-
-    print(f'Excel 共 {len(unit_rows)} 个单位, {len(field_to_col)} 列')
+    print(f'Excel 共 {len(changes.entry_rows)} 个单位, {len(changes.field_to_col)} 列')
 
-    # 3. 重命名旧单位 (npc_enemy_zombie_lvl* -> npc_creep_train_tier*)
+    # 2. 重命名旧单位 (npc_enemy_zombie_lvl* -> npc_creep_train_tier*)
     for old_name, new_name in RENAME_MAP.items():
-        if old_name in unit_rows:
-            row = unit_rows[old_name]
-            ws.cell(row=row, column=col_unitname).value = new_name
-            unit_rows[new_name] = row
-            del unit_rows[old_name]
-            print(f'  重命名: {old_name} -> {new_name} (row {row})')
+        if changes.rename(old_name, new_name):
+            print(f'  重命名: {old_name} -> {new_name} (row {changes.entry_rows[new_name]})')
 
-    # 4. 更新所有单位数据
-    updated_count = 0
+    # 3. 更新所有单位数据
     for unit_name, fields in UNITS.items():
-        row = unit_rows.get(unit_name)
+        row = changes.entry_rows.get(unit_name)
         if not row:
             print(f'  WARNING: 找不到 {unit_name}, 跳过')
             continue
@@ -262,25 +252,16 @@ def main():
         # 更新中文名
         cn = CN_NAMES.get(unit_name)
         if cn:
-            ws.cell(row=row, column=col_cnname).value = cn
+            changes.set(row, col_cnname, cn, unit_name, '#LocUnitNameCn_{}')
 
         # 更新字段
         for field, value in fields.items():
-            col = field_to_col.get(field)
-            if not col:
+            if changes.set_field(unit_name, field, value) is None:
                 print(f'  WARNING: 找不到字段列 {field}')
-                continue
-            old_val = ws.cell(row=row, column=col).value
-            if old_val != value:
-                ws.cell(row=row, column=col).value = value
-                updated_count += 1
-
-    print(f'\n更新了 {updated_count} 个单元格')
 
-    # 5. 保存
-    wb.save(EXCEL_PATH)
-    print(f'已保存到 {EXCEL_PATH}')
-    print('请运行 yarn dev 重新生成 KV 文件')
+    # 4. 有改动才保存
+    if finish(wb, EXCEL_PATH, [changes], args.dry_run, args.quiet, args.openpyxl_save):
+        print('请运行 yarn dev 重新生成 KV 文件')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,200 @@
+"""
+界域守卫神器经验掉落的蒙特卡洛模拟: 按刷怪速度估算每个神器槽位升到各阶所需的击杀数和时间
+
+数据来源:
+- custom_units.txt 的 npc_guardian_zone_N (Artifact_Drop_Type -> 槽位, Artifact_Drop_XP, 生命 / 护甲)
+- npc_items_artifacts.txt 的 XPRequired (与 gen_artifact_tables 相同, 每阶取第一个出现的值)
+- ZoneManager.ts 的 ZONE_COUNT / RESPAWN_TIME / SPAWN_SUFFIXES
+
+模型:
+- 升阶规则与 ArtifactSystem.OnEntityKilled 一致: 击杀时先检查经验是否已满足当前阶, 满足则升阶 (溢出保留),
+  再加本次击杀的经验; 因此每次击杀最多升一阶, 0 -> 1 阶在第一次击杀时发生 (ZoneManager 的器灵觉醒)
+- 每个域有多个出生点, 守卫死亡 RESPAWN_TIME 秒后在原处复活; 玩家依次击杀存活的守卫,
+  第 k 次击杀的完成时间 = max(上一次完成, 同一出生点上次死亡 + 复活时间) + 清怪时间
+- 清怪时间 = --walk + 有效生命 / --dps, 再乘以均值为 1 的对数正态噪声 (--spread)
+- --chance 为假设的掉落概率 (KV 中没有该字段, 当前每次击杀必掉), 用于评估改为概率掉落后的分布
+
+按会话分批向量化: 每批生成 (会话 × 击杀) 的清怪时间矩阵, 逐列递推完成时间, 再按各阶所需击杀数取值
+
+用法:
+  python scripts/artifact_drops.py
+  python scripts/artifact_drops.py --dps 300 --sessions 50000
+  python scripts/artifact_drops.py --xp 80 --chance 0.5 --slot 1
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+from kv_utils import BASE_DIR, KVError, load_kv, kv_root, npc_path, to_number
+from gen_artifact_tables import ARTIFACTS_KV, build_artifact_tables
+from wave_load import effective_hp
+
+ZONE_MANAGER_TS = os.path.join(BASE_DIR, 'game', 'scripts', 'src', 'systems', 'ZoneManager.ts')
+
+SLOT_NAMES = ['武器', '护甲', '头盔', '饰品', '靴子', '护符']
+
+
+def parse_zone_config(path=ZONE_MANAGER_TS):
+    """返回 {'ZONE_COUNT', 'RESPAWN_TIME', 'UNIT_PREFIX', 'SPAWNS'}"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    config = {}
+    for key in ('ZONE_COUNT', 'RESPAWN_TIME'):
+        m = re.search(rf'\b{key}:\s*([\d.]+),', text)
+        if not m:
+            raise ValueError(f'{path} 中找不到 {key}')
+        config[key] = to_number(m.group(1))
+    prefix = re.search(r"\bUNIT_PREFIX:\s*'([^']+)'", text)
+    suffixes = re.search(r'\bSPAWN_SUFFIXES:\s*\[([^\]]*)\]', text)
+    if not prefix or not suffixes:
+        raise ValueError(f'{path} 中找不到 UNIT_PREFIX / SPAWN_SUFFIXES')
+    config['UNIT_PREFIX'] = prefix.group(1)
+    config['SPAWNS'] = len(re.findall(r"'[^']*'", suffixes.group(1)))
+    return config
+
+
+def load_guardians(units, config, xp_override=None):
+    """[{'zone', 'name', 'slot', 'xp', 'ehp'}], 按槽位排序; 缺少单位或掉落字段时报错"""
+    guardians = []
+    for zone in range(1, config['ZONE_COUNT'] + 1):
+        name = f'{config["UNIT_PREFIX"]}{zone}'
+        unit = units.get(name)
+        if not isinstance(unit, dict):
+            raise ValueError(f'custom_units.txt 中找不到 {name}')
+        drop_type = to_number(unit.get('Artifact_Drop_Type'), 0)
+        xp = xp_override if xp_override is not None else to_number(unit.get('Artifact_Drop_XP'), 0)
+        if not 1 <= drop_type <= len(SLOT_NAMES) or xp <= 0:
+            raise ValueError(f'{name}: 没有有效的 Artifact_Drop_Type / Artifact_Drop_XP')
+        guardians.append({'zone': zone, 'name': name, 'slot': int(drop_type) - 1, 'xp': xp,
+                          'ehp': effective_hp(unit)})
+    return sorted(guardians, key=lambda g: g['slot'])
+
+
+def drops_to_tiers(tier_xp, xp):
+    """按 ArtifactSystem 的升阶规则, 返回升到 1..最高阶 分别在第几次掉落时发生"""
+    max_tier = len(tier_xp) - 1
+    tier, current, drops, reached = 0, 0, 0, []
+    while tier < max_tier:
+        drops += 1
+        if current >= tier_xp[tier]:
+            current -= tier_xp[tier]
+            tier += 1
+            reached.append(drops)
+        current += xp
+    return reached
+
+
+def kills_for_drops(reached, chance, sessions, rng):
+    """(会话, 阶) 的击杀次数: 必掉时与掉落次数相同, 否则每段掉落之间的失败次数服从负二项分布"""
+    import numpy as np
+
+    reached = np.asarray(reached, dtype=np.int64)
+    if chance >= 1:
+        return np.broadcast_to(reached, (sessions, len(reached))).copy()
+    gaps = np.diff(reached, prepend=0)
+    return np.cumsum(gaps + rng.negative_binomial(gaps, chance, size=(sessions, len(gaps))), axis=1)
+
+
+def kill_times(kills, clear_time, spread, respawn, spawns, rng, batch=4096):
+    """kills 为 (会话, 阶) 的击杀次数, 返回对应击杀完成的时间 (秒)"""
+    import numpy as np
+
+    sessions = kills.shape[0]
+    times = np.empty(kills.shape, dtype=np.float64)
+    for lo in range(0, sessions, batch):
+        part = kills[lo:lo + batch]
+        n, count = part.shape[0], int(part.max())
+        noise = rng.standard_normal((n, count), dtype=np.float32)
+        # 对数正态噪声的均值为 1: exp(σZ - σ²/2)
+        clear = np.exp(noise * np.float32(spread) - np.float32(spread * spread / 2)) * np.float32(clear_time)
+        done = np.empty((n, count), dtype=np.float32)
+        previous = np.zeros(n, dtype=np.float32)
+        for k in range(count):
+            if k >= spawns:
+                np.maximum(previous, done[:, k - spawns] + np.float32(respawn), out=previous)
+            np.add(previous, clear[:, k], out=done[:, k])
+            previous = done[:, k]
+        times[lo:lo + batch] = np.take_along_axis(done, part - 1, axis=1)
+    return times
+
+
+def simulate(guardian, tier_xp, args, rng):
+    """返回 (kills, times), 均为 (会话, 阶) 的数组"""
+    reached = drops_to_tiers(tier_xp, guardian['xp'])
+    kills = kills_for_drops(reached, args.chance, args.sessions, rng)
+    clear_time = args.walk + guardian['ehp'] / args.dps
+    times = kill_times(kills, clear_time, args.spread, args.respawn, args.spawns, rng)
+    return kills, times
+
+
+def print_slot(guardian, tier_xp, kills, times):
+    import numpy as np
+
+    print(f'槽位 {guardian["slot"]} {SLOT_NAMES[guardian["slot"]]} ← {guardian["name"]} '
+          f'(经验 {guardian["xp"]:g}/次, 有效生命 {guardian["ehp"]:.0f})')
+    print(f'  {"阶":>3}{"所需经验":>10}{"击杀 均值":>11}{"P50":>8}{"P90":>8}'
+          f'{"时间 均值":>11}{"P50":>9}{"P90":>9}  (分钟)')
+    k50, k90 = np.percentile(kills, [50, 90], axis=0)
+    t50, t90 = np.percentile(times, [50, 90], axis=0) / 60
+    k_mean, t_mean = kills.mean(axis=0), times.mean(axis=0) / 60
+    for i in range(kills.shape[1]):
+        print(f'  {i + 1:>3}{tier_xp[i]:>10g}{k_mean[i]:>11.1f}{k50[i]:>8.0f}{k90[i]:>8.0f}'
+              f'{t_mean[i]:>11.1f}{t50[i]:>9.1f}{t90[i]:>9.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='界域守卫神器经验掉落的蒙特卡洛模拟')
+    parser.add_argument('--dps', type=float, default=150, help='玩家对守卫的平均 DPS')
+    parser.add_argument('--walk', type=float, default=1.0, help='每次击杀的额外耗时 (走位 / 起手), 秒')
+    parser.add_argument('--spread', type=float, default=0.3, help='清怪时间对数正态噪声的 σ')
+    parser.add_argument('--chance', type=float, default=1.0, help='假设的掉落概率 (当前为必掉)')
+    parser.add_argument('--xp', type=float, help='覆盖所有守卫的 Artifact_Drop_XP')
+    parser.add_argument('--respawn', type=float, help='覆盖 ZoneManager 的复活时间 (秒)')
+    parser.add_argument('--slot', type=int, action='append', help='只模拟指定槽位 (0-5, 可重复)')
+    parser.add_argument('--sessions', type=int, default=20000, help='每个槽位模拟的刷怪会话数')
+    parser.add_argument('--seed', type=int, help='随机种子')
+    args = parser.parse_args()
+
+    if not 0 < args.chance <= 1 or args.dps <= 0 or args.sessions <= 0:
+        print('ERROR: --chance 须在 (0, 1] 内, --dps / --sessions 须为正数')
+        sys.exit(1)
+    try:
+        import numpy as np
+    except ImportError:
+        print('ERROR: 需要 numpy (pip install numpy)')
+        sys.exit(1)
+
+    try:
+        config = parse_zone_config()
+        guardians = load_guardians(kv_root(load_kv(npc_path('custom_units.txt'))), config, args.xp)
+        _, _, _, tier_xp, errors = build_artifact_tables(kv_root(load_kv(ARTIFACTS_KV)))
+    except (OSError, KVError, ValueError) as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
+    if errors:
+        for err in errors:
+            print(f'  ERROR: {err}')
+        sys.exit(1)
+    args.respawn = config['RESPAWN_TIME'] if args.respawn is None else args.respawn
+    args.spawns = config['SPAWNS']
+    if args.slot:
+        guardians = [g for g in guardians if g['slot'] in args.slot]
+
+    print(f'阶级经验 {tier_xp}; 每域 {args.spawns} 个出生点, 复活 {args.respawn:g} 秒; '
+          f'DPS {args.dps:g}, 掉落概率 {args.chance:g}, {args.sessions} 个会话')
+    rng = np.random.default_rng(args.seed)
+    total_kills, start = 0, time.perf_counter()
+    for guardian in guardians:
+        print()
+        kills, times = simulate(guardian, tier_xp, args, rng)
+        total_kills += int(kills[:, -1].sum())
+        print_slot(guardian, tier_xp, kills, times)
+    elapsed = time.perf_counter() - start
+    print()
+    print(f'共模拟 {total_kills} 次击杀, 耗时 {elapsed:.2f} 秒 ({total_kills / elapsed / 1e6:.1f} 百万次/秒)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,312 @@
+"""
+把 excels/ 下所有工作簿编译为一个可查询的 SQLite 数据库 (.cache/content.db)
+
+- 每个 sheet 一张表, 表名 = sheet 名 (与生成的 KV 文件同名); 不同工作簿中有同名 sheet 时报错,
+  而不是让后读到的表覆盖前一个 (gulp 生成 KV 时同样会互相覆盖)
+- 列名 = Row 2 的 KV 字段名, 嵌套块内的字段写作 "Precache.particle"
+- 列类型按数据推断 (INTEGER / REAL / TEXT); 数字与文本混合的列 (如冷却填 8 或 "1 2 3 4") 为 NUMERIC,
+  数字单元格仍按数字存储和比较, "AbilityCooldown < 10" 不会按字符串比较
+- 第 1 列 (A 列) 为条目名, 与 KV 的键一致; Row 2 中 A 列为空时列名为 name
+- 块内打包的 "key value" 数值列 (如 AbilityValues) 展开到 block_values 表
+- 名称列、ID 列和分类列 (AbilityCategory / AbilityElement / SkillBookCategory ...) 建索引
+- 增量刷新: 以 sheet 为单位比较指纹, 只重建发生变化的表
+
+用法:
+  python scripts/build_content_db.py                 # 增量刷新
+  python scripts/build_content_db.py --full          # 全量重建
+  python scripts/build_content_db.py --list          # 列出所有表
+  python scripts/build_content_db.py -q "SELECT name, AbilityCooldown FROM npc_abilities_custom WHERE AbilityElement = 'DIVINITY' AND AbilityCooldown < 10"
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+
+from sheet_utils import (BASE_DIR, EXCELS_DIR, KEY_ROW, list_workbooks, is_ignored_sheet,
+                         coerce_value, sheet_fingerprints)
+from workbook_reader import open_workbook
+
+DEFAULT_DB_PATH = os.path.join(BASE_DIR, '.cache', 'content.db')
+
+# 需要建索引的字段 (存在即建)
+INDEXED_KEYS = [
+    'ID', 'AbilityCategory', 'AbilityElement', 'SkillBookCategory',
+    'ArtifactSlot', 'ArtifactTier', 'Artifact_Drop_Type', 'LearnAbilityName', 'BaseClass',
+]
+
+# 条目名所在的列 (A 列, 与 read_sheet_rows 判断空行的列相同), Row 2 为空时使用的列名
+NAME_COL = 0
+NAME_COLUMN = 'name'
+
+META_TABLE = '_sheets'
+VALUES_TABLE = 'block_values'
+
+
+class ContentDBError(ValueError):
+    pass
+
+
+def quote(name):
+    return '"%s"' % name.replace('"', '""')
+
+
+def flatten_headers(key_row):
+    """
+    解析 Row 2, 返回 (columns, packed)
+    columns: [(列下标, 列名)], 嵌套块内字段以 "块名.字段" 命名; columns[0] 总是 A 列 (条目名)
+    packed:  [(列下标, 块名)], 块内字段名为数字的打包列
+    """
+    columns, packed = [], []
+    stack, seen = [], set()
+    for i, key in enumerate(key_row or [None]):
+        if i == NAME_COL:
+            name = str(key).strip() if key is not None and str(key).strip() else NAME_COLUMN
+            columns.append((i, name))
+            seen.add(name)
+            continue
+        if key is None or str(key).strip() == '':
+            continue
+        key = str(key).strip()
+        if key.endswith('[{]'):
+            stack.append(key[:-3])
+            continue
+        if key == '[}]':
+            if stack:
+                stack.pop()
+            continue
+        if stack and key.isdigit():
+            packed.append((i, '.'.join(stack)))
+            continue
+        name = '.'.join(stack + [key])
+        unique, n = name, 2
+        while unique in seen:
+            unique = '%s#%d' % (name, n)
+            n += 1
+        seen.add(unique)
+        columns.append((i, unique))
+    return columns, packed
+
+
+def split_packed(val):
+    """把 "dmg_multiplier 4 5 6 7" 拆成 (key, "4 5 6 7")"""
+    parts = str(val).strip().split(' ', 1)
+    return parts[0], (parts[1].strip() if len(parts) == 2 else '')
+
+
+def first_number(text):
+    try:
+        return float(str(text).split()[0])
+    except (ValueError, IndexError):
+        return None
+
+
+def infer_type(values):
+    """全为整数 INTEGER, 含小数 REAL, 全为文本 TEXT; 数字与文本混合时为 NUMERIC, 数字单元格保持数字"""
+    kind, has_number, has_text = 'INTEGER', False, False
+    for v in values:
+        if v is None:
+            continue
+        if isinstance(v, (int, float)):
+            has_number = True
+            if isinstance(v, float):
+                kind = 'REAL'
+        else:
+            has_text = True
+    if has_text:
+        return 'NUMERIC' if has_number else 'TEXT'
+    return kind
+
+
+def read_sheet_rows(ws):
+    """读取一个 sheet, 返回 (key_row, data_rows), data_rows 已去掉无名行"""
+    key_row, data = None, []
+    for r, row in enumerate(ws.iter_rows(values_only=True), start=1):
+        if r < KEY_ROW:
+            continue
+        if r == KEY_ROW:
+            key_row = list(row)
+            continue
+        if not row or row[0] is None or str(row[0]).strip() == '':
+            continue
+        data.append(row)
+    return key_row or [], data
+
+
+def content_hash(key_row, data):
+    h = hashlib.sha1()
+    h.update(repr(key_row).encode('utf-8'))
+    for row in data:
+        h.update(repr(row).encode('utf-8'))
+    return h.hexdigest()
+
+
+def ensure_schema(conn):
+    conn.execute(f'''CREATE TABLE IF NOT EXISTS {META_TABLE} (
+        table_name TEXT PRIMARY KEY, workbook TEXT, sheet TEXT,
+        fingerprint TEXT, content_hash TEXT, row_count INTEGER, built_at REAL)''')
+    conn.execute(f'''CREATE TABLE IF NOT EXISTS {VALUES_TABLE} (
+        sheet TEXT, name TEXT, block TEXT, key TEXT, value TEXT, num REAL)''')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{VALUES_TABLE}_name ON {VALUES_TABLE} (sheet, name)')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{VALUES_TABLE}_key ON {VALUES_TABLE} (block, key)')
+
+
+def rebuild_table(conn, table, key_row, data):
+    """删除并重建一个 sheet 的表和它在 block_values 中的数据"""
+    columns, packed = flatten_headers(key_row)
+    coerced = [[coerce_value(row[i]) if i < len(row) else None for i, _ in columns] for row in data]
+    types = [infer_type(r[c] for r in coerced) for c in range(len(columns))]
+    # 条目名列 (columns[0], 即 A 列) 总是 TEXT
+    types[0] = 'TEXT'
+
+    conn.execute(f'DROP TABLE IF EXISTS {quote(table)}')
+    col_defs = ', '.join(f'{quote(name)} {t}' for (_, name), t in zip(columns, types))
+    conn.execute(f'CREATE TABLE {quote(table)} ({col_defs})')
+    placeholders = ', '.join('?' * len(columns))
+    conn.executemany(f'INSERT INTO {quote(table)} VALUES ({placeholders})',
+                     [[str(r[0])] + r[1:] for r in coerced])
+
+    col_names = [name for _, name in columns]
+    for key in [col_names[0]] + [k for k in INDEXED_KEYS if k in col_names[1:]]:
+        conn.execute(f'CREATE INDEX {quote("idx_%s_%s" % (table, key))} ON {quote(table)} ({quote(key)})')
+
+    conn.execute(f'DELETE FROM {VALUES_TABLE} WHERE sheet = ?', (table,))
+    if packed:
+        values = []
+        for row in data:
+            name = str(row[NAME_COL]).strip()
+            for i, block in packed:
+                val = row[i] if i < len(row) else None
+                if val is None or str(val).strip() == '':
+                    continue
+                key, text = split_packed(val)
+                values.append((table, name, block, key, text, first_number(text)))
+        conn.executemany(f'INSERT INTO {VALUES_TABLE} VALUES (?, ?, ?, ?, ?, ?)', values)
+    return len(coerced)
+
+
+def drop_table(conn, table):
+    conn.execute(f'DROP TABLE IF EXISTS {quote(table)}')
+    conn.execute(f'DELETE FROM {VALUES_TABLE} WHERE sheet = ?', (table,))
+    conn.execute(f'DELETE FROM {META_TABLE} WHERE table_name = ?', (table,))
+
+
+def refresh(conn, excels_dir=EXCELS_DIR, full=False, verbose=True):
+    """增量刷新数据库, 返回重建的表名列表; 不同工作簿中有同名 sheet 时抛出 ContentDBError, 数据库保持不变"""
+    ensure_schema(conn)
+    meta = {row[0]: row[1:] for row in conn.execute(
+        f'SELECT table_name, workbook, fingerprint, content_hash FROM {META_TABLE}')}
+    rebuilt, owners, sources = [], {}, []
+
+    for path in list_workbooks(excels_dir):
+        workbook = os.path.basename(path)
+        try:
+            prints = sheet_fingerprints(path)
+        except Exception as e:
+            print(f'  WARNING: 无法读取 {workbook}: {e}')
+            continue
+        sheets = [s for s in prints if not is_ignored_sheet(s)]
+        for sheet in sheets:
+            if sheet in owners:
+                raise ContentDBError(f'{owners[sheet]} 和 {workbook} 中都有 sheet {sheet}, '
+                                     f'表名 (即生成的 KV 文件名) 必须唯一')
+            owners[sheet] = workbook
+        sources.append((path, workbook, prints, sheets))
+
+    for path, workbook, prints, sheets in sources:
+        stale = [s for s in sheets if full or s not in meta or meta[s][1] != prints[s]]
+        if not stale:
+            continue
+
+        wb = open_workbook(path)
+        try:
+            for sheet in stale:
+                key_row, data = read_sheet_rows(wb[sheet])
+                digest = content_hash(key_row, data)
+                if not full and sheet in meta and meta[sheet][2] == digest:
+                    # 文件变化但本 sheet 内容未变, 只更新指纹
+                    conn.execute(f'UPDATE {META_TABLE} SET fingerprint = ? WHERE table_name = ?',
+                                 (prints[sheet], sheet))
+                    continue
+                count = rebuild_table(conn, sheet, key_row, data)
+                conn.execute(f'INSERT OR REPLACE INTO {META_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)',
+                             (sheet, workbook, sheet, prints[sheet], digest, count, time.time()))
+                rebuilt.append(sheet)
+                if verbose:
+                    print(f'  {workbook} / {sheet}: {count} 行')
+        finally:
+            wb.close()
+
+    for table in set(meta) - set(owners):
+        drop_table(conn, table)
+        if verbose:
+            print(f'  移除已不存在的 sheet: {table}')
+
+    conn.commit()
+    return rebuilt
+
+
+def open_db(db_path=DEFAULT_DB_PATH, excels_dir=EXCELS_DIR, refresh_first=True):
+    """打开内容数据库 (默认先做一次增量刷新), 供其他工具复用"""
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    if refresh_first:
+        refresh(conn, excels_dir, verbose=False)
+    return conn
+
+
+def print_rows(cursor):
+    """以对齐的表格形式打印查询结果"""
+    rows = cursor.fetchall()
+    if cursor.description is None:
+        return
+    headers = [d[0] for d in cursor.description]
+    cells = [['' if v is None else str(v) for v in row] for row in rows]
+    widths = [max([len(h)] + [len(r[i]) for r in cells]) for i, h in enumerate(headers)]
+    print(' | '.join(h.ljust(w) for h, w in zip(headers, widths)))
+    print('-+-'.join('-' * w for w in widths))
+    for r in cells:
+        print(' | '.join(v.ljust(w) for v, w in zip(r, widths)))
+    print(f'({len(rows)} 行)')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='把所有 Excel 表编译为 SQLite 内容数据库')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='数据库路径')
+    parser.add_argument('--excels', default=EXCELS_DIR, help='工作簿目录')
+    parser.add_argument('--full', action='store_true', help='忽略指纹, 全量重建')
+    parser.add_argument('--list', action='store_true', help='列出所有表及行数')
+    parser.add_argument('-q', '--query', help='刷新后执行一条 SQL 并打印结果')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.excels):
+        print(f'ERROR: 目录不存在: {args.excels}')
+        sys.exit(1)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+    conn = sqlite3.connect(args.db)
+    start = time.perf_counter()
+    try:
+        rebuilt = refresh(conn, args.excels, full=args.full, verbose=not args.query)
+    except ContentDBError as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
+    if not args.query:
+        print(f'重建 {len(rebuilt)} 张表, 用时 {time.perf_counter() - start:.2f}s -> {args.db}')
+
+    if args.list:
+        print_rows(conn.execute(
+            f'SELECT table_name, workbook, row_count FROM {META_TABLE} ORDER BY workbook, table_name'))
+    if args.query:
+        try:
+            print_rows(conn.execute(args.query))
+        except sqlite3.Error as e:
+            print(f'ERROR: {e}')
+            sys.exit(1)
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,469 @@
+"""
+英雄对单个 BOSS 的离散事件战斗模拟, 用于调整公共技能 (烈焰风暴 / 毒阵 / 金钟罩 ...) 和 BOSS 数值
+
+- 事件按时间放入堆中依次处理: 普通攻击、施法 (施法前摇期间不攻击)、技能的延迟 / 持续伤害、
+  护盾到期、BOSS 攻击、BOSS 生命回复
+- 技能的冷却 / 法力 / 施法前摇 / AbilityValues 按等级取自 gen_ability_values 生成的 ability_values.json
+  (未生成时直接从 npc_abilities_custom.txt 展开)
+- 轮换 (--rotation) 为技能的优先级列表: 每次空闲时释放第一个冷却完毕且法力足够的主动技能;
+  列表中的被动技能 (如 soldier_war_strike) 常驻生效
+- 伤害经过 damage_model (即 DamageSystem 的破势 / 暴击 / 终伤), 再按引擎的护甲 / 魔抗减免;
+  暴击按伪随机 (PRD) 判定, 与 RollPseudoRandomPercentage 相同, 攻击和技能共用一个计数
+- 多场战斗在进程池中并行, 每场使用不同的随机种子
+
+已实现的技能效果见 EFFECTS; 英雄不会死亡 (只统计承受的伤害), BOSS 只有普通攻击
+
+用法:
+  python scripts/combat_sim.py --rotation flame_storm,plague_cloud,golden_bell --rotation flame_storm
+  python scripts/combat_sim.py --unit npc_boss_wave_10 --stat divinity=2000 --stat crit_chance=30 --fights 2000
+"""
+import argparse
+import heapq
+import itertools
+import json
+import math
+import os
+import random
+import statistics
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import damage_model
+from export_utils import SRC_JSON_DIR
+from gen_ability_values import ABILITIES_KV, OUTPUT_NAME, build_tables
+from kv_utils import KVError, load_kv, kv_root, to_number
+from precache_manifest import load_entries
+from wave_load import armor_multiplier
+
+ABILITY_VALUES_JSON = os.path.join(SRC_JSON_DIR, OUTPUT_NAME)
+ABILITY_PREFIX = 'ability_public_'
+
+# 英雄面板的缺省值, 用 --stat 覆盖 (字段名与 CustomStats 一致)
+DEFAULT_BUILD = {
+    'level': 4,               # 技能等级 (轮换中可用 名称:等级 单独指定)
+    'damage': 500,            # 攻击力
+    'attack_speed': 100,      # 攻速 (100 + 身法 + 额外攻速)
+    'base_attack_time': 1.7,  # 基础攻击间隔
+    'constitution': 200,
+    'martial': 200,
+    'divinity': 200,
+    'mana': 1000,
+    'mana_regen': 5,
+    'armor': 10,
+    'crit_chance': 0,
+    'crit_damage': 105,
+    'armor_pen': 0,
+    'final_dmg_increase': 0,
+}
+DEFAULT_UNIT = 'npc_boss_wave_20'
+DEFAULT_ROTATION = 'flame_storm,plague_cloud,golden_bell'
+TIME_LIMIT = 600
+
+
+# ---- 技能效果: (战斗, 当前等级的数值, 施法时间) -> 安排后续事件 ----
+
+def _flame_storm(fight, values, t):
+    """wave_count 波火雨, 间隔 wave_interval, 每波 神念 × dmg_multiplier"""
+    name = 'ability_public_flame_storm'
+    for i in range(int(values.get('wave_count') or 3)):
+        fight.schedule(t + i * (values.get('wave_interval') or 0.8), 'hit', name)
+
+
+def _plague_cloud(fight, values, t):
+    """持续 duration 秒, 每秒一跳 神念 × dmg_multiplier"""
+    name = 'ability_public_plague_cloud'
+    for i in range(1, int(values.get('duration') or 5) + 1):
+        fight.schedule(t + i, 'hit', name)
+
+
+def _golden_bell(fight, values, t):
+    """根骨 × shield_multiplier 的护盾, 被击碎或到期时爆炸 (根骨 × dmg_multiplier)"""
+    fight.shield_id += 1
+    fight.shield = fight.build['constitution'] * (values.get('shield_multiplier') or 5)
+    fight.schedule(t + (values.get('shield_duration') or 3), 'shield_end', fight.shield_id)
+
+
+EFFECTS = {
+    'ability_public_flame_storm': _flame_storm,
+    'ability_public_plague_cloud': _plague_cloud,
+    'ability_public_golden_bell': _golden_bell,
+}
+
+# 技能每次命中的基础伤害: 技能名 -> (面板属性, 倍率字段, 默认倍率)
+HIT_DAMAGE = {
+    'ability_public_flame_storm': ('divinity', 'dmg_multiplier', 4),
+    'ability_public_plague_cloud': ('divinity', 'dmg_multiplier', 1),
+    'ability_public_golden_bell': ('constitution', 'dmg_multiplier', 5),
+}
+
+# 有模拟效果的被动 (其他被动如 martial_cleave 的溅射在单体战斗中没有效果)
+PASSIVE_EFFECTS = {'soldier_war_strike'}
+
+
+@lru_cache(maxsize=None)
+def prd_constant(chance):
+    """Dota 伪随机的 C 值: 第 n 次判定的概率为 n·C (成功后重置), 长期平均等于 chance"""
+    if chance <= 0:
+        return 0.0
+    if chance >= 1:
+        return 1.0
+
+    def average(c):
+        expected, reached = 0.0, 0.0
+        for n in range(1, math.ceil(1 / c) + 1):
+            p = min(1.0, n * c) * (1 - reached)
+            reached += p
+            expected += n * p
+        return 1 / expected
+
+    lo, hi = 0.0, chance
+    for _ in range(50):
+        mid = (lo + hi) / 2
+        if average(mid) < chance:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2
+
+
+class Fight:
+    """一场战斗; setup 由 prepare() 生成"""
+
+    def __init__(self, setup, seed):
+        self.setup = setup
+        self.build = setup['build']
+        self.rng = random.Random(seed)
+        self.heap = []
+        self.seq = itertools.count()
+        self.boss_hp = setup['unit']['hp']
+        self.regen_time = 0.0
+        self.mana = self.build['mana']
+        self.mana_time = 0.0
+        self.ready = {ability['name']: 0.0 for ability in setup['abilities']}
+        self.busy_until = 0.0
+        self.prd_fails = 0
+        self.attacks = 0
+        self.shield = 0.0
+        self.shield_id = 0
+        self.damage = defaultdict(float)
+        self.casts = defaultdict(int)
+        self.absorbed = 0.0
+        self.taken = 0.0
+        self.kill_time = None
+
+    def schedule(self, t, kind, arg=None):
+        heapq.heappush(self.heap, (t, next(self.seq), kind, arg))
+
+    def mana_at(self, t):
+        self.mana = min(self.build['mana'], self.mana + (t - self.mana_time) * self.build['mana_regen'])
+        self.mana_time = t
+        return self.mana
+
+    def roll_crit(self):
+        c = self.setup['prd']
+        if c <= 0:
+            return False
+        self.prd_fails += 1
+        if self.rng.random() < self.prd_fails * c:
+            self.prd_fails = 0
+            return True
+        return False
+
+    def hit(self, t, key, source=None):
+        """按预先算好的 (不暴击, 暴击) 伤害结算一次命中"""
+        normal, crit, can_crit = self.setup['hits'][key]
+        amount = crit if can_crit and self.roll_crit() else normal
+        unit = self.setup['unit']
+        self.boss_hp = min(unit['hp'], self.boss_hp + (t - self.regen_time) * unit['regen'])
+        self.regen_time = t
+        amount = min(amount, self.boss_hp)
+        self.boss_hp -= amount
+        self.damage[source or key] += amount
+        if self.boss_hp <= 0:
+            self.kill_time = t
+
+    def decide(self, t):
+        """空闲时按优先级施法; 都不可用时等到最早可用的时间"""
+        if t < self.busy_until:
+            return
+        wait = math.inf
+        for ability in self.setup['abilities']:
+            if ability['passive']:
+                continue
+            ready = self.ready[ability['name']]
+            missing = ability['mana'] - self.mana_at(t)
+            if ready <= t and missing <= 0:
+                self.busy_until = t + ability['cast_point']
+                self.schedule(self.busy_until, 'cast', ability)
+                return
+            if missing <= 0:
+                wait = min(wait, ready)
+            elif self.build['mana_regen'] > 0:
+                wait = min(wait, max(ready, t + missing / self.build['mana_regen']))
+        if wait < math.inf:
+            self.schedule(wait, 'decide')
+
+    def explode(self, t):
+        self.shield = 0.0
+        self.hit(t, 'ability_public_golden_bell')
+
+    def run(self):
+        setup, unit = self.setup, self.setup['unit']
+        self.schedule(0.0, 'decide')
+        self.schedule(0.0, 'attack')
+        if unit['attack'] > 0:
+            self.schedule(unit['attack_rate'], 'boss_attack')
+        while self.heap and self.kill_time is None:
+            t, _, kind, arg = heapq.heappop(self.heap)
+            if t > setup['time_limit']:
+                break
+            if kind == 'attack':
+                if t < self.busy_until:
+                    # 施法前摇期间不攻击
+                    self.schedule(self.busy_until, 'attack')
+                    continue
+                self.attacks += 1
+                proc = setup['proc']
+                if proc and self.attacks % proc[0] == 0:
+                    self.hit(t, 'proc', proc[1])
+                else:
+                    self.hit(t, 'attack')
+                self.schedule(t + setup['attack_interval'], 'attack')
+            elif kind == 'decide':
+                self.decide(t)
+            elif kind == 'cast':
+                self.mana_at(t)
+                self.mana -= arg['mana']
+                self.ready[arg['name']] = t + arg['cooldown']
+                self.casts[arg['name']] += 1
+                effect = EFFECTS.get(arg['name'])
+                if effect:
+                    effect(self, arg['values'], t)
+                self.decide(t)
+            elif kind == 'hit':
+                self.hit(t, arg)
+            elif kind == 'shield_end':
+                if arg == self.shield_id and self.shield > 0:
+                    self.explode(t)
+            elif kind == 'boss_attack':
+                damage = unit['attack'] * setup['hero_armor']
+                absorbed = min(damage, self.shield)
+                self.absorbed += absorbed
+                self.taken += damage - absorbed
+                if absorbed:
+                    self.shield -= absorbed
+                    if self.shield <= 0:
+                        self.explode(t)
+                self.schedule(t + unit['attack_rate'], 'boss_attack')
+        return {
+            'kill_time': self.kill_time,
+            'duration': self.kill_time if self.kill_time is not None else setup['time_limit'],
+            'damage': dict(self.damage),
+            'casts': dict(self.casts),
+            'absorbed': self.absorbed,
+            'taken': self.taken,
+        }
+
+
+def run_fight(task):
+    setup, seed = task
+    return Fight(setup, seed).run()
+
+
+def load_ability_tables():
+    """优先读取已生成的 ability_values.json, 否则从 KV 展开"""
+    if os.path.exists(ABILITY_VALUES_JSON):
+        with open(ABILITY_VALUES_JSON, encoding='utf-8') as f:
+            return json.load(f)
+    tables, _ = build_tables(kv_root(load_kv(ABILITIES_KV)))
+    return tables
+
+
+def _level_value(values, field, level, default=0):
+    levels = values.get(field) or []
+    if not levels:
+        return default
+    value = levels[min(level, len(levels)) - 1]
+    return value if isinstance(value, (int, float)) else default
+
+
+def parse_rotation(text, tables, kv, level):
+    """"flame_storm,golden_bell:2" -> 技能列表; 名称可省略 ability_public_ 前缀"""
+    abilities = []
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        name, _, lv = item.partition(':')
+        if name not in tables and ABILITY_PREFIX + name in tables:
+            name = ABILITY_PREFIX + name
+        if name not in tables:
+            raise ValueError(f'找不到技能 {name}')
+        lv = min(int(lv or level), tables[name]['MaxLevel'])
+        values = tables[name]['values']
+        passive = 'PASSIVE' in str(kv.get(name, {}).get('AbilityBehavior', ''))
+        if not passive and name not in EFFECTS:
+            raise ValueError(f'{name} 还没有实现模拟效果 (见 EFFECTS)')
+        if passive and name not in PASSIVE_EFFECTS:
+            print(f'  WARNING: 被动技能 {name} 在单体战斗中没有模拟效果')
+        abilities.append({
+            'name': name,
+            'level': lv,
+            'passive': passive,
+            'cooldown': _level_value(values, 'AbilityCooldown', lv),
+            'mana': _level_value(values, 'AbilityManaCost', lv),
+            'cast_point': _level_value(values, 'AbilityCastPoint', lv),
+            'values': {field: _level_value(values, field, lv) for field in values},
+        })
+    return abilities
+
+
+def prepare(build, unit_kv, abilities, time_limit):
+    """预先算好每种命中的最终伤害, 战斗中只需判定暴击"""
+    armor = to_number(unit_kv.get('ArmorPhysical'), 0)
+    magic_resist = to_number(unit_kv.get('MagicalResistance'), 0)
+    sources = [('attack', build['damage'], damage_model.PHYSICAL)]
+    proc = None
+    for ability in abilities:
+        name, values = ability['name'], ability['values']
+        if name == 'soldier_war_strike':
+            # 每 attacks_to_proc 次攻击一次 damage_pct% 的引擎暴击 (与 DamageSystem 的暴击叠乘)
+            proc = (int(values.get('attacks_to_proc') or 4), name)
+            sources.append(('proc', build['damage'] * (values.get('damage_pct') or 250) / 100, damage_model.PHYSICAL))
+        elif name in HIT_DAMAGE:
+            stat, field, default = HIT_DAMAGE[name]
+            sources.append((name, build[stat] * (values.get(field) or default), damage_model.MAGICAL))
+
+    base = [damage for _, damage, _ in sources]
+    types = [damage_type for _, _, damage_type in sources]
+    kwargs = dict(armor_pen=build['armor_pen'], crit_chance=build['crit_chance'], crit_damage=build['crit_damage'],
+                  final_dmg_increase=build['final_dmg_increase'], armor=armor)
+    normal = damage_model.final_damage(base, types, crit='never', **kwargs)
+    crit = damage_model.final_damage(base, types, crit='always', **kwargs)
+    hits = {}
+    for (key, _, damage_type), a, b in zip(sources, normal, crit):
+        # 过滤器之后引擎再按护甲 / 魔抗减免
+        mitigation = armor_multiplier(armor) if damage_type == damage_model.PHYSICAL else 1 - magic_resist / 100
+        hits[key] = (float(a) * mitigation, float(b) * mitigation, damage_type != damage_model.PURE)
+
+    attack_speed = min(max(build['attack_speed'], 20), 700)
+    return {
+        'build': build,
+        'abilities': abilities,
+        'hits': hits,
+        'proc': proc,
+        'prd': prd_constant(min(max(build['crit_chance'], 0), 100) / 100),
+        'attack_interval': build['base_attack_time'] / (attack_speed / 100),
+        'hero_armor': armor_multiplier(build['armor']),
+        'unit': {
+            'hp': to_number(unit_kv.get('StatusHealth'), 1),
+            'regen': to_number(unit_kv.get('StatusHealthRegen'), 0),
+            'attack': (to_number(unit_kv.get('AttackDamageMin'), 0) + to_number(unit_kv.get('AttackDamageMax'), 0)) / 2,
+            'attack_rate': to_number(unit_kv.get('AttackRate'), 1.7) or 1.7,
+        },
+        'time_limit': time_limit,
+    }
+
+
+def summarize(results):
+    """多场战斗的汇总"""
+    kills = sorted(r['kill_time'] for r in results if r['kill_time'] is not None)
+    duration = sum(r['duration'] for r in results)
+    damage = defaultdict(float)
+    casts = defaultdict(int)
+    for r in results:
+        for source, amount in r['damage'].items():
+            damage[source] += amount
+        for name, count in r['casts'].items():
+            casts[name] += count
+    return {
+        'fights': len(results),
+        'kills': len(kills),
+        'mean': statistics.fmean(kills) if kills else None,
+        'p50': kills[len(kills) // 2] if kills else None,
+        'p90': kills[min(len(kills) - 1, int(len(kills) * 0.9))] if kills else None,
+        'dps': sum(damage.values()) / duration if duration else 0,
+        'damage': dict(damage),
+        'duration': duration,
+        'casts': {name: count / len(results) for name, count in casts.items()},
+        'absorbed': sum(r['absorbed'] for r in results) / len(results),
+        'taken': sum(r['taken'] for r in results) / len(results),
+    }
+
+
+def _fmt(value):
+    if value is None:
+        return '-'
+    return f'{value:.3g}' if abs(value) >= 1e5 else f'{value:.1f}'
+
+
+def print_summary(rotation, summary, time_limit):
+    print(f'轮换 {rotation}: {summary["fights"]} 场')
+    if summary['kills']:
+        print(f'  击杀 {summary["kills"]}/{summary["fights"]}, 用时 平均 {summary["mean"]:.1f}s  '
+              f'P50 {summary["p50"]:.1f}s  P90 {summary["p90"]:.1f}s')
+    else:
+        print(f'  {time_limit:g} 秒内全部未能击杀')
+    print(f'  总 DPS {_fmt(summary["dps"])}, 承受伤害 {_fmt(summary["taken"])}/场, 护盾吸收 {_fmt(summary["absorbed"])}/场')
+    total = sum(summary['damage'].values()) or 1
+    width = max(len(source) for source in summary['damage']) if summary['damage'] else 0
+    for source, amount in sorted(summary['damage'].items(), key=lambda item: -item[1]):
+        casts = summary['casts'].get(source)
+        extra = f'  施放 {casts:.1f} 次/场' if casts else ''
+        print(f'    {source:<{width}}  DPS {_fmt(amount / summary["duration"]):>9}  {amount / total * 100:5.1f}%{extra}')
+
+
+def _parse_stats(items):
+    build = dict(DEFAULT_BUILD)
+    for item in items:
+        key, sep, value = item.partition('=')
+        if not sep or key not in build:
+            raise ValueError(f'无效的 --stat {item} (可用: {", ".join(build)})')
+        build[key] = float(value)
+    build['level'] = int(build['level'])
+    return build
+
+
+def main():
+    parser = argparse.ArgumentParser(description='英雄技能轮换对 BOSS 的战斗模拟')
+    parser.add_argument('--unit', default=DEFAULT_UNIT, help=f'目标单位 (默认 {DEFAULT_UNIT})')
+    parser.add_argument('--rotation', action='append', help=f'技能优先级, 逗号分隔, 可重复 (默认 {DEFAULT_ROTATION})')
+    parser.add_argument('--stat', action='append', default=[], help='英雄面板, 如 divinity=1500 (可重复)')
+    parser.add_argument('--fights', type=int, default=1000, help='每个轮换模拟的场数')
+    parser.add_argument('--time-limit', type=float, default=TIME_LIMIT, help='每场最长时间 (秒)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='并行进程数')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--json', action='store_true', help='输出 JSON')
+    args = parser.parse_args()
+
+    try:
+        build = _parse_stats(args.stat)
+        kv = kv_root(load_kv(ABILITIES_KV))
+        tables = load_ability_tables()
+        units = load_entries(['npc_units_custom.txt'])
+        if args.unit not in units:
+            raise ValueError(f'找不到单位 {args.unit}')
+        rotations = args.rotation or [DEFAULT_ROTATION]
+        setups = [prepare(build, units[args.unit], parse_rotation(r, tables, kv, build['level']), args.time_limit)
+                  for r in rotations]
+    except (OSError, KVError, ValueError) as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
+
+    tasks = [(setup, args.seed * 1000003 + i) for setup in setups for i in range(args.fights)]
+    with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        results = list(pool.map(run_fight, tasks, chunksize=max(1, len(tasks) // (max(1, args.jobs) * 8))))
+
+    summaries = [summarize(results[i * args.fights:(i + 1) * args.fights]) for i in range(len(setups))]
+    if args.json:
+        print(json.dumps({'unit': args.unit, 'build': build,
+                          'rotations': dict(zip(rotations, summaries))}, ensure_ascii=False, indent=1))
+        return
+    unit = setups[0]['unit']
+    print(f'{args.unit}: 生命 {_fmt(unit["hp"])}, 回复 {_fmt(unit["regen"])}/s, 攻击 {_fmt(unit["attack"])}')
+    for rotation, summary in zip(rotations, summaries):
+        print()
+        print_summary(rotation, summary, args.time_limit)
+
+
+if __name__ == '__main__':
+    main()
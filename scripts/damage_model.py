@@ -0,0 +1,258 @@
+"""
+DamageSystem (game/scripts/src/systems/DamageSystem.ts) 伤害过滤器的 NumPy 参考实现
+
+所有数值工具共用这一个伤害计算, 输入为 NumPy 数组, 攻击方 (build) 和受害方 (unit) 的数组按
+广播规则组合, evaluate() 一次算出 构筑 × 单位 的整张伤害表 (每秒可处理数百万对)
+
+与 OnDamageFilter 相同的处理顺序:
+1. 伤害 < 1 时原样返回
+2. 护甲穿透 (破势, 仅物理): 按 (a·0.052)/(1+|a|·0.052) 计算原护甲与 max(0, 护甲 - 破势) 的伤害乘数之比;
+   与 TS 一致, 负护甲时该比值 < 1
+3. 暴击 (物理和魔法): 爆伤为 0 时按 150%; 暴击方式见 final_damage 的 crit 参数
+4. 终伤增% (攻击者神器) 乘 1 + x/100, 终伤减% (受害者神器) 除以 1 + x/100, 只在 > 0 时生效
+5. 格挡 (受害者神器): 伤害 - 格挡, 至少为 1
+6. 吸血按最终伤害的百分比, 攻击回血只对物理伤害生效 (heal_per_hit)
+
+技伤 (spell_damage) 虽然由 CustomStats 计算, 但目前 DamageSystem 没有使用, 这里同样不计入
+
+用法:
+  python scripts/damage_model.py check        # 与按 TS 代码手算的用例对照
+  python scripts/damage_model.py bench        # 测量每秒可计算的 (构筑, 单位) 对数
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+# DamageTypes 枚举值
+PHYSICAL = 1
+MAGICAL = 2
+PURE = 4
+
+ARMOR_FACTOR = 0.052
+DEFAULT_CRIT_DAMAGE = 150
+
+# 攻击方 / 受害方的字段及缺省值 (字段名与 CustomStats 一致)
+ATTACKER_FIELDS = {
+    'armor_pen': 0.0,
+    'crit_chance': 0.0,
+    'crit_damage': 0.0,
+    'final_dmg_increase': 0.0,
+    'lifesteal': 0.0,
+    'life_on_hit': 0.0,
+}
+VICTIM_FIELDS = {
+    'armor': 0.0,
+    'final_dmg_reduct': 0.0,
+    'block': 0.0,
+}
+
+
+def armor_damage_multiplier(armor):
+    """Dota 护甲公式下的伤害乘数: 1 - (a·0.052)/(1+|a|·0.052)"""
+    armor = np.asarray(armor, dtype=np.float64)
+    return 1 - armor * ARMOR_FACTOR / (1 + np.abs(armor) * ARMOR_FACTOR)
+
+
+def armor_pen_multiplier(armor, armor_pen):
+    """CalculateArmorPen: 破势后相对原护甲的伤害倍率"""
+    armor = np.asarray(armor, dtype=np.float64)
+    armor_pen = np.asarray(armor_pen, dtype=np.float64)
+    original = armor_damage_multiplier(armor)
+    reduced = armor_damage_multiplier(np.maximum(0, armor - armor_pen))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = reduced / original
+    return np.where((armor_pen > 0) & (original > 0), ratio, 1.0)
+
+
+def crit_multiplier(crit_chance, crit_damage, crit='expected', shape=None):
+    """
+    暴击倍率; crit:
+      'expected'  期望值 1 + p·(爆伤 - 1) (游戏用伪随机, 长期平均暴击率与面板相同)
+      'never' / 'always'
+      np.random.Generator  按面板暴击率独立抽样 (shape 为结果的形状)
+    """
+    chance = np.clip(np.asarray(crit_chance, dtype=np.float64), 0, 100) / 100
+    damage = np.asarray(crit_damage, dtype=np.float64)
+    damage = np.where(damage == 0, DEFAULT_CRIT_DAMAGE, damage) / 100
+    if isinstance(crit, np.random.Generator):
+        hit = crit.random(shape if shape is not None else np.broadcast(chance, damage).shape) < chance
+        return np.where(hit, damage, 1.0)
+    if crit == 'expected':
+        return 1 + chance * (damage - 1)
+    if crit == 'always':
+        return np.where(chance > 0, damage, 1.0)
+    if crit == 'never':
+        return np.ones_like(chance * damage)
+    raise ValueError(f'未知的暴击方式: {crit!r}')
+
+
+def final_damage(damage, damage_type, armor_pen=0.0, crit_chance=0.0, crit_damage=0.0,
+                 final_dmg_increase=0.0, armor=0.0, final_dmg_reduct=0.0, block=0.0, crit='expected'):
+    """OnDamageFilter 修改后的伤害; 所有参数都可以是可广播的数组"""
+    damage = np.asarray(damage, dtype=np.float64)
+    damage_type = np.asarray(damage_type)
+    shape = np.broadcast_shapes(*(np.shape(x) for x in (
+        damage, damage_type, armor_pen, crit_chance, crit_damage, final_dmg_increase, armor, final_dmg_reduct, block)))
+
+    multiplier = np.where(damage_type == PHYSICAL, armor_pen_multiplier(armor, armor_pen), 1.0)
+    multiplier = multiplier * np.where(damage_type != PURE, crit_multiplier(crit_chance, crit_damage, crit, shape), 1.0)
+    result = damage * multiplier
+
+    increase = np.asarray(final_dmg_increase, dtype=np.float64)
+    result = result * np.where(increase > 0, 1 + increase / 100, 1.0)
+    reduct = np.asarray(final_dmg_reduct, dtype=np.float64)
+    result = result / np.where(reduct > 0, 1 + reduct / 100, 1.0)
+    block = np.asarray(block, dtype=np.float64)
+    result = np.where(block > 0, np.maximum(1, result - block), result)
+
+    return np.broadcast_to(np.where(damage < 1, damage, result), shape)
+
+
+def heal_per_hit(final, damage_type, lifesteal=0.0, life_on_hit=0.0):
+    """每次伤害的吸血 + 攻击回血"""
+    final = np.asarray(final, dtype=np.float64)
+    lifesteal = np.asarray(lifesteal, dtype=np.float64)
+    life_on_hit = np.asarray(life_on_hit, dtype=np.float64)
+    heal = np.where((lifesteal > 0) & (final > 0), final * lifesteal / 100, 0.0)
+    return heal + np.where((np.asarray(damage_type) == PHYSICAL) & (life_on_hit > 0), life_on_hit, 0.0)
+
+
+def _columns(table, fields, axis):
+    """{字段: 数组} -> 按 axis 展开成可广播的列, 缺少的字段取缺省值"""
+    unknown = set(table) - set(fields) - {'damage', 'damage_type'}
+    if unknown:
+        raise ValueError(f'未知的字段: {", ".join(sorted(unknown))}')
+    columns = {}
+    for name, default in fields.items():
+        value = np.asarray(table.get(name, default), dtype=np.float64)
+        columns[name] = value[:, None] if axis == 0 and value.ndim == 1 else value
+    return columns
+
+
+def evaluate(builds, units, damage, damage_type=PHYSICAL, crit='expected'):
+    """
+    构筑 × 单位 的伤害表
+    builds: {ATTACKER_FIELDS 中的字段: 长度 B 的数组}
+    units:  {VICTIM_FIELDS 中的字段: 长度 U 的数组}
+    damage: 标量或长度 B 的数组 (每个构筑的单次伤害)
+    返回 (final, heal), 形状均为 (B, U)
+    """
+    attacker = _columns(builds, ATTACKER_FIELDS, 0)
+    victim = _columns(units, VICTIM_FIELDS, 1)
+    damage = np.asarray(damage, dtype=np.float64)
+    if damage.ndim == 1:
+        damage = damage[:, None]
+    final = final_damage(
+        damage, damage_type, attacker['armor_pen'], attacker['crit_chance'], attacker['crit_damage'],
+        attacker['final_dmg_increase'], victim['armor'], victim['final_dmg_reduct'], victim['block'], crit)
+    return final, heal_per_hit(final, damage_type, attacker['lifesteal'], attacker['life_on_hit'])
+
+
+# 按 DamageSystem.ts 手算的用例: (说明, final_damage 参数, 期望伤害)
+PARITY_CASES = [
+    ('物理 破势 5 对护甲 10: 1.52 / 1.26',
+     dict(damage=100, damage_type=PHYSICAL, armor=10, armor_pen=5, crit='never'), 100 * 1.52 / 1.26),
+    ('物理 破势 + 必定暴击 200%',
+     dict(damage=100, damage_type=PHYSICAL, armor=10, armor_pen=5, crit_chance=100, crit_damage=200, crit='always'),
+     200 * 1.52 / 1.26),
+    ('破势超过护甲: 有效护甲为 0',
+     dict(damage=100, damage_type=PHYSICAL, armor=4, armor_pen=10, crit='never'), 120.8),
+    ('负护甲时破势反而降低伤害 (与 TS 相同)',
+     dict(damage=100, damage_type=PHYSICAL, armor=-5, armor_pen=3, crit='never'), 100 * 1.26 / 1.52),
+    ('魔法: 忽略破势, 爆伤 0 按 150%, 终伤增 20%, 终伤减 50%, 格挡 30',
+     dict(damage=200, damage_type=MAGICAL, armor=10, armor_pen=5, crit_chance=100, crit_damage=0,
+          final_dmg_increase=20, final_dmg_reduct=50, block=30, crit='always'), 210),
+    ('纯粹: 不暴击, 格挡后至少为 1',
+     dict(damage=200, damage_type=PURE, crit_chance=100, crit_damage=300, final_dmg_increase=10, block=500,
+          crit='always'), 1),
+    ('伤害 < 1 原样返回',
+     dict(damage=0.5, damage_type=PHYSICAL, armor=10, armor_pen=5, crit_chance=100, crit_damage=300, block=10,
+          crit='always'), 0.5),
+    ('期望暴击: 25% × 200%',
+     dict(damage=100, damage_type=PHYSICAL, crit_chance=25, crit_damage=200), 125),
+    ('负的终伤增 / 终伤减 / 格挡不生效',
+     dict(damage=100, damage_type=MAGICAL, final_dmg_increase=-50, final_dmg_reduct=-50, block=-10,
+          crit='never'), 100),
+]
+
+# (说明, heal_per_hit 参数, 期望回血)
+HEAL_CASES = [
+    ('吸血 10% + 攻击回血 5 (物理)', dict(final=120.8, damage_type=PHYSICAL, lifesteal=10, life_on_hit=5), 17.08),
+    ('魔法伤害不触发攻击回血', dict(final=100, damage_type=MAGICAL, lifesteal=10, life_on_hit=5), 10),
+]
+
+
+def self_check():
+    """逐个用例对照, 并确认批量计算与逐个计算结果相同; 返回失败数"""
+    failures = 0
+
+    def expect(label, actual, expected):
+        nonlocal failures
+        ok = np.allclose(actual, expected, rtol=1e-12, atol=1e-9)
+        failures += not ok
+        print(f'  {"OK  " if ok else "FAIL"} {label}' + ('' if ok else f': {float(actual)!r} != {expected!r}'))
+
+    for label, kwargs, expected in PARITY_CASES:
+        expect(label, final_damage(**kwargs), expected)
+    for label, kwargs, expected in HEAL_CASES:
+        expect(label, heal_per_hit(**kwargs), expected)
+
+    # 批量: 把所有用例作为一张表计算, 与逐个计算比较
+    rng = np.random.default_rng(1)
+    builds = {name: rng.uniform(0, 100, 50) for name in ATTACKER_FIELDS}
+    units = {'armor': rng.uniform(-10, 60, 40), 'final_dmg_reduct': rng.uniform(0, 50, 40),
+             'block': rng.uniform(0, 20, 40)}
+    damage = rng.uniform(0, 500, 50)
+    table, _ = evaluate(builds, units, damage)
+    single = [[float(final_damage(damage[b], PHYSICAL, builds['armor_pen'][b], builds['crit_chance'][b],
+                                  builds['crit_damage'][b], builds['final_dmg_increase'][b],
+                                  units['armor'][u], units['final_dmg_reduct'][u], units['block'][u]))
+               for u in range(40)] for b in range(50)]
+    expect('批量与逐个计算一致', table, single)
+
+    # 抽样暴击的平均值收敛到期望值
+    sampled = final_damage(np.full(200000, 100.0), MAGICAL, crit_chance=30, crit_damage=250,
+                           crit=np.random.default_rng(2))
+    ok = abs(sampled.mean() - 145) < 1
+    failures += not ok
+    print(f'  {"OK  " if ok else "FAIL"} 抽样暴击的均值 {sampled.mean():.2f} ≈ 145')
+    return failures
+
+
+def bench(builds, units, repeat):
+    rng = np.random.default_rng(0)
+    build_table = {name: rng.uniform(0, 100, builds) for name in ATTACKER_FIELDS}
+    unit_table = {'armor': rng.uniform(-10, 80, units), 'final_dmg_reduct': rng.uniform(0, 50, units),
+                  'block': rng.uniform(0, 50, units)}
+    damage = rng.uniform(100, 10000, builds)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        evaluate(build_table, unit_table, damage)
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f'{builds} 构筑 × {units} 单位: {elapsed * 1000:.1f} ms, {builds * units / elapsed / 1e6:.1f} 百万对/秒')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DamageSystem 伤害计算的 NumPy 参考实现')
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('check', help='与按 TS 代码手算的用例对照')
+    p = sub.add_parser('bench', help='测量计算速度')
+    p.add_argument('--builds', type=int, default=2000)
+    p.add_argument('--units', type=int, default=500)
+    p.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == 'check':
+        failures = self_check()
+        if failures:
+            print(f'{failures} 项失败')
+            sys.exit(1)
+        print('自检通过')
+    else:
+        bench(args.builds, args.units, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+"""
+把 game/scripts/npc/*.txt 导出为分片的压缩 JSON, 供 panorama 按需 import
+
+gulp kv_2_js 会把整张表输出为一个 JSON, 面板只用到一个条目也要打包整张表。
+这里按分类 / 阶级 / 名称前缀把每张表拆成多个分片:
+
+  content/panorama/src/json/shards/<表名>/<分片>.json   条目名 -> 条目 (与 kv_2_js 相同的结构)
+  content/panorama/src/json/shards/<表名>/index.json    条目名 -> 分片名
+  content/panorama/src/json/shards/index.json           表名 -> {分片名: 条目数}
+
+面板只 import 需要的分片, 例如:
+  import bossUnits from '../json/shards/custom_units/npc_boss_wave.json';
+
+增量: .cache/kv_shards.json 记录每个 KV 文件的指纹和每个分片的内容哈希,
+KV 文件未变化时不解析, 分片内容未变化时不写入
+
+用法:
+  python scripts/export_kv_shards.py            # 增量导出
+  python scripts/export_kv_shards.py --full     # 忽略缓存, 全部重写
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+
+from kv_utils import NPC_DIR, KVError, load_kv, kv_root
+from export_utils import BASE_DIR, PANORAMA_JSON_DIR, to_json, write_if_changed
+
+DEFAULT_OUT_DIR = os.path.join(PANORAMA_JSON_DIR, 'shards')
+STATE_PATH = os.path.join(BASE_DIR, '.cache', 'kv_shards.json')
+INDEX_NAME = 'index.json'
+
+# 分片规则 (表名 -> 规则), 未配置的表使用 ('letter',)
+#   ('field', 字段名)     按字段值分片, 如物品品质 / 技能元素
+#   ('prefix', n)         按条目名前 n 段 ("_" 分隔) 分片, 如 npc_boss_wave_5 -> npc_boss_wave
+#   ('letter',)           去掉所有条目名的公共前缀后, 按首字母分片
+SHARD_RULES = {
+    'custom_units': ('prefix', 3),
+    'npc_abilities_custom': ('field', 'AbilityElement'),
+    'npc_items_artifacts': ('field', 'ArtifactTier'),
+    'npc_items_custom': ('field', 'ItemQuality'),
+}
+
+# 分类字段缺失 / 首字符不是字母数字的条目归入这个分片
+MISSING_BUCKET = '_'
+
+
+def safe_bucket(text):
+    text = re.sub(r'[^0-9a-z_-]+', '_', str(text).strip().lower()).strip('_')
+    return text or MISSING_BUCKET
+
+
+def common_prefix(names):
+    prefix = os.path.commonprefix(list(names)) if names else ''
+    # 只在 "_" 处截断, 避免把 item_a / item_b 截成 "item_" 之后又少一个字母
+    cut = prefix.rfind('_')
+    return prefix[:cut + 1] if cut >= 0 else ''
+
+
+def bucket_entries(table, entries):
+    """返回 {分片名: {条目名: 条目}}, 分片内保持 KV 中的顺序"""
+    rule = SHARD_RULES.get(table, ('letter',))
+    kind = rule[0]
+    prefix = common_prefix(entries) if kind == 'letter' else ''
+    shards = {}
+    for name, entry in entries.items():
+        if kind == 'field':
+            value = entry.get(rule[1]) if isinstance(entry, dict) else None
+            bucket = MISSING_BUCKET if value in (None, '') else f'{rule[1].lower()}_{value}'
+        elif kind == 'prefix':
+            bucket = '_'.join(name.split('_')[:rule[1]])
+        else:
+            rest = name[len(prefix):]
+            bucket = rest[:1] if rest[:1].isalnum() else MISSING_BUCKET
+        shards.setdefault(safe_bucket(bucket), {})[name] = entry
+    return shards
+
+
+def file_fingerprint(path):
+    st = os.stat(path)
+    return f'{st.st_size}:{st.st_mtime_ns}'
+
+
+def load_state(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(path, state):
+    write_if_changed(path, json.dumps(state, ensure_ascii=False, indent=1, sort_keys=True) + '\n')
+
+
+def export_table(kv_path, out_dir, table_state, full=False):
+    """
+    导出一张表, 返回 (新的 table_state, 写入的分片列表, 删除的分片列表)
+    table_state: {"fingerprint": ..., "shards": {分片名: 哈希}, "counts": {分片名: 条目数}}
+    """
+    table = os.path.splitext(os.path.basename(kv_path))[0]
+    table_dir = os.path.join(out_dir, table)
+    entries = kv_root(load_kv(kv_path))
+    entries = {k: v for k, v in entries.items() if isinstance(v, dict)}
+    shards = bucket_entries(table, entries)
+    if not shards:
+        return {'fingerprint': file_fingerprint(kv_path), 'shards': {}, 'counts': {}}, [], []
+
+    old_hashes = {} if full else table_state.get('shards', {})
+    written, removed = [], []
+    hashes = {}
+    for bucket, content in shards.items():
+        text = to_json(content) + '\n'
+        digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        hashes[bucket] = digest
+        path = os.path.join(table_dir, bucket + '.json')
+        if old_hashes.get(bucket) == digest and os.path.exists(path):
+            continue
+        if write_if_changed(path, text):
+            written.append(bucket)
+
+    for bucket in set(table_state.get('shards', {})) - set(shards):
+        path = os.path.join(table_dir, bucket + '.json')
+        if os.path.exists(path):
+            os.remove(path)
+        removed.append(bucket)
+
+    index = {name: bucket for bucket, content in shards.items() for name in content}
+    write_if_changed(os.path.join(table_dir, INDEX_NAME), to_json(index) + '\n')
+
+    return {
+        'fingerprint': file_fingerprint(kv_path),
+        'shards': hashes,
+        'counts': {bucket: len(content) for bucket, content in shards.items()},
+    }, written, removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='把 KV 导出为分片的 panorama JSON')
+    parser.add_argument('--npc', default=NPC_DIR, help='KV 目录')
+    parser.add_argument('-o', '--out', default=DEFAULT_OUT_DIR, help='输出目录')
+    parser.add_argument('--state', default=STATE_PATH, help='增量缓存文件')
+    parser.add_argument('--full', action='store_true', help='忽略缓存, 全部重写')
+    args = parser.parse_args()
+
+    previous = load_state(args.state)
+    state = {} if args.full else previous
+    new_state, manifest = {}, {}
+    skipped, errors = 0, []
+    for kv_path in sorted(glob.glob(os.path.join(args.npc, '*.txt'))):
+        table = os.path.splitext(os.path.basename(kv_path))[0]
+        old = state.get(table, {})
+        table_dir = os.path.join(args.out, table)
+        if (not args.full and old.get('fingerprint') == file_fingerprint(kv_path)
+                and os.path.exists(os.path.join(table_dir, INDEX_NAME))):
+            new_state[table] = old
+            skipped += 1
+        else:
+            try:
+                new_state[table], written, removed = export_table(kv_path, args.out, old, args.full)
+            except KVError as e:
+                # 解析失败时保留上一次导出的分片, 清单中也保留该表, 避免 panorama 找不到已存在的分片
+                print(f'  ERROR: {table}: {e}')
+                errors.append(table)
+                if table in previous:
+                    new_state[table] = previous[table]
+                    manifest[table] = previous[table]['counts']
+                continue
+            if not new_state[table]['counts']:
+                # 没有条目的表 (herolist / custom_net_tables 等) 不导出
+                del new_state[table]
+                continue
+            if written or removed:
+                parts = [f'{len(written)} 个分片已更新'] + ([f'{len(removed)} 个已删除'] if removed else [])
+                print(f'  {table}: {", ".join(parts)} (共 {len(new_state[table]["shards"])} 个)')
+        if table in new_state:
+            manifest[table] = new_state[table]['counts']
+
+    # 已删除的 KV 文件: 移除对应的分片目录
+    for table in set(previous) - set(new_state):
+        table_dir = os.path.join(args.out, table)
+        for path in glob.glob(os.path.join(table_dir, '*.json')):
+            os.remove(path)
+        if os.path.isdir(table_dir) and not os.listdir(table_dir):
+            os.rmdir(table_dir)
+
+    write_if_changed(os.path.join(args.out, INDEX_NAME), to_json(manifest) + '\n')
+    save_state(args.state, new_state)
+    print(f'导出 {len(manifest)} 张表 -> {args.out} ({skipped} 张未变化)')
+    if errors:
+        print(f'ERROR: {len(errors)} 个 KV 文件解析失败, 保留了上一次的分片: {", ".join(errors)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+生成文件输出的公共函数 (JSON / Lua / TS 常量表)
+
+所有写入都先比较内容, 内容不变时不改动文件,
+避免触发 gulp watch / tstl --watch 的无意义重编译
+"""
+import json
+import os
+import re
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_JSON_DIR = os.path.join(BASE_DIR, 'game', 'scripts', 'src', 'json')
+PANORAMA_JSON_DIR = os.path.join(BASE_DIR, 'content', 'panorama', 'src', 'json')
+
+_LUA_IDENT = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+_LUA_KEYWORDS = {
+    'and', 'break', 'do', 'else', 'elseif', 'end', 'false', 'for', 'function', 'goto', 'if',
+    'in', 'local', 'nil', 'not', 'or', 'repeat', 'return', 'then', 'true', 'until', 'while',
+}
+
+
+def write_if_changed(path, text):
+    """内容有变化才写入, 返回是否写入"""
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(text)
+    return True
+
+
+def to_json(obj):
+    """紧凑 JSON (无空白, 保留中文)"""
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def write_json(path, obj):
+    return write_if_changed(path, to_json(obj) + '\n')
+
+
+def _lua_key(k):
+    if isinstance(k, int):
+        return '[%d]' % k
+    if _LUA_IDENT.match(k) and k not in _LUA_KEYWORDS:
+        return k
+    return '[%s]' % _lua_str(k)
+
+
+def _lua_str(s):
+    return '"%s"' % s.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _lua_scalar(v):
+    if v is None:
+        return 'nil'
+    if isinstance(v, bool):
+        return 'true' if v else 'false'
+    if isinstance(v, int):
+        return str(v)
+    if isinstance(v, float):
+        return repr(int(v)) if v.is_integer() and abs(v) < 1e15 else repr(v)
+    return _lua_str(str(v))
+
+
+def to_lua(obj, indent='    ', level=0):
+    """把 dict / list / 标量转为 Lua 表字面量, list 输出为 1-based 数组"""
+    if isinstance(obj, dict):
+        if not obj:
+            return '{}'
+        pad = indent * (level + 1)
+        items = ['%s%s = %s,' % (pad, _lua_key(k), to_lua(v, indent, level + 1)) for k, v in obj.items()]
+        return '{\n%s\n%s}' % ('\n'.join(items), indent * level)
+    if isinstance(obj, (list, tuple)):
+        if all(not isinstance(v, (dict, list, tuple)) for v in obj):
+            return '{ %s }' % ', '.join(_lua_scalar(v) for v in obj) if obj else '{}'
+        pad = indent * (level + 1)
+        items = ['%s%s,' % (pad, to_lua(v, indent, level + 1)) for v in obj]
+        return '{\n%s\n%s}' % ('\n'.join(items), indent * level)
+    return _lua_scalar(obj)
+
+
+def write_lua_module(path, obj, header):
+    """写出 `return { ... }` 形式的 Lua 模块"""
+    text = '-- %s\n-- DO NOT EDIT MANUALLY\nreturn %s\n' % (header, to_lua(obj))
+    return write_if_changed(path, text)
@@ -0,0 +1,307 @@
+"""
+火焰图性能分析数据 (game/scripts/src/utils/performance/flame_graph_profiler.ts) 的离线分析
+
+数据来源:
+- 控制台日志 (启动参数 -condebug 保存的 console.log): FlameGraphProfiler.exportDump 打印的
+  [FlameGraphDump] 行, 过长的数据分多行打印, 这里按 会话 + 序号 拼接;
+  同一会话的多次导出是累计值, 只取最后一次
+- .json 文件: 单次导出的 {"elapsed": ..., "root": ...}, 或直接是网表 performance_debug.debug_data 的节点
+- 逐行读取, 一个会话结束就合并进总计, 内存只和不同调用栈的数量有关, 与日志长度无关
+
+统计:
+- 调用栈为从根到节点的函数名序列; 总耗时为节点记录的时间, 自身耗时 = 总耗时 - 子节点总耗时
+- 多个会话 / 多个文件合并统计; 比较时按记录时长换算为每秒耗时 (ms/s), 不同长度的录制可以直接比较
+- 校准时间偏移用的 Test.time_offet_test 不计入
+- 系统按函数名 "类名.方法名" 的类名归类
+
+用法:
+  python scripts/flame_graph_dump.py report console.log [more.log ...] [--top 30]
+  python scripts/flame_graph_dump.py export console.log --collapsed out.txt --speedscope out.json
+  python scripts/flame_graph_dump.py diff base.log new.log [--system WaveManager] [--threshold 10] [--strict]
+"""
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+
+DUMP_PREFIX = '[FlameGraphDump]'
+# 不计入统计的节点 (及其子节点)
+IGNORED = {'Test.time_offet_test'}
+
+
+def _children(node):
+    """网表会把数组转为 {"1": ..., "2": ...}, 两种形式都支持"""
+    children = node.get('children') or []
+    if isinstance(children, dict):
+        return [children[k] for k in sorted(children, key=lambda k: int(k) if str(k).isdigit() else 0)]
+    return children
+
+
+def flatten(root):
+    """节点树 -> {调用栈: [总耗时 ms, 调用次数]}, 调用栈不含根节点"""
+    stacks = {}
+    todo = [((), child) for child in _children(root)]
+    while todo:
+        parent, node = todo.pop()
+        name = node.get('name', '?')
+        if name in IGNORED:
+            continue
+        stack = parent + (name,)
+        entry = stacks.setdefault(stack, [0.0, 0])
+        entry[0] += node.get('totalTime') or 0
+        entry[1] += node.get('calls') or 0
+        todo.extend((stack, child) for child in _children(node))
+    return stacks
+
+
+def iter_dumps(path):
+    """逐个产出文件中的 (会话, 导出数据); 控制台日志逐行读取"""
+    if path.endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        yield path, data if 'root' in data else {'root': data}
+        return
+
+    parts = {}  # 会话 -> 已收到的片段
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for lineno, line in enumerate(f, 1):
+            pos = line.find(DUMP_PREFIX)
+            if pos < 0:
+                continue
+            fields = line[pos + len(DUMP_PREFIX) + 1:].rstrip('\r\n').split(' ', 2)
+            try:
+                session, (index, count) = fields[0], map(int, fields[1].split('/'))
+                chunk = fields[2]
+            except (IndexError, ValueError):
+                print(f'  WARNING: {path}:{lineno}: 无法识别的导出行')
+                continue
+            if index == 1:
+                parts[session] = []
+            received = parts.get(session)
+            if received is None or len(received) != index - 1:
+                print(f'  WARNING: {path}:{lineno}: 会话 {session} 的导出不完整, 已跳过')
+                parts.pop(session, None)
+                continue
+            received.append(chunk)
+            if index == count:
+                text = ''.join(parts.pop(session))
+                try:
+                    yield session, json.loads(text)
+                except ValueError as e:
+                    print(f'  WARNING: {path}:{lineno}: 会话 {session} 的数据无法解析: {e}')
+
+
+def new_capture():
+    return {'elapsed': 0.0, 'sessions': 0, 'stacks': defaultdict(lambda: [0.0, 0])}
+
+
+def _merge(capture, dump):
+    root = dump['root']
+    elapsed = dump.get('elapsed')
+    if not elapsed:
+        # 网表数据没有记录时长, 用顶层函数的总耗时代替
+        elapsed = sum(child.get('totalTime') or 0 for child in _children(root))
+    capture['elapsed'] += elapsed
+    capture['sessions'] += 1
+    for stack, (total, calls) in flatten(root).items():
+        entry = capture['stacks'][stack]
+        entry[0] += total
+        entry[1] += calls
+
+
+def load_capture(paths):
+    """读取并合并多个文件; 每个会话只保留最后一次导出"""
+    capture = new_capture()
+    for path in paths:
+        session, latest = None, None
+        for key, dump in iter_dumps(path):
+            if key != session and latest is not None:
+                _merge(capture, latest)
+            session, latest = key, dump
+        if latest is not None:
+            _merge(capture, latest)
+    return capture
+
+
+def self_times(stacks):
+    """{调用栈: 自身耗时}; 计时误差可能使子节点之和略大于父节点, 负值按 0 处理"""
+    child_total = defaultdict(float)
+    for stack, (total, _) in stacks.items():
+        if len(stack) > 1:
+            child_total[stack[:-1]] += total
+    return {stack: max(0.0, total - child_total[stack]) for stack, (total, _) in stacks.items()}
+
+
+def group_stats(stacks, key=lambda name: name):
+    """
+    按 key(函数名) 分组统计 {组: [自身耗时, 总耗时, 调用次数]};
+    递归 / 同组嵌套调用的总耗时只在最外层计入一次
+    """
+    selfs = self_times(stacks)
+    stats = defaultdict(lambda: [0.0, 0.0, 0])
+    for stack, (total, calls) in stacks.items():
+        group = key(stack[-1])
+        entry = stats[group]
+        entry[0] += selfs[stack]
+        entry[2] += calls
+        if group not in {key(name) for name in stack[:-1]}:
+            entry[1] += total
+    return stats
+
+
+def system_of(name):
+    return name.split('.', 1)[0]
+
+
+def collapsed(stacks):
+    """collapsed stack 格式 (flamegraph.pl / speedscope / inferno 通用), 数值为自身耗时 (微秒)"""
+    lines = []
+    for stack, value in sorted(self_times(stacks).items()):
+        us = round(value * 1000)
+        if us > 0:
+            lines.append(f'{";".join(name.replace(";", ":") for name in stack)} {us}')
+    return '\n'.join(lines) + '\n'
+
+
+def speedscope(stacks, name):
+    """speedscope 的 sampled 格式: 每个调用栈一个样本, 权重为自身耗时 (ms)"""
+    frames, index, samples, weights = [], {}, [], []
+    for stack, value in sorted(self_times(stacks).items()):
+        if value <= 0:
+            continue
+        for frame in stack:
+            if frame not in index:
+                index[frame] = len(frames)
+                frames.append({'name': frame})
+        samples.append([index[frame] for frame in stack])
+        weights.append(round(value, 3))
+    return {
+        '$schema': 'https://www.speedscope.app/file-format-schema.json',
+        'exporter': 'scripts/flame_graph_dump.py',
+        'name': name,
+        'activeProfileIndex': 0,
+        'shared': {'frames': frames},
+        'profiles': [{
+            'type': 'sampled', 'name': name, 'unit': 'milliseconds',
+            'startValue': 0, 'endValue': round(sum(weights), 3),
+            'samples': samples, 'weights': weights,
+        }],
+    }
+
+
+def _rate(capture):
+    """ms -> 每秒记录时间内的耗时 (ms/s)"""
+    return 1000 / capture['elapsed'] if capture['elapsed'] else 0
+
+
+def print_report(capture, top):
+    rate = _rate(capture)
+    print(f'{capture["sessions"]} 个会话, 记录 {capture["elapsed"] / 1000:.1f} 秒, {len(capture["stacks"])} 个调用栈')
+    for title, stats in (('系统', group_stats(capture['stacks'], system_of)),
+                         ('函数', group_stats(capture['stacks']))):
+        rows = sorted(stats.items(), key=lambda item: -item[1][0])[:top]
+        width = max([len(title)] + [len(name) for name, _ in rows])
+        print()
+        print(f'{title:<{width}}  {"自身 ms/s":>10} {"总计 ms/s":>10} {"调用次数":>10} {"每次 us":>10}')
+        for name, (self_ms, total, calls) in rows:
+            per_call = total * 1000 / calls if calls else 0
+            print(f'{name:<{width}}  {self_ms * rate:>10.3f} {total * rate:>10.3f} {calls:>10} {per_call:>10.1f}')
+
+
+def diff_rows(base, new, key):
+    """[(组, 旧 ms/s, 新 ms/s, 旧 每次 us, 新 每次 us)], 按自身耗时比较"""
+    old_stats = group_stats(base['stacks'], key)
+    new_stats = group_stats(new['stacks'], key)
+    old_rate, new_rate = _rate(base), _rate(new)
+    rows = []
+    for group in set(old_stats) | set(new_stats):
+        old = old_stats.get(group, (0.0, 0.0, 0))
+        cur = new_stats.get(group, (0.0, 0.0, 0))
+        rows.append((group, old[0] * old_rate, cur[0] * new_rate,
+                     old[1] * 1000 / old[2] if old[2] else 0, cur[1] * 1000 / cur[2] if cur[2] else 0))
+    return sorted(rows, key=lambda row: row[1] - row[2])
+
+
+def print_diff(base, new, systems, threshold, minimum):
+    """打印对比, 返回变慢超过阈值的组"""
+    regressions = []
+    for title, key in (('系统', system_of), ('函数', lambda name: name)):
+        rows = [row for row in diff_rows(base, new, key)
+                if not systems or system_of(row[0]) in systems]
+        if not rows:
+            continue
+        width = max([len(title)] + [len(row[0]) for row in rows])
+        print()
+        print(f'  {title:<{width}}  {"旧 ms/s":>9} {"新 ms/s":>9} {"变化":>9} {"变化%":>8} {"旧 us/次":>9} {"新 us/次":>9}')
+        for name, old, cur, old_call, new_call in rows:
+            delta = cur - old
+            pct = f'{delta / old * 100:+.0f}%' if old else ('新增' if cur else '')
+            slower = delta >= minimum and (not old or delta / old * 100 >= threshold)
+            if slower:
+                regressions.append(name)
+            mark = '!' if slower else ' '
+            print(f'{mark} {name:<{width}}  {old:>9.3f} {cur:>9.3f} {delta:>+9.3f} {pct:>8} {old_call:>9.1f} {new_call:>9.1f}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='火焰图性能分析数据的离线分析')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('report', help='按自身耗时排序的系统 / 函数统计')
+    p.add_argument('files', nargs='+', help='控制台日志或 .json 导出')
+    p.add_argument('--top', type=int, default=30, help='每个表显示的行数')
+    p = sub.add_parser('export', help='输出 collapsed stack / speedscope 文件')
+    p.add_argument('files', nargs='+', help='控制台日志或 .json 导出')
+    p.add_argument('--collapsed', help='collapsed stack 输出路径')
+    p.add_argument('--speedscope', help='speedscope JSON 输出路径')
+    p = sub.add_parser('diff', help='对比两次录制, 标出变慢的系统 / 函数')
+    p.add_argument('base', help='基准录制 (多个文件用逗号分隔)')
+    p.add_argument('new', help='新录制 (多个文件用逗号分隔)')
+    p.add_argument('--system', action='append', default=[], help='只显示这些系统 (可重复)')
+    p.add_argument('--threshold', type=float, default=10, help='变慢超过此百分比时标出 (默认 10)')
+    p.add_argument('--min', type=float, default=0.05, help='变化小于此值 (ms/s) 时忽略 (默认 0.05)')
+    p.add_argument('--strict', action='store_true', help='有变慢的项时返回非 0')
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'diff':
+            base = load_capture(args.base.split(','))
+            new = load_capture(args.new.split(','))
+            captures = [base, new]
+        else:
+            captures = [load_capture(args.files)]
+    except (OSError, ValueError) as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
+    if not all(capture['sessions'] for capture in captures):
+        print(f'ERROR: 没有找到 {DUMP_PREFIX} 数据')
+        sys.exit(1)
+
+    if args.command == 'report':
+        print_report(captures[0], args.top)
+    elif args.command == 'export':
+        if not args.collapsed and not args.speedscope:
+            parser.error('需要 --collapsed 或 --speedscope')
+        stacks = captures[0]['stacks']
+        if args.collapsed:
+            with open(args.collapsed, 'w', encoding='utf-8', newline='\n') as f:
+                f.write(collapsed(stacks))
+            print(f'Generated {args.collapsed}')
+        if args.speedscope:
+            name = ', '.join(os.path.basename(path) for path in args.files)
+            with open(args.speedscope, 'w', encoding='utf-8') as f:
+                json.dump(speedscope(stacks, name), f, ensure_ascii=False, separators=(',', ':'))
+            print(f'Generated {args.speedscope}')
+    else:
+        print(f'基准 {base["elapsed"] / 1000:.1f} 秒 ({base["sessions"]} 个会话), '
+              f'新 {new["elapsed"] / 1000:.1f} 秒 ({new["sessions"]} 个会话)')
+        regressions = print_diff(base, new, set(args.system), args.threshold, args.min)
+        print()
+        print(f'{len(regressions)} 项变慢超过 {args.threshold:g}%' if regressions else '没有明显变慢的项')
+        if regressions and args.strict:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
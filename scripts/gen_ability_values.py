@@ -0,0 +1,110 @@
+"""
+把 npc_abilities_custom.txt 中每个技能的数值展开为按等级的数组, 供游戏逻辑和 panorama 提示直接查表
+
+- AbilityValues 中 "4 5 6 7" / "0.8" 之类的字符串拆分为数字数组, 单值填充到 MaxLevel
+- 同时展开 AbilityCooldown / AbilityManaCost / AbilityCastRange / AbilityCastPoint
+- 校验: 多值字段的等级数必须等于 MaxLevel, 否则报错退出 (--lenient 时用最后一级补齐)
+
+输出 (格式: {技能名: {"MaxLevel": N, "values": {字段: [lv1, lv2, ...]}}}):
+- game/scripts/src/json/ability_values.json
+- content/panorama/src/json/ability_values.json
+- 可选 --lua PATH 输出 `return {...}` 形式的 Lua 表
+
+用法: python scripts/gen_ability_values.py [--lenient] [--lua PATH]
+"""
+import argparse
+import os
+import sys
+
+from kv_utils import load_kv, kv_root, npc_path, to_number
+from export_utils import SRC_JSON_DIR, PANORAMA_JSON_DIR, write_json, write_lua_module
+
+ABILITIES_KV = npc_path('npc_abilities_custom.txt')
+OUTPUT_NAME = 'ability_values.json'
+
+# 同样按等级配置的顶层字段
+LEVELED_FIELDS = ['AbilityCooldown', 'AbilityManaCost', 'AbilityCastRange', 'AbilityCastPoint']
+
+
+def parse_levels(text):
+    """"4 5 6 7" -> [4, 5, 6, 7]; 非数字的部分保留为字符串"""
+    parts = str(text).split()
+    return [to_number(p, p) for p in parts]
+
+
+def expand(levels, max_level):
+    """单值填充到 max_level; 返回 (数组, 是否与 MaxLevel 不符)"""
+    if not levels:
+        return [], False
+    if len(levels) == 1:
+        return levels * max_level, False
+    if len(levels) == max_level:
+        return levels, False
+    if len(levels) > max_level:
+        return levels[:max_level], True
+    return levels + [levels[-1]] * (max_level - len(levels)), True
+
+
+def build_tables(abilities):
+    """返回 (tables, errors)"""
+    tables, errors = {}, []
+    for name, kv in abilities.items():
+        if not isinstance(kv, dict):
+            continue
+        max_level = to_number(kv.get('MaxLevel'), 1) or 1
+        max_level = int(max_level)
+
+        raw = {}
+        for field in LEVELED_FIELDS:
+            if field in kv and str(kv[field]).strip() != '':
+                raw[field] = kv[field]
+        values = kv.get('AbilityValues')
+        if isinstance(values, dict):
+            for key, val in values.items():
+                # 新版 AbilityValues 允许 {"value": "...", "special_bonus_xxx": "+10"} 形式
+                if isinstance(val, dict):
+                    val = val.get('value', '')
+                raw[key] = val
+
+        expanded = {}
+        for key, text in raw.items():
+            levels = parse_levels(text)
+            arr, mismatch = expand(levels, max_level)
+            if mismatch:
+                errors.append(f'{name}.{key}: {len(levels)} 级数值 "{text}", MaxLevel = {max_level}')
+            expanded[key] = arr
+        tables[name] = {'MaxLevel': max_level, 'values': expanded}
+    return tables, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成按等级展开的技能数值表')
+    parser.add_argument('--kv', default=ABILITIES_KV, help='技能 KV 文件')
+    parser.add_argument('--lenient', action='store_true', help='等级数不符时只警告, 用最后一级补齐')
+    parser.add_argument('--lua', help='额外输出 Lua 表到指定路径')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.kv):
+        print(f'ERROR: KV not found: {args.kv}')
+        sys.exit(1)
+
+    tables, errors = build_tables(kv_root(load_kv(args.kv)))
+    if errors:
+        label = 'WARNING' if args.lenient else 'ERROR'
+        for err in errors:
+            print(f'  {label}: {err}')
+        if not args.lenient:
+            print(f'{len(errors)} 个字段的等级数与 MaxLevel 不一致, 未写出文件')
+            sys.exit(1)
+
+    for out_dir in (SRC_JSON_DIR, PANORAMA_JSON_DIR):
+        path = os.path.join(out_dir, OUTPUT_NAME)
+        changed = write_json(path, tables)
+        print(f'{"Generated" if changed else "Unchanged"} {path} ({len(tables)} abilities)')
+    if args.lua:
+        changed = write_lua_module(args.lua, tables, 'generated by scripts/gen_ability_values.py')
+        print(f'{"Generated" if changed else "Unchanged"} {args.lua}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""
+把 npc_items_artifacts / custom_units 编译为预先解析好的 TS 常量表, 运行时直接按下标查表
+
+- ARTIFACT_STATS[槽位][阶级] -> 属性向量 (顺序见 ARTIFACT_STAT_KEYS)
+- ARTIFACT_ITEMS[物品名] -> [槽位, 阶级]
+- ARTIFACT_TIER_XP[阶级] -> 该阶升级所需经验
+- UNIT_DROPS[单位名] -> 掉落向量 (顺序见 UNIT_DROP_FIELDS), 只包含有掉落的单位
+
+TSTL 会把这些常量编译为 Lua 表, modifier 每次刷新不再调用 GetAbilityKeyValuesByName
+
+输出: game/scripts/src/config/ArtifactTables.ts (提交到仓库; gulp 的 kv_tables 任务在每次生成 KV 后重新生成)
+用法:
+  python scripts/gen_artifact_tables.py
+  python scripts/gen_artifact_tables.py --check   # 只检查, 提交的常量表与 KV 不一致时以状态码 1 退出
+"""
+import argparse
+import json
+import os
+import re
+import sys
+
+from kv_utils import load_kv, kv_root, npc_path, to_number
+from export_utils import BASE_DIR, write_if_changed
+
+ARTIFACTS_KV = npc_path('npc_items_artifacts.txt')
+UNITS_KV = npc_path('custom_units.txt')
+OUTPUT_PATH = os.path.join(BASE_DIR, 'game', 'scripts', 'src', 'config', 'ArtifactTables.ts')
+
+# (KV 字段, ArtifactSystem 中 ArtifactBonuses 的 key), 顺序即属性向量的下标
+ARTIFACT_STATS = [
+    ('BonusDamage', 'damage'),
+    ('BonusArmorPen', 'armorPen'),
+    ('BonusHP', 'hp'),
+    ('BonusArmor', 'armor'),
+    ('BonusConstitution', 'constitution'),
+    ('BonusMartial', 'martial'),
+    ('BonusDivinity', 'divinity'),
+    ('BonusAgility', 'agility'),
+    ('BonusManaRegen', 'manaRegen'),
+    ('BonusCritChance', 'critChance'),
+    ('BonusCritDamage', 'critDamage'),
+    ('BonusMoveSpeed', 'moveSpeed'),
+    ('BonusEvasion', 'evasion'),
+    ('BonusAllStats', 'allStats'),
+    ('BonusFinalDmgReduct', 'finalDmgReduct'),
+    ('BonusSpellDamage', 'spellDamage'),
+    ('BonusBlock', 'block'),
+    ('BonusFinalDmgIncrease', 'finalDmgIncrease'),
+]
+
+UNIT_DROP_FIELDS = [
+    'Artifact_Drop_Type', 'Artifact_Drop_XP',
+    'CustomDrop_Coin', 'CustomDrop_Faith', 'HaveLevel', 'CustomDrop_DefenderPoints',
+]
+
+SLOT_COUNT = 6
+
+
+def build_artifact_tables(items):
+    """返回 (stats[slot][tier], names[slot][tier], item_index, tier_xp, errors)"""
+    errors = []
+    entries = {}
+    known = {field for field, _ in ARTIFACT_STATS}
+    for name, kv in items.items():
+        if not isinstance(kv, dict) or 'ArtifactSlot' not in kv:
+            continue
+        slot = to_number(kv.get('ArtifactSlot'))
+        tier = to_number(kv.get('ArtifactTier'))
+        if not isinstance(slot, int) or not isinstance(tier, int) or not 0 <= slot < SLOT_COUNT or tier < 0:
+            errors.append(f'{name}: ArtifactSlot / ArtifactTier 无效 ({kv.get("ArtifactSlot")}, {kv.get("ArtifactTier")})')
+            continue
+        if (slot, tier) in entries:
+            errors.append(f'{name}: 槽位 {slot} 阶级 {tier} 与 {entries[slot, tier][0]} 重复')
+            continue
+        for field in kv:
+            if field.startswith('Bonus') and field not in known:
+                errors.append(f'{name}: 未知属性字段 {field}, 请先加入 ARTIFACT_STATS')
+        vector = [to_number(kv.get(field), 0) for field, _ in ARTIFACT_STATS]
+        entries[slot, tier] = (name, vector, to_number(kv.get('XPRequired'), 0))
+
+    max_tier = max((t for _, t in entries), default=-1)
+    stats = [[None] * (max_tier + 1) for _ in range(SLOT_COUNT)]
+    names = [[None] * (max_tier + 1) for _ in range(SLOT_COUNT)]
+    tier_xp = [None] * (max_tier + 1)
+    xp_source = {}
+    for (slot, tier), (name, vector, xp) in sorted(entries.items()):
+        stats[slot][tier] = vector
+        names[slot][tier] = name
+        # ArtifactSystem.LoadArtifactItemKVs 每阶只取第一个出现的 XPRequired, 因此同阶不一致时报错
+        if tier_xp[tier] is None:
+            tier_xp[tier] = xp
+            xp_source[tier] = name
+        elif xp != tier_xp[tier]:
+            errors.append(f'{name}: XPRequired = {xp}, 与同为 {tier} 阶的 {xp_source[tier]} '
+                          f'({tier_xp[tier]}) 不一致, 每阶所有槽位须相同')
+    for slot in range(SLOT_COUNT):
+        for tier in range(max_tier + 1):
+            if stats[slot][tier] is None:
+                errors.append(f'缺少槽位 {slot} 阶级 {tier} 的神器')
+    item_index = {name: [slot, tier] for (slot, tier), (name, _, _) in sorted(entries.items())}
+    return stats, names, item_index, tier_xp, errors
+
+
+def build_unit_drops(units):
+    drops = {}
+    for name, kv in units.items():
+        if not isinstance(kv, dict):
+            continue
+        vector = [to_number(kv.get(field), 0) for field in UNIT_DROP_FIELDS]
+        if any(vector):
+            drops[name] = vector
+    return drops
+
+
+def _ts(v):
+    """TS 字面量 (与 .prettierrc 一致: 单引号)"""
+    if isinstance(v, str):
+        return "'%s'" % v.replace('\\', '\\\\').replace("'", "\\'")
+    if isinstance(v, (list, tuple)):
+        return '[%s]' % ', '.join(_ts(x) for x in v)
+    return json.dumps(v)
+
+
+def _ts_key(k):
+    return k if re.match(r'^[A-Za-z_$][A-Za-z0-9_$]*$', k) else _ts(k)
+
+
+def _ts_lines(items, pad='    '):
+    return '\n'.join(f'{pad}{item},' for item in items)
+
+
+def _ts_matrix(rows):
+    """二维数组: 每个槽位一组, 组内每阶一行"""
+    return '\n'.join('    [\n%s\n    ],' % _ts_lines((_ts(v) for v in row), ' ' * 8) for row in rows)
+
+
+def render_ts(stats, names, item_index, tier_xp, drops):
+    stat_keys = _ts_lines(_ts(key) for _, key in ARTIFACT_STATS)
+    drop_fields = _ts_lines(_ts(field) for field in UNIT_DROP_FIELDS)
+    items = _ts_lines(f'{_ts_key(k)}: {_ts(v)}' for k, v in item_index.items())
+    units = _ts_lines(f'{_ts_key(k)}: {_ts(v)}' for k, v in drops.items())
+    return f'''// this file is auto-generated by scripts/gen_artifact_tables.py
+// from npc_items_artifacts.txt / custom_units.txt
+// DO NOT EDIT MANUALLY
+
+/** 属性向量各下标对应的 ArtifactBonuses key */
+export const ARTIFACT_STAT_KEYS = [
+{stat_keys}
+] as const;
+
+/** [槽位][阶级] -> 属性向量 */
+export const ARTIFACT_STATS: number[][][] = [
+{_ts_matrix(stats)}
+];
+
+/** [槽位][阶级] -> 物品名 */
+export const ARTIFACT_ITEM_NAMES: string[][] = [
+{_ts_matrix(names)}
+];
+
+/** 物品名 -> [槽位, 阶级] */
+export const ARTIFACT_ITEMS: Record<string, [number, number]> = {{
+{items}
+}};
+
+/** 阶级 -> 升级所需经验 */
+export const ARTIFACT_TIER_XP: number[] = {_ts(tier_xp)};
+
+/** 掉落向量各下标对应的 KV 字段 */
+export const UNIT_DROP_FIELDS = [
+{drop_fields}
+] as const;
+
+/** 单位名 -> 掉落向量 (没有任何掉落的单位不在表中) */
+export const UNIT_DROPS: Record<string, number[]> = {{
+{units}
+}};
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成神器属性 / 单位掉落常量表')
+    parser.add_argument('--artifacts', default=ARTIFACTS_KV, help='神器物品 KV 文件')
+    parser.add_argument('--units', default=UNITS_KV, help='单位 KV 文件')
+    parser.add_argument('-o', '--output', default=OUTPUT_PATH, help='输出的 TS 文件')
+    parser.add_argument('--check', action='store_true', help='只检查输出文件是否与 KV 一致, 不写入')
+    args = parser.parse_args()
+
+    for path in (args.artifacts, args.units):
+        if not os.path.exists(path):
+            print(f'ERROR: KV not found: {path}')
+            sys.exit(1)
+
+    stats, names, item_index, tier_xp, errors = build_artifact_tables(kv_root(load_kv(args.artifacts)))
+    if errors:
+        for err in errors:
+            print(f'  ERROR: {err}')
+        print(f'{len(errors)} 个错误, 未写出文件')
+        sys.exit(1)
+    drops = build_unit_drops(kv_root(load_kv(args.units)))
+
+    text = render_ts(stats, names, item_index, tier_xp, drops)
+    if args.check:
+        current = None
+        if os.path.exists(args.output):
+            with open(args.output, encoding='utf-8') as f:
+                current = f.read()
+        if current != text:
+            print(f'ERROR: {args.output} 与 KV 不一致, 请运行 python -m scripts generate artifact-tables')
+            sys.exit(1)
+        print(f'Unchanged {args.output}')
+        return
+    changed = write_if_changed(args.output, text)
+    print(f'{"Generated" if changed else "Unchanged"} {args.output} '
+          f'({len(item_index)} artifacts, {len(drops)} units with drops)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+"""
+生成与项目表格结构完全一致的合成工作簿, 用于基准测试和压力测试
+
+生成的工作簿:
+- 技能表.xlsx   npc_abilities_custom (AbilityValues 以 "key v1 v2 v3 v4" 打包在 19-28 列)
+- 物品表.xlsx   npc_items_artifacts / npc_items_custom
+- 单位表.xlsx   custom_units (生命按指数曲线增长, 与波次怪数值分布一致)
+
+使用 openpyxl write-only 模式逐行写入, 10 万行也能很快生成
+输出到 .cache/synthetic/, 不会被 gulp sheet_2_kv 扫描到
+
+用法: python scripts/gen_synthetic_workbooks.py [--rows 100000] [--seed 0] [--out DIR] [--only 单位表.xlsx]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+import openpyxl
+
+from sheet_schemas import WORKBOOK_SCHEMAS, header_rows, column_index
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUT_DIR = os.path.join(BASE_DIR, '.cache', 'synthetic')
+
+# ============================================================
+# 取值分布
+# ============================================================
+
+NAME_PREFIX = ['腐化', '狂暴', '骷髅', '黑暗', '熔岩', '剧毒', '虚空', '禁忌', '远古', '深渊',
+               '堕落', '巨型', '混沌', '灭世', '泰坦', '血肉', '寒冰', '雷霆', '幽冥', '遗迹']
+NAME_NOUN = ['猎犬', '僵尸', '射手', '卫士', '傀儡', '飞龙', '行者', '信徒', '雷兽', '骑士',
+             '神官', '憎恶', '元素', '魔龙', '巨人', '领主', '守卫', '精灵', '守灵', '神使']
+SKILL_PREFIX = ['武道', '神念', '通用', '根骨', '身法']
+SKILL_NOUN = ['横扫', '裂空', '金钟罩', '噬魂毒阵', '烈焰风暴', '寒霜新星', '雷霆一击', '残影步',
+              '破军', '天罡', '落雷', '归元']
+DESC_PHRASES = ['被动：每次普通攻击对前方扇形区域造成分裂伤害。',
+                '主动：在目标区域召唤烈焰，每波造成神念×倍率的法术伤害。',
+                '主动：运气震碎体表护盾，对周围造成伤害。',
+                '在目标区域布下毒阵，阵内敌人每秒受到法术伤害。']
+
+MODELS = [
+    'models/heroes/void_spirit/void_spirit.vmdl',
+    'models/heroes/necrolyte/necrolyte.vmdl',
+    'models/heroes/enigma/enigma.vmdl',
+    'models/heroes/faceless_void/faceless_void.vmdl',
+    'models/heroes/life_stealer/life_stealer.vmdl',
+    'models/creeps/neutral_creeps/n_creep_ghost_b/n_creep_ghost_b.vmdl',
+    'models/creeps/neutral_creeps/n_creep_black_drake/n_creep_black_drake.vmdl',
+    'models/creeps/lane_creeps/creep_bad_melee/creep_bad_melee.vmdl',
+]
+PARTICLES = [
+    'particles/custom_flame_storm.vpcf',
+    'particles/units/heroes/hero_sven/sven_spell_great_cleave.vpcf',
+    'particles/units/heroes/hero_alchemist/alchemist_acid_spray.vpcf',
+    'particles/units/heroes/hero_omniknight/omniknight_repel_buff.vpcf',
+    'particles/units/heroes/hero_axe/axe_counterhelix_ad.vpcf',
+]
+SOUNDFILES = [
+    'soundevents/game_sounds_heroes/game_sounds_axe.vsndevts',
+    'soundevents/game_sounds_heroes/game_sounds_lina.vsndevts',
+    'soundevents/custom_game/custom_soundevents.vsndevts',
+]
+
+# 常见的行为标记组合 (与现有技能保持一致)
+BEHAVIOR_COMBOS = [
+    ['DOTA_ABILITY_BEHAVIOR_PASSIVE'],
+    ['DOTA_ABILITY_BEHAVIOR_NO_TARGET'],
+    ['DOTA_ABILITY_BEHAVIOR_POINT', 'DOTA_ABILITY_BEHAVIOR_AOE'],
+    ['DOTA_ABILITY_BEHAVIOR_UNIT_TARGET', 'DOTA_ABILITY_BEHAVIOR_AOE'],
+    ['DOTA_ABILITY_BEHAVIOR_PASSIVE', 'DOTA_ABILITY_BEHAVIOR_HIDDEN'],
+    ['DOTA_ABILITY_BEHAVIOR_IMMEDIATE', 'DOTA_ABILITY_BEHAVIOR_NO_TARGET'],
+]
+ABILITY_CATEGORIES = ['PUBLIC', 'HERO', 'BOSS']
+ABILITY_ELEMENTS = ['MARTIAL', 'DIVINITY', 'GENERAL', 'CONSTITUTION', 'AGILITY']
+DAMAGE_TYPES = ['DAMAGE_TYPE_PHYSICAL', 'DAMAGE_TYPE_MAGICAL', 'DAMAGE_TYPE_PURE']
+# AbilityValues 字段 -> (单值候选, 逐级起始值, 逐级步长)
+VALUE_KEYS = {
+    'dmg_multiplier': ([1, 4, 5], 1, 1),
+    'radius': ([275, 300, 350, 400], 250, 25),
+    'duration': ([3, 4.5, 5], 2, 0.5),
+    'wave_count': ([3, 4, 5], 2, 1),
+    'wave_interval': ([0.5, 0.8, 1], 1, -0.1),
+    'shield_multiplier': ([3, 5], 3, 1),
+    'cleave_percent': ([30, 50], 30, 10),
+    'attacks_to_proc': ([3, 4, 5], 7, -1),
+    'explosion_radius': ([300, 400], 300, 50),
+}
+
+ARTIFACT_SLOTS = ['weapon', 'armor', 'helm', 'accessory', 'boots', 'amulet']
+ARTIFACT_SLOT_CN = ['剑', '甲', '盔', '坠', '靴', '符']
+# 每个槽位的两个主属性 (与 _update_artifact_stats.py 一致)
+ARTIFACT_SLOT_STATS = [
+    ('BonusDamage', 'BonusArmorPen'),
+    ('BonusConstitution', 'BonusArmor'),
+    ('BonusSpellDamage', 'BonusBlock'),
+    ('BonusCritChance', 'BonusCritDamage'),
+    ('BonusAgility', 'BonusEvasion'),
+    ('BonusAllStats', 'BonusFinalDmgIncrease'),
+]
+
+WAVE_COUNT = 19
+HP_START = 200
+HP_END = 200000000
+
+
+def cn_name(rng, prefixes, nouns):
+    return rng.choice(prefixes) + rng.choice(nouns)
+
+
+def level_values(base, levels, step):
+    """生成 "v1 v2 v3 v4" 形式的逐级数值"""
+    vals = [base + step * i for i in range(levels)]
+    return ' '.join(_fmt(v) for v in vals)
+
+
+def _fmt(v):
+    if isinstance(v, float):
+        v = round(v, 2)
+        if v == int(v):
+            return str(int(v))
+    return str(v)
+
+
+def _blank_row(columns):
+    return [None] * len(columns)
+
+
+# ============================================================
+# 各表行生成
+# ============================================================
+
+def ability_rows(rng, columns, count):
+    idx = column_index(columns)
+    value_cols = [c for c, (_, key) in enumerate(columns, start=1) if key.isdigit()]
+    for i in range(count):
+        row = _blank_row(columns)
+        name = 'ability_synth_%d' % i
+        max_level = rng.choice([1, 4, 4, 4, 6])
+        behavior = rng.choice(BEHAVIOR_COMBOS)
+        passive = 'DOTA_ABILITY_BEHAVIOR_PASSIVE' in behavior
+
+        row[0] = name
+        row[idx['BaseClass'] - 1] = 'ability_lua'
+        row[idx['ScriptFile'] - 1] = 'abilities/%s' % name
+        row[idx['AbilityTextureName'] - 1] = name
+        row[idx['AbilityBehavior'] - 1] = ' | '.join(behavior)
+        row[idx['MaxLevel'] - 1] = max_level
+        if not passive:
+            row[idx['AbilityCooldown'] - 1] = rng.choice([4, 6, 8, 10, 12, 15, 20, 30])
+            row[idx['AbilityManaCost'] - 1] = rng.choice([0, 10, 25, 50, 100])
+            row[idx['AbilityCastRange'] - 1] = rng.choice([0, 400, 600, 700, 900])
+            row[idx['AbilityCastPoint'] - 1] = rng.choice([0, 0.1, 0.2, 0.3])
+            row[idx['AbilityUnitDamageType'] - 1] = rng.choice(DAMAGE_TYPES)
+        row[idx['AbilityCategory'] - 1] = rng.choice(ABILITY_CATEGORIES)
+        row[idx['AbilityStar'] - 1] = rng.randint(1, 5)
+        row[idx['AbilityElement'] - 1] = rng.choice(ABILITY_ELEMENTS)
+
+        keys = rng.sample(list(VALUE_KEYS), rng.randint(1, min(len(VALUE_KEYS), len(value_cols))))
+        for col, key in zip(value_cols, keys):
+            single, base, step = VALUE_KEYS[key]
+            if max_level > 1 and rng.random() < 0.4:
+                val = level_values(base, max_level, step)
+            else:
+                val = _fmt(rng.choice(single))
+            row[col - 1] = '%s %s' % (key, val)
+
+        if rng.random() < 0.8:
+            row[idx['particle'] - 1] = rng.choice(PARTICLES)
+        if rng.random() < 0.3:
+            row[idx['soundfile'] - 1] = rng.choice(SOUNDFILES)
+        row[idx['#LocDOTA_Tooltip_ability_{}'] - 1] = '%s · %s' % (
+            rng.choice(SKILL_PREFIX), rng.choice(SKILL_NOUN))
+        row[idx['#LocDOTA_Tooltip_ability_{}_Description'] - 1] = rng.choice(DESC_PHRASES)
+        yield row
+
+
+def artifact_rows(rng, columns, count):
+    idx = column_index(columns)
+    tiers = 6
+    for i in range(count):
+        row = _blank_row(columns)
+        slot = i % len(ARTIFACT_SLOTS)
+        tier = (i // len(ARTIFACT_SLOTS)) % tiers
+        serial = i // (len(ARTIFACT_SLOTS) * tiers)
+        name = 'item_artifact_%s_t%d' % (ARTIFACT_SLOTS[slot], tier)
+        if serial:
+            name += '_%d' % serial
+        row[0] = name
+        row[idx['#LocItemCn_{}'] - 1] = '%s阶·%s%s' % (tier, cn_name(rng, NAME_PREFIX, ['']), ARTIFACT_SLOT_CN[slot])
+        row[idx['BaseClass'] - 1] = 'item_lua'
+        row[idx['ScriptFile'] - 1] = 'items/item_artifact'
+        row[idx['AbilityBehavior'] - 1] = 'DOTA_ABILITY_BEHAVIOR_IMMEDIATE | DOTA_ABILITY_BEHAVIOR_NO_TARGET'
+        row[idx['ItemCost'] - 1] = 0
+        row[idx['ItemPurchasable'] - 1] = 0
+        row[idx['ItemSellable'] - 1] = 0
+        row[idx['ArtifactSlot'] - 1] = slot
+        row[idx['ArtifactTier'] - 1] = tier
+        row[idx['ArtifactName'] - 1] = 'artifact_%s' % ARTIFACT_SLOTS[slot]
+        row[idx['XPRequired'] - 1] = 0 if tier == 0 else 100 * tier
+        main_stat, sub_stat = ARTIFACT_SLOT_STATS[slot]
+        # 主属性每阶约 x5 增长
+        row[idx[main_stat] - 1] = int(round(rng.uniform(2, 15) * 5 ** tier))
+        if tier >= 2:
+            row[idx[sub_stat] - 1] = int(round(rng.uniform(2, 10) * 2.5 ** (tier - 1)))
+        row[idx['AbilityTextureName'] - 1] = 'artifact_%s_t%d' % (ARTIFACT_SLOTS[slot], max(tier, 1))
+        yield row
+
+
+def item_rows(rng, columns, count):
+    idx = column_index(columns)
+    for i in range(count):
+        row = _blank_row(columns)
+        is_book = rng.random() < 0.5
+        name = ('item_book_synth_%d' if is_book else 'item_synth_%d') % i
+        row[0] = name
+        row[idx['#LocItemCn_{}'] - 1] = (rng.choice(SKILL_NOUN) + ' 技能书') if is_book else cn_name(rng, NAME_PREFIX, ['石', '卷轴', '丹药'])
+        row[idx['#LocItemDesc_{}'] - 1] = rng.choice(DESC_PHRASES)
+        row[idx['AbilityTextureName'] - 1] = name
+        row[idx['BaseClass'] - 1] = 'item_lua'
+        row[idx['ScriptFile'] - 1] = 'items/item_learn_skill' if is_book else 'items/item_upgrade_logic'
+        row[idx['AbilityBehavior'] - 1] = 'DOTA_ABILITY_BEHAVIOR_IMMEDIATE | DOTA_ABILITY_BEHAVIOR_NO_TARGET'
+        row[idx['ID'] - 1] = 2000 + i
+        row[idx['ItemCost'] - 1] = rng.choice([0, 500, 1000, 2000, 8000, 20000])
+        row[idx['ItemPurchasable'] - 1] = rng.randint(0, 1)
+        row[idx['ItemSellable'] - 1] = rng.randint(0, 1)
+        row[idx['ItemStackable'] - 1] = 0 if is_book else 1
+        row[idx['ItemPermanent'] - 1] = 0
+        row[idx['ItemQuality'] - 1] = rng.randint(1, 4)
+        row[idx['IconPath'] - 1] = 'file://{images}/custom_game/hud/%s.png' % name
+        row[idx['ItemUsable'] - 1] = 1
+        row[idx['IsSkillBook'] - 1] = 1 if is_book else 0
+        if is_book:
+            row[idx['LearnAbilityName'] - 1] = 'ability_synth_%d' % rng.randint(0, max(count - 1, 0))
+            row[idx['SkillBookCategory'] - 1] = rng.choice(['MARTIAL', 'DIVINITY', 'GENERAL'])
+        else:
+            row[idx['ItemInitialCharges'] - 1] = 1
+        yield row
+
+
+def unit_rows(rng, columns, count):
+    idx = column_index(columns)
+    growth = math.log(HP_END / HP_START) / (WAVE_COUNT - 1)
+    for i in range(count):
+        row = _blank_row(columns)
+        wave = i % WAVE_COUNT
+        # 指数生命曲线 + ±15% 抖动
+        hp = HP_START * math.exp(growth * wave) * rng.uniform(0.85, 1.15)
+        hp = int(round(hp, -int(max(0, math.floor(math.log10(hp)) - 1))))
+        # 攻击约为生命的 0.75 次幂 (波次 1: 200/25, 波次 19: 2e8/8e5)
+        atk = int(round(25 * (hp / HP_START) ** 0.75 * rng.uniform(0.9, 1.1)))
+        is_boss = rng.random() < 0.05
+        if is_boss:
+            hp *= 10
+            atk *= 5
+        name = 'npc_synth_%s_%d' % ('boss' if is_boss else 'wave_%d' % (wave + 1), i)
+
+        row[0] = name
+        row[idx['#LocUnitNameCn_{}'] - 1] = cn_name(rng, NAME_PREFIX, NAME_NOUN)
+        row[idx['BaseClass'] - 1] = 'npc_dota_creature'
+        row[idx['Model'] - 1] = rng.choice(MODELS)
+        row[idx['ModelScale'] - 1] = rng.choice([0.8, 1, 1, 1.2, 1.5]) * (2 if is_boss else 1)
+        for a in range(1, 7):
+            row[idx['Ability%d' % a] - 1] = ''
+        row[idx['HealthBarOffset'] - 1] = 160
+        row[idx['MovementSpeed'] - 1] = 300
+        row[idx['MovementCapabilities'] - 1] = 'DOTA_UNIT_CAP_MOVE_GROUND'
+        row[idx['AttackCapabilities'] - 1] = 'DOTA_UNIT_CAP_MELEE_ATTACK'
+        row[idx['ArmorPhysical'] - 1] = int(round(hp ** 0.33 / 1.5))
+        row[idx['StatusHealth'] - 1] = hp
+        row[idx['StatusHealthRegen'] - 1] = int(hp * 0.0025)
+        row[idx['StatusMana'] - 1] = 0
+        row[idx['BountyGoldMin'] - 1] = 0
+        row[idx['BountyGoldMax'] - 1] = 0
+        row[idx['AttackDamageMin'] - 1] = atk
+        row[idx['AttackDamageMax'] - 1] = atk
+        row[idx['AttackRate'] - 1] = 1.5
+        row[idx['AttackAnimationPoint'] - 1] = 0.3
+        row[idx['AttackRange'] - 1] = rng.choice([128, 150, 400, 600])
+        row[idx['BoundsHullName'] - 1] = 'DOTA_HULL_SIZE_HERO'
+        row[idx['AttackAcquisitionRange'] - 1] = 800
+        row[idx['ChaseDistance'] - 1] = 1000
+        row[idx['CombatClassAttack'] - 1] = 'DOTA_COMBAT_CLASS_ATTACK_BASIC'
+        row[idx['CombatClassDefend'] - 1] = 'DOTA_COMBAT_CLASS_DEFEND_BASIC'
+        row[idx['CustomDrop_Coin'] - 1] = int(round(25 * 1.45 ** wave * (40 if is_boss else 1)))
+        row[idx['CustomDrop_Faith'] - 1] = 50 if is_boss else 5
+        row[idx['StatLabel'] - 1] = min(5, wave // 4)
+        row[idx['HaveLevel'] - 1] = int(round(45 * 1.4 ** wave))
+        row[idx['CustomDrop_DefenderPoints'] - 1] = 200 if is_boss else 10
+        if rng.random() < 0.1:
+            row[idx['Artifact_Drop_Type'] - 1] = rng.randint(1, 6)
+            row[idx['Artifact_Drop_XP'] - 1] = 50
+        yield row
+
+
+ROW_GENERATORS = {
+    'npc_abilities_custom': ability_rows,
+    'npc_items_artifacts': artifact_rows,
+    'npc_items_custom': item_rows,
+    'custom_units': unit_rows,
+}
+
+
+def write_workbook(path, sheets, rows, seed):
+    """以 write-only 模式写出一个工作簿, 返回总行数"""
+    rng = random.Random(seed)
+    wb = openpyxl.Workbook(write_only=True)
+    total = 0
+    for sheet_name, columns in sheets:
+        ws = wb.create_sheet(sheet_name)
+        for header in header_rows(columns):
+            ws.append(header)
+        for row in ROW_GENERATORS[sheet_name](rng, columns, rows):
+            ws.append(row)
+            total += 1
+    wb.save(path)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成与项目表结构一致的合成工作簿')
+    parser.add_argument('--rows', type=int, default=10000, help='每个 sheet 的数据行数')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--out', default=DEFAULT_OUT_DIR, help='输出目录')
+    parser.add_argument('--only', action='append', help='只生成指定工作簿 (可重复)')
+    args = parser.parse_args()
+
+    targets = args.only or list(WORKBOOK_SCHEMAS.keys())
+    for name in targets:
+        if name not in WORKBOOK_SCHEMAS:
+            print(f'ERROR: 未知工作簿 {name}, 可选: {list(WORKBOOK_SCHEMAS.keys())}')
+            sys.exit(1)
+
+    os.makedirs(args.out, exist_ok=True)
+    for name in targets:
+        path = os.path.join(args.out, name)
+        start = time.perf_counter()
+        total = write_workbook(path, WORKBOOK_SCHEMAS[name], args.rows, args.seed)
+        elapsed = time.perf_counter() - start
+        print(f'Generated {path} ({total} rows, {elapsed:.2f}s)')
+
+
+if __name__ == '__main__':
+    main()
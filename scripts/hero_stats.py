@@ -0,0 +1,322 @@
+"""
+英雄属性成长表: 按 modifier_custom_stats_handler 的面板公式, 一次算出每个英雄在 1..N 级、各神器阶级下的完整属性向量
+
+- 英雄数据来自 npc_heroes_custom.txt (英雄表.xlsx 生成), 缺省值与 CustomStats.InitializeHeroStats 一致
+  (注意原代码用 `Number(x) || 默认值`, 因此填 0 的基础值也会回落到默认值)
+- 神器加成为 6 个槽位同一阶级的属性之和 (npc_items_artifacts.txt, 与 ArtifactSystem.CalculateTotalBonuses 相同)
+- 不含商人购买 / 奖励等额外属性 (extra_*), 即裸装成长
+- 计算全部用 NumPy 广播完成, 结果数组形状为 (英雄, 等级, 神器阶级, 属性)
+
+输出 (格式: {"stats": [属性名], "levels": N, "tiers": T, "heroes": {英雄名: [等级][阶级][属性]}}):
+- game/scripts/src/json/hero_stats.json
+- content/panorama/src/json/hero_stats.json
+
+成长检查: 把 1..N 级和 0..最高神器阶级线性对应到第 1..最后一波, 英雄期望 DPS (攻击力 × 攻速 × 期望暴击 × 终伤增)
+和 wave_load 的需求 DPS (该波总有效生命 / 波次间隔) 都以第 1 波归一化, 各自拟合每波的增长倍率 (log 空间的斜率)。
+裸装属性与怪物血量的绝对值差距很大 (不含商店 / 奖励属性), 只比较增长速度: 两者每波增长倍率之比超过 --tolerance
+的英雄标记出来, --strict 时以状态码 1 退出。模板 / 测试英雄 (TEST_HERO_TOKENS) 照常导出, 但不参与检查
+
+用法:
+  python scripts/hero_stats.py                      # 生成表并检查成长曲线
+  python scripts/hero_stats.py --max-level 60 --tolerance 1.3 --strict
+  python scripts/hero_stats.py --show npc_dota_hero_juggernaut --tier 3
+"""
+import argparse
+import os
+import sys
+import time
+
+from kv_utils import KVError, load_kv, kv_root, npc_path, to_number
+from export_utils import SRC_JSON_DIR, PANORAMA_JSON_DIR, write_json
+from gen_artifact_tables import ARTIFACTS_KV, ARTIFACT_STATS, build_artifact_tables
+from wave_load import effective_hp, parse_wave_manager, par_dps, wave_schedule
+
+HEROES_KV = npc_path('npc_heroes_custom.txt')
+OUTPUT_NAME = 'hero_stats.json'
+MAX_LEVEL = 50
+
+# 名称中含这些词段的英雄 (如 npc_hero_template_test) 是模板 / 测试英雄, 不参与平衡相关的计算
+TEST_HERO_TOKENS = {'template', 'test'}
+
+# 与 modifier_custom_stats_handler 的常量一致
+STATUS_HEALTH = 1
+HEALTH_PER_CONSTITUTION = 30
+REGEN_PER_CONSTITUTION = 0.2
+DAMAGE_PER_MAIN_STAT = 1.5
+MOVE_SPEED_PER_AGILITY = 0.4
+# CustomMainStat -> 属性名; 与 TS 的 switch 一样区分大小写, 其他值不计主属性加成
+MAIN_STATS = {'Martial': 'martial', 'Divinity': 'divinity', 'Agility': 'agility'}
+# 英雄未配置 AttackRate 时的 Dota 默认基础攻击间隔
+DEFAULT_ATTACK_RATE = 1.7
+
+STAT_KEYS = [
+    'constitution', 'martial', 'divinity', 'agility', 'damage', 'health', 'health_regen', 'attack_speed',
+    'move_speed', 'armor', 'mana_regen', 'armor_pen', 'crit_chance', 'crit_damage', 'spell_damage',
+    'final_dmg_increase', 'final_dmg_reduct', 'block', 'evasion',
+]
+
+# (HeroStats 前缀, KV 基础字段, KV 成长字段, KV 加成字段, 默认基础值)
+GROWTH_FIELDS = [
+    ('constitution', 'AttributeBaseConstitution', 'AttributeConstitutionGain', 'AttributeConstitutionBonus', 5),
+    ('martial', 'AttributeBaseMartial', 'AttributeMartialGain', 'AttributeMartialBonus', 5),
+    ('divinity', 'AttributeBaseDivinity', 'AttributeDivinityGain', 'AttributeDivinityBonus', 5),
+    ('agility', 'AttributeBaseAgility', 'AttributeAgilityGain', 'AttributeAgilityBonus', 0),
+    ('damage', 'AttributeBaseDamage', 'AttributeDamageGain', 'AttributeDamageBonus', 1),
+]
+
+# (HeroStats 前缀, KV 基础字段, KV 加成字段, 默认基础值, 神器属性): 面板 = floor((基础 + 神器) × (1 + 加成))
+COMBAT_FIELDS = [
+    ('crit_chance', 'AttributeBaseCritChance', 'AttributeCritChanceBonus', 0, 'critChance'),
+    ('crit_damage', 'AttributeBaseCritDamage', 'AttributeCritDamageBonus', 105, 'critDamage'),
+    ('spell_damage', 'AttributeBaseSpellDamage', 'AttributeSpellDamageBonus', 0, 'spellDamage'),
+    ('final_dmg_increase', 'AttributeBaseFinalDmgIncrease', 'AttributeFinalDmgIncreaseBonus', 0, 'finalDmgIncrease'),
+    ('final_dmg_reduct', 'AttributeBaseFinalDmgReduct', 'AttributeFinalDmgReductBonus', 0, 'finalDmgReduct'),
+    ('evasion', 'AttributeBaseEvasion', 'AttributeEvasionBonus', 0, 'evasion'),
+]
+
+
+def _or(value, default):
+    """TS 的 `Number(x) || default`"""
+    number = to_number(value, 0)
+    return number if isinstance(number, (int, float)) and number else default
+
+
+def is_test_hero(name):
+    return bool(TEST_HERO_TOKENS & set(name.lower().split('_')))
+
+
+def hero_params(heroes):
+    """{英雄名: {参数名: 数值}}, 只包含 npc_heroes_custom 中的英雄条目"""
+    params = {}
+    for name, kv in heroes.items():
+        if not isinstance(kv, dict):
+            continue
+        p = {'main_stat': kv.get('CustomMainStat') or 'Martial',
+             'move_speed': _or(kv.get('MovementSpeed'), 300),
+             'armor': to_number(kv.get('ArmorPhysical'), 0),
+             'attack_rate': _or(kv.get('AttackRate'), DEFAULT_ATTACK_RATE),
+             'base_attack_speed': _or(kv.get('BaseAttackSpeed'), 100)}
+        for key, base, gain, bonus, default in GROWTH_FIELDS:
+            p[key + '_base'] = _or(kv.get(base), default)
+            p[key + '_gain'] = _or(kv.get(gain), 0)
+            p[key + '_bonus'] = _or(kv.get(bonus), 0)
+        for key, base, bonus, default, _ in COMBAT_FIELDS:
+            p[key + '_base'] = _or(kv.get(base), default)
+            p[key + '_bonus'] = _or(kv.get(bonus), 0)
+        params[name] = p
+    return params
+
+
+def artifact_totals(stats):
+    """{神器属性: 长度为阶级数的数组}, 每阶为 6 个槽位同阶属性之和"""
+    import numpy as np
+
+    table = np.asarray(stats, dtype=np.float64)  # (槽位, 阶级, 属性)
+    totals = table.sum(axis=0)
+    return {key: totals[:, i] for i, (_, key) in enumerate(ARTIFACT_STATS)}
+
+
+def compute(params, art, max_level=MAX_LEVEL):
+    """返回 (英雄名列表, 数组 (英雄, 等级, 阶级, 属性))"""
+    import numpy as np
+
+    names = list(params)
+    level = np.arange(1, max_level + 1, dtype=np.float64)[None, :, None]  # (1, L, 1)
+
+    def col(key):
+        return np.array([params[n][key] for n in names], dtype=np.float64)[:, None, None]  # (H, 1, 1)
+
+    def tier(key):
+        return art[key][None, None, :]  # (1, 1, T)
+
+    def grown(key, artifact=0.0):
+        raw = col(key + '_base') + (level - 1) * col(key + '_gain') + artifact
+        return np.floor(raw * (1 + col(key + '_bonus')))
+
+    shape = (len(names), max_level, len(art['damage']))
+    out = np.empty(shape + (len(STAT_KEYS),), dtype=np.float64)
+    put = {key: out[..., i] for i, key in enumerate(STAT_KEYS)}
+
+    all_stats = tier('allStats')
+    put['constitution'][:] = grown('constitution', tier('constitution') + all_stats)
+    put['martial'][:] = grown('martial', tier('martial') + all_stats)
+    put['divinity'][:] = grown('divinity', tier('divinity') + all_stats)
+    put['agility'][:] = grown('agility', tier('agility'))
+
+    main = np.zeros(shape)
+    for i, n in enumerate(names):
+        stat = MAIN_STATS.get(params[n]['main_stat'])
+        if stat:
+            main[i] = put[stat][i]
+    put['damage'][:] = grown('damage') + np.floor(main * DAMAGE_PER_MAIN_STAT) + tier('damage')
+
+    put['health'][:] = put['constitution'] * HEALTH_PER_CONSTITUTION + STATUS_HEALTH + tier('hp')
+    put['health_regen'][:] = put['constitution'] * REGEN_PER_CONSTITUTION
+    put['attack_speed'][:] = put['agility']
+    put['move_speed'][:] = col('move_speed') + np.floor(put['agility'] * MOVE_SPEED_PER_AGILITY) + tier('moveSpeed')
+    put['armor'][:] = col('armor') + tier('armor')
+    put['mana_regen'][:] = tier('manaRegen')
+    put['armor_pen'][:] = tier('armorPen')
+    put['block'][:] = tier('block')
+    for key, _, _, _, art_key in COMBAT_FIELDS:
+        put[key][:] = np.floor((col(key + '_base') + tier(art_key)) * (1 + col(key + '_bonus')))
+    return names, out
+
+
+def expected_dps(params, names, table):
+    """(英雄, 等级, 阶级) 的期望普攻 DPS: 攻击力 × 每秒攻击次数 × 期望暴击 × (1 + 终伤增)"""
+    import numpy as np
+
+    k = {key: table[..., i] for i, key in enumerate(STAT_KEYS)}
+    base_as = np.array([params[n]['base_attack_speed'] for n in names])[:, None, None]
+    rate = np.array([params[n]['attack_rate'] for n in names])[:, None, None]
+    attacks = (base_as + k['attack_speed']) / 100 / rate
+    chance = np.clip(k['crit_chance'], 0, 100) / 100
+    crit = 1 + chance * (k['crit_damage'] / 100 - 1)
+    return k['damage'] * attacks * crit * (1 + k['final_dmg_increase'] / 100)
+
+
+def wave_curve():
+    """[(波次, 基准 DPS)], 与 wave_load 相同"""
+    config, waves, final_guards = parse_wave_manager()
+    units = kv_root(load_kv(npc_path('custom_units.txt')))
+    ehp = {name: effective_hp(entry) for name, entry in units.items() if isinstance(entry, dict)}
+    schedule = wave_schedule(config, waves, final_guards)
+    par = par_dps(schedule, ehp, config['SPAWN_DURATION'] + config['BREAK_TIME'])
+    return sorted(par.items())
+
+
+def progression(levels, tiers, waves):
+    """第 1..waves 波对应的 (等级下标, 神器阶级下标): 两者都按波次线性增长"""
+    import numpy as np
+
+    return (np.rint(np.linspace(0, levels - 1, waves)).astype(int),
+            np.rint(np.linspace(0, tiers - 1, waves)).astype(int))
+
+
+def growth_rates(dps, curve):
+    """
+    返回 (英雄每波增长倍率 (H,), 需求 DPS 每波增长倍率)
+    英雄沿 progression 取值; 两条曲线都以第 1 波归一化后, 对 log 值按波次做最小二乘拟合取斜率
+    """
+    import numpy as np
+
+    par = np.array([d for _, d in curve], dtype=np.float64)
+    if len(par) < 2 or par[0] <= 0:
+        return np.ones(dps.shape[0]), 1.0
+    levels, tiers = progression(dps.shape[1], dps.shape[2], len(par))
+    hero = np.maximum(dps[:, levels, tiers], 1e-9)  # (H, W)
+    x = np.arange(len(par), dtype=np.float64)
+    y = np.column_stack([np.log(par / par[0]), np.log(hero / hero[:, :1]).T])  # (W, 1 + H)
+    slopes = np.polyfit(x, y, 1)[0]
+    return np.exp(slopes[1:]), float(np.exp(slopes[0]))
+
+
+def _compact(v):
+    v = round(float(v), 2)
+    return int(v) if v.is_integer() else v
+
+
+def to_export(names, table, max_level):
+    return {'stats': STAT_KEYS, 'levels': max_level, 'tiers': table.shape[2],
+            'heroes': {name: [[[_compact(v) for v in row] for row in per_level] for per_level in table[i]]
+                       for i, name in enumerate(names)}}
+
+
+def print_hero(name, table, tier):
+    print(f'{name} (神器 {tier} 阶)')
+    shown = ['constitution', 'martial', 'divinity', 'agility', 'damage', 'health', 'attack_speed', 'move_speed',
+             'crit_chance', 'crit_damage']
+    print('  ' + f'{"等级":<6}' + ''.join(f'{key[:12]:>13}' for key in shown))
+    for level in range(table.shape[0]):
+        if level == 0 or (level + 1) % 10 == 0:
+            row = table[level, tier]
+            print('  ' + f'{level + 1:<8}' + ''.join(f'{_compact(row[STAT_KEYS.index(k)]):>13}' for k in shown))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='英雄属性成长表 (等级 × 神器阶级) 与成长曲线检查')
+    parser.add_argument('--heroes', default=HEROES_KV, help='英雄 KV 文件')
+    parser.add_argument('--max-level', type=int, default=MAX_LEVEL, help='最高等级')
+    parser.add_argument('--tolerance', type=float, default=1.5,
+                        help='英雄 DPS 与需求 DPS 每波增长倍率之比允许的最大偏差')
+    parser.add_argument('--strict', action='store_true', help='有英雄偏离时以状态码 1 退出')
+    parser.add_argument('--show', action='append', default=[], metavar='英雄名', help='打印该英雄的成长表')
+    parser.add_argument('--tier', type=int, default=0, help='--show 使用的神器阶级')
+    parser.add_argument('--no-write', action='store_true', help='只检查, 不写出 JSON')
+    args = parser.parse_args()
+
+    if args.max_level < 1:
+        print('ERROR: --max-level 须为正数')
+        sys.exit(1)
+    try:
+        import numpy as np
+    except ImportError:
+        print('ERROR: 需要 numpy (pip install numpy)')
+        sys.exit(1)
+
+    try:
+        params = hero_params(kv_root(load_kv(args.heroes)))
+        stats, _, _, _, errors = build_artifact_tables(kv_root(load_kv(ARTIFACTS_KV)))
+        curve = wave_curve()
+    except (OSError, KVError, ValueError) as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
+    if errors:
+        for err in errors:
+            print(f'  ERROR: {err}')
+        sys.exit(1)
+    if not params:
+        print(f'ERROR: {args.heroes} 中没有英雄条目')
+        sys.exit(1)
+    for name, p in params.items():
+        if p['main_stat'] not in MAIN_STATS:
+            print(f'  WARNING: {name}: 未知主属性 {p["main_stat"]}, 攻击力不计主属性加成')
+
+    start = time.perf_counter()
+    names, table = compute(params, artifact_totals(stats), args.max_level)
+    checked = [i for i, name in enumerate(names) if not is_test_hero(name)]
+    growth, need = growth_rates(expected_dps(params, names, table)[checked], curve)
+    elapsed = time.perf_counter() - start
+    print(f'{len(names)} 个英雄 × {args.max_level} 级 × {table.shape[2]} 阶 × {len(STAT_KEYS)} 项属性, '
+          f'计算 {elapsed * 1000:.1f} ms')
+
+    if not args.no_write:
+        export = to_export(names, table, args.max_level)
+        for out_dir in (SRC_JSON_DIR, PANORAMA_JSON_DIR):
+            path = os.path.join(out_dir, OUTPUT_NAME)
+            changed = write_json(path, export)
+            print(f'{"Generated" if changed else "Unchanged"} {path} ({len(names)} heroes)')
+
+    for name in args.show:
+        if name not in names:
+            print(f'  WARNING: 找不到英雄 {name}')
+        elif not 0 <= args.tier < table.shape[2]:
+            print(f'  WARNING: 神器阶级 {args.tier} 超出范围 0..{table.shape[2] - 1}')
+        else:
+            print()
+            print_hero(name, table[names.index(name)], args.tier)
+
+    print()
+    print(f'每波 DPS 增长倍率 ({len(curve)} 波对应 1..{args.max_level} 级、0..{table.shape[2] - 1} 阶; '
+          f'需求 DPS 每波 ×{need:.3g}, 比值超过 {args.tolerance:g} 标 !)')
+    print(f'  {"英雄":<32}{"每波增长":>10}{"需求 / 英雄":>12}')
+    flagged = []
+    for i, rate in zip(checked, growth):
+        ratio = need / rate
+        over = max(ratio, 1 / ratio) > args.tolerance
+        if over:
+            flagged.append(names[i])
+        print(f'  {names[i]:<32}{f"×{rate:.3g}":>10}{ratio:>11.3g}{"!" if over else ""}')
+    skipped = [name for name in names if is_test_hero(name)]
+    if skipped:
+        print(f'  (跳过模板 / 测试英雄: {", ".join(skipped)})')
+    if flagged:
+        print(f'{len(flagged)} 个英雄的 DPS 增长速度与波次血量曲线偏离过大: 比值 > 1 时提高属性成长 (Gain) / 神器加成, '
+              f'< 1 时降低')
+        if args.strict:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+content/panorama/images 的图片索引, 以及按索引增量生成的图片预载样式表 image_precache0.css
+
+索引 (.cache/image_index.json) 记录每张图片的 大小 / mtime / sha1 / 宽高 / 是否有透明通道;
+只有大小或 mtime 变化的文件才会重新读取, 其他资源工具 (如 ui_textures) 直接复用 scan() 的结果,
+不再各自遍历和解码图片
+
+image_precache0.css 与 gulp 的 create_image_precache 输出相同的位置和文件名 (loading-screen 的 layout 引用),
+只在图片集合或尺寸变化时重新生成; 只改了图片内容而尺寸不变时不会改动样式表
+
+ui_textures 生成的缩放版本 (ui_textures.json 的 output, 默认 images/scaled) 由面板按需加载,
+不进入索引和预载样式表 (gulp 的 create_image_precache 同样排除该目录)
+
+用法:
+  python scripts/image_index.py                 # 更新索引, 需要时重新生成 image_precache0.css
+  python scripts/image_index.py --watch         # 每隔 --interval 秒检查一次 (只 stat, 开销很小)
+  python scripts/image_index.py --list          # 打印索引内容
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+from export_utils import BASE_DIR, write_if_changed
+
+PANORAMA_DIR = os.path.join(BASE_DIR, 'content', 'panorama')
+IMAGES_DIR = os.path.join(PANORAMA_DIR, 'images')
+INDEX_PATH = os.path.join(BASE_DIR, '.cache', 'image_index.json')
+UI_TEXTURES_CONFIG = os.path.join(PANORAMA_DIR, 'ui_textures.json')
+# ui_textures.json 未指定 output 时的缩放版本目录 (相对 content/panorama)
+DEFAULT_SCALED_OUTPUT = 'images/scaled'
+PRECACHE_CSS = os.path.join(PANORAMA_DIR, 'image_precache0.css')
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.psd', '.tga')
+INDEX_VERSION = 1
+
+
+def _describe(path):
+    """读取一张图片的 sha1 / 宽高 / 透明通道 (PIL 只读文件头, 不解码像素)"""
+    from PIL import Image
+
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    entry = {'sha1': digest.hexdigest(), 'width': None, 'height': None, 'alpha': None}
+    try:
+        with Image.open(path) as im:
+            entry['width'], entry['height'] = im.size
+            entry['alpha'] = 'A' in im.getbands() or 'transparency' in im.info
+    except OSError:
+        pass  # 无法识别的图片仍然记录 hash, 宽高为 None
+    return entry
+
+
+def load_index(path=INDEX_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('images', {}) if data.get('version') == INDEX_VERSION else {}
+
+
+def save_index(images, path=INDEX_PATH):
+    text = json.dumps({'version': INDEX_VERSION, 'images': images}, indent=1, sort_keys=True)
+    return write_if_changed(path, text + '\n')
+
+
+def scaled_output_dir(config_path=UI_TEXTURES_CONFIG):
+    """ui_textures 缩放版本的输出目录 (images 下的相对路径)"""
+    try:
+        with open(config_path, encoding='utf-8') as f:
+            output = json.load(f).get('output', DEFAULT_SCALED_OUTPUT)
+    except (OSError, ValueError):
+        output = DEFAULT_SCALED_OUTPUT
+    return os.path.relpath(os.path.join(PANORAMA_DIR, output), IMAGES_DIR).replace(os.sep, '/')
+
+
+def scan(images_dir=IMAGES_DIR, index_path=INDEX_PATH, save=True, exclude=None):
+    """
+    返回 (images, changes): images 为 {images 下的相对路径: 索引项},
+    changes 为 {'added': [...], 'changed': [...], 'removed': [...]}
+    exclude: 跳过的目录 (images 下的相对路径), 默认为 ui_textures 的输出目录
+    """
+    exclude = {scaled_output_dir()} if exclude is None else set(exclude)
+    cached = load_index(index_path)
+    images = {}
+    changes = {'added': [], 'changed': [], 'removed': []}
+    for root, dirs, files in os.walk(images_dir):
+        base = os.path.relpath(root, images_dir).replace(os.sep, '/')
+        dirs[:] = sorted(d for d in dirs if (d if base == '.' else f'{base}/{d}') not in exclude)
+        for name in sorted(files):
+            if not name.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, images_dir).replace(os.sep, '/')
+            st = os.stat(path)
+            old = cached.get(rel)
+            if old and old['size'] == st.st_size and old['mtime_ns'] == st.st_mtime_ns:
+                images[rel] = old
+                continue
+            entry = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, **_describe(path)}
+            images[rel] = entry
+            if old is None:
+                changes['added'].append(rel)
+            elif old['sha1'] != entry['sha1']:
+                changes['changed'].append(rel)
+    changes['removed'] = sorted(set(cached) - set(images))
+    if save:
+        save_index(images, index_path)
+    return images, changes
+
+
+def precache_css(images):
+    """每张图片一条规则; 只依赖路径和尺寸, 图片内容变化不影响输出"""
+    lines = ['/* generated by scripts/image_index.py, do not edit */']
+    for i, rel in enumerate(sorted(images)):
+        entry = images[rel]
+        size = f'{entry["width"]}x{entry["height"]}' if entry['width'] else '?'
+        lines.append(f'#ImagePrecache{i} {{ background-image: url("file://{{images}}/{rel}"); }} /* {size} */')
+    return '\n'.join(lines) + '\n'
+
+
+def update(css_path=PRECACHE_CSS, verbose=True):
+    """更新索引, 图片集合或尺寸变化时重写样式表; 返回样式表是否改写"""
+    images, changes = scan()
+    written = write_if_changed(css_path, precache_css(images))
+    if verbose:
+        summary = ', '.join(f'{k} {len(v)}' for k, v in changes.items() if v) or '无变化'
+        print(f'{len(images)} 张图片 ({summary})')
+        print(f'{"Generated" if written else "Unchanged"} {css_path}')
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description='更新图片索引并生成图片预载样式表')
+    parser.add_argument('-o', '--output', default=PRECACHE_CSS, help='样式表路径')
+    parser.add_argument('--watch', action='store_true', help='持续检查图片变化')
+    parser.add_argument('--interval', type=float, default=1.0, help='--watch 的检查间隔 (秒)')
+    parser.add_argument('--list', action='store_true', help='打印索引, 不生成样式表')
+    args = parser.parse_args()
+
+    if args.list:
+        images, _ = scan()
+        for rel, entry in images.items():
+            size = f'{entry["width"]}x{entry["height"]}' if entry['width'] else '?'
+            alpha = 'A' if entry['alpha'] else ' '
+            print(f'{entry["size"]:>10}  {size:>10} {alpha}  {rel}')
+        return
+
+    try:
+        update(args.output)
+        while args.watch:
+            time.sleep(args.interval)
+            if update(args.output, verbose=False):
+                print(f'Generated {args.output}')
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
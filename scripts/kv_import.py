@@ -0,0 +1,390 @@
+"""
+把只有 KV 的数据 (custom_units.txt、afterimage_unit.txt、模板自带的英雄定义 ...) 导回工作簿, 替代手工维护列号的 generate_csv.js
+
+- 列映射由 Row 2 表头决定 (与 sheet_emitter 的解析完全相同): 普通字段、`Xxx[{]` ... `[}]` 嵌套块、
+  块内数字列按 "key value" 打包; `#Loc` 列从 game/resource/kv_generated.csv 中按 token 回填
+- 表头来源: 目标 sheet 已存在时沿用它的 Row 1 / Row 2, 否则用 sheet_schemas 中登记的列定义,
+  都没有时按 KV 中 key 的出现顺序生成
+- KV 中有而表头中没有的顶层字段 / 顶层块追加到最后几列 (--no-add-columns 时只提示);
+  已有块内部缺少的字段无法自动插入, 只提示
+- 用 openpyxl write-only 模式逐行写出, 内存占用与行数无关; 写入已有工作簿时其他 sheet 按值原样复制
+  (write-only 模式不保留样式), 目标 sheet 中同名条目就地更新: 只覆盖 KV 映射到的列 (条目名、字段列、打包列,
+  查到译文的 #Loc 列), Row 2 为空的备注列等保留原值; KV 中的新条目追加在末尾
+- --verify 把写出的 sheet 用 sheet_emitter 重新生成 KV, 与源 KV 逐字段比较
+  (数字按数值比较; "Ability1" "" 之类的空值在表格中就是空单元格, 与空块一起忽略)
+
+用法:
+  python scripts/kv_import.py game/scripts/npc/custom_units.txt              # 输出到 .cache/kv_import/custom_units.xlsx
+  python scripts/kv_import.py game/scripts/npc/afterimage_unit.txt -o excels/单位表.xlsx --sheet custom_units --verify
+  python scripts/kv_import.py game/scripts/npc/npc_heroes_custom.txt --sheet npc_heroes_custom
+"""
+import argparse
+import csv
+import os
+import re
+import sys
+import tempfile
+import time
+import zipfile
+
+from kv_utils import BASE_DIR, KVError, load_kv, kv_root, parse_kv, to_number
+from sheet_emitter import NAME_COLUMN, compile_row_emitter, parse_key_row
+from sheet_schemas import WORKBOOK_SCHEMAS, header_rows
+from sheet_utils import DATA_START_ROW, KEY_ROW, coerce_value
+
+DEFAULT_OUT_DIR = os.path.join(BASE_DIR, '.cache', 'kv_import')
+LOCALIZATION_CSV = os.path.join(BASE_DIR, 'game', 'resource', 'kv_generated.csv')
+
+_LEADING_ZERO = re.compile(r'^-?0\d')
+
+
+def schema_for(sheet):
+    """sheet_schemas 中登记的 (Row 1, Row 2), 没有时返回 None"""
+    for sheets in WORKBOOK_SCHEMAS.values():
+        for name, columns in sheets:
+            if name == sheet:
+                return header_rows(columns)
+    return None
+
+
+def load_localization(path=LOCALIZATION_CSV):
+    """{token 小写: 文本}, 取 SChinese, 为空时取 English"""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return {row['Tokens'].lower(): row.get('SChinese') or row.get('English') or ''
+                for row in csv.DictReader(f) if row.get('Tokens')}
+
+
+def header_layout(key_row):
+    """
+    返回 (leaves, packed, blocks):
+    leaves {字段路径: 列下标}, packed {块路径: [打包列下标]}, blocks 为表头中所有块的路径集合
+    """
+    leaves, packed, blocks = {}, {}, set()
+
+    def walk(nodes, prefix):
+        for node in nodes:
+            if node[0] == 'field':
+                leaves.setdefault(prefix + (node[2],), node[1])
+            elif node[0] == 'packed':
+                packed.setdefault(prefix, []).append(node[1])
+            else:
+                path = prefix + (node[1],)
+                blocks.add(path)
+                walk(node[2], path)
+
+    walk(parse_key_row(key_row), ())
+    return leaves, packed, blocks
+
+
+def _cell(value):
+    """KV 字符串 -> 单元格值: 数字文本存为数字 (前导 0 的除外), 空串为空单元格"""
+    if value == '':
+        return None
+    if _LEADING_ZERO.match(value):
+        return value
+    number = coerce_value(value)
+    return value if number is None else number
+
+
+def fill_row(name, entry, width, layout, loc_columns=(), localization=None):
+    """返回 (行, 无法映射的字段路径列表)"""
+    leaves, packed, blocks = layout
+    row = [None] * width
+    row[NAME_COLUMN] = name
+    unmapped = []
+
+    def fill(node, prefix):
+        slots = iter(packed.get(prefix, ()))
+        for key, value in node.items():
+            path = prefix + (key,)
+            if isinstance(value, dict):
+                if path in blocks:
+                    fill(value, path)
+                elif value:
+                    unmapped.append(path)
+            elif path in leaves:
+                row[leaves[path]] = _cell(value)
+            else:
+                col = next(slots, None)
+                if col is None:
+                    unmapped.append(path)
+                else:
+                    row[col] = f'{key} {value}'
+
+    fill(entry, ())
+    if localization:
+        for col, template in loc_columns:
+            text = localization.get(template.replace('{}', name).lower())
+            if text:
+                row[col] = text
+    return row, unmapped
+
+
+def missing_columns(entries, layout, width):
+    """
+    KV 中有而表头中没有的字段
+    返回 (可追加的顶层字段 / 块的嵌套 dict (叶子为 None), 无法自动添加的块内字段路径集合)
+    """
+    leaves, packed, blocks = layout
+    addable, nested = {}, set()
+
+    def merge(dst, value):
+        for key, sub in value.items():
+            if isinstance(sub, dict):
+                merge(dst.setdefault(key, {}), sub)
+            else:
+                dst.setdefault(key, None)
+
+    for entry in entries.values():
+        for key, value in entry.items():
+            path = (key,)
+            if isinstance(value, dict):
+                if path not in blocks and value:
+                    merge(addable.setdefault(key, {}), value)
+            elif path not in leaves:
+                addable.setdefault(key, None)
+        for path in fill_row('', entry, width, layout)[1]:
+            if len(path) > 1 and path[:1] in blocks:
+                nested.add(path)
+    return addable, nested
+
+
+def block_columns(tree):
+    """把追加的字段树展开为 Row 2 的列: 块用 `Xxx[{]` ... `[}]` 包围"""
+    keys = []
+    for key, sub in tree.items():
+        if sub is None:
+            keys.append(key)
+        else:
+            keys.append(f'{key}[{{]')
+            keys += block_columns(sub)
+            keys.append('[}]')
+    return keys
+
+
+def kv_header(entries):
+    """没有现成表头时, 按 KV 中 key 的出现顺序生成 (Row 1 与 Row 2 相同)"""
+    key_row = ['name'] + block_columns(missing_columns(entries, ({}, {}, set()), 1)[0])
+    return list(key_row), key_row
+
+
+def _pad(row, width):
+    row = list(row)
+    return row + [None] * (width - len(row)) if len(row) < width else row
+
+
+def _read_sheets(path):
+    """读取已有工作簿: 返回 [(sheet 名, 行迭代器)], 以及需要关闭的 workbook"""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True)
+    return wb, [(name, wb[name].iter_rows(values_only=True)) for name in wb.sheetnames]
+
+
+def import_kv(entries, out_path, sheet, add_columns=True, localization=None, existing=None):
+    """
+    写出工作簿, 返回统计 dict (rows, replaced, appended, added_columns, unmapped, nested)
+    existing 为已有工作簿路径 (可以与 out_path 相同), None 时新建
+    """
+    import openpyxl
+
+    source_wb, source_sheets = _read_sheets(existing) if existing else (None, [])
+    target_rows = None
+    for name, rows in source_sheets:
+        if name == sheet:
+            target_rows = rows
+    header = None
+    if target_rows is not None:
+        head = [list(next(target_rows, ()) or ()) for _ in range(KEY_ROW)]
+        header = (head[0], head[KEY_ROW - 1])
+    header = header or schema_for(sheet) or kv_header(entries)
+    title_row, key_row = list(header[0]), list(header[1])
+
+    layout = header_layout(key_row)
+    addable, nested = missing_columns(entries, layout, len(key_row))
+    added = block_columns(addable)
+    if add_columns and added:
+        width = max(len(title_row), len(key_row))
+        title_row = _pad(title_row, width) + [k if not k.endswith('[{]') and k != '[}]' else None for k in added]
+        key_row = _pad(key_row, width) + added
+        layout = header_layout(key_row)
+    width = len(key_row)
+    loc_columns = [(i, str(k)[4:]) for i, k in enumerate(key_row) if k and str(k).startswith('#Loc')]
+    leaves, packed, _ = layout
+    kv_columns = sorted({NAME_COLUMN, *leaves.values(), *(c for cols in packed.values() for c in cols)})
+
+    stats = {'rows': 0, 'replaced': 0, 'appended': 0, 'added_columns': added if add_columns else [],
+             'skipped_columns': [] if add_columns else added, 'unmapped': set(), 'nested': nested}
+
+    def kv_row(name):
+        row, unmapped = fill_row(name, entries[name], width, layout, loc_columns, localization)
+        stats['unmapped'].update(unmapped)
+        stats['rows'] += 1
+        return row
+
+    def merged_row(name, existing_row):
+        """在已有行上覆盖 KV 映射到的列, 其他列 (备注等) 保留原值"""
+        new = kv_row(name)
+        row = _pad(existing_row, width)
+        for col in kv_columns:
+            row[col] = new[col]
+        for col, _ in loc_columns:
+            if new[col] is not None:
+                row[col] = new[col]
+        return row
+
+    out_dir = os.path.dirname(os.path.abspath(out_path))
+    os.makedirs(out_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(suffix='.xlsx', dir=out_dir)
+    os.close(fd)
+    try:
+        wb = openpyxl.Workbook(write_only=True)
+        written = False
+        for name, rows in source_sheets:
+            ws = wb.create_sheet(name)
+            if name != sheet:
+                for row in rows:
+                    ws.append(row)
+                continue
+            written = True
+            ws.append(title_row)
+            ws.append(key_row)
+            pending = dict.fromkeys(entries)
+            for r, row in enumerate(rows, start=KEY_ROW + 1):
+                entry = str(row[NAME_COLUMN]).strip() if row and row[NAME_COLUMN] is not None else ''
+                if r >= DATA_START_ROW and entry in pending:
+                    del pending[entry]
+                    stats['replaced'] += 1
+                    ws.append(merged_row(entry, row))
+                else:
+                    ws.append(_pad(row or (), width))
+            for entry in pending:
+                stats['appended'] += 1
+                ws.append(kv_row(entry))
+        if not written:
+            ws = wb.create_sheet(sheet)
+            ws.append(title_row)
+            ws.append(key_row)
+            for entry in entries:
+                stats['appended'] += 1
+                ws.append(kv_row(entry))
+        wb.save(tmp_path)
+        if source_wb is not None:
+            # read-only 模式会一直占用文件句柄, 替换文件前先关闭
+            source_wb.close()
+        os.replace(tmp_path, out_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return stats
+
+
+def _normalize(node, skip, prefix=()):
+    """比较用: 数字按数值, 去掉空值、空块和无法映射的字段 (表格中 "" 与缺省都是空单元格)"""
+    out = {}
+    for key, value in node.items():
+        path = prefix + (key,)
+        if path in skip or value == '':
+            continue
+        if isinstance(value, dict):
+            value = _normalize(value, skip, path)
+            if value:
+                out[key] = value
+        else:
+            number = to_number(value)
+            out[key] = value if number is None or _LEADING_ZERO.match(str(value)) else float(number)
+    return out
+
+
+def verify(entries, out_path, sheet, skip):
+    """用 sheet_emitter 重新生成 KV 并与源数据比较, 返回差异列表 (条目, 说明)"""
+    from workbook_reader import open_workbook
+
+    with open_workbook(out_path) as wb:
+        rows = wb.iter_rows(sheet)
+        next(rows, None)
+        emit = compile_row_emitter(next(rows, ()))
+        lines = ['"XLSXContent" {']
+        for row in rows:
+            if row and row[NAME_COLUMN] is not None and str(row[NAME_COLUMN]) in entries:
+                lines += emit(row) or []
+        lines.append('}')
+    emitted = kv_root(parse_kv('\n'.join(lines)))
+    diffs = []
+    for name, entry in entries.items():
+        if name not in emitted:
+            diffs.append((name, '没有输出'))
+            continue
+        expected, actual = _normalize(entry, skip), _normalize(emitted[name], skip)
+        if expected != actual:
+            keys = sorted(k for k in set(expected) | set(actual) if expected.get(k) != actual.get(k))
+            diffs.append((name, f'字段不一致: {", ".join(keys[:8])}'))
+    return diffs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='把 KV 文件导入工作簿 (write-only 流式写出)')
+    parser.add_argument('kv', help='KV 文件')
+    parser.add_argument('-o', '--output', help='输出工作簿 (已存在时合并到其中, 默认 .cache/kv_import/<sheet>.xlsx)')
+    parser.add_argument('--sheet', help='sheet 名 (默认为 KV 文件名)')
+    parser.add_argument('--bases', action='store_true', help='合并 #base 引用的文件')
+    parser.add_argument('--loc', default=LOCALIZATION_CSV, help='回填 #Loc 列的本地化 CSV (空字符串表示不回填)')
+    parser.add_argument('--no-add-columns', action='store_true', help='不追加表头中缺少的字段, 只提示')
+    parser.add_argument('--verify', action='store_true', help='写出后重新生成 KV 并与源数据比较')
+    args = parser.parse_args()
+
+    sheet = args.sheet or os.path.splitext(os.path.basename(args.kv))[0]
+    out_path = args.output or os.path.join(DEFAULT_OUT_DIR, f'{sheet}.xlsx')
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError:
+        print('ERROR: 需要 openpyxl (pip install openpyxl)')
+        sys.exit(1)
+
+    start = time.perf_counter()
+    try:
+        entries = {name: entry for name, entry in kv_root(load_kv(args.kv, args.bases)).items()
+                   if isinstance(entry, dict)}
+        localization = load_localization(args.loc)
+    except (OSError, KVError) as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
+    if not entries:
+        print(f'ERROR: {args.kv} 中没有条目')
+        sys.exit(1)
+
+    existing = out_path if os.path.exists(out_path) else None
+    try:
+        stats = import_kv(entries, out_path, sheet, not args.no_add_columns, localization, existing)
+    except (OSError, zipfile.BadZipFile) as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    for key in stats['added_columns']:
+        print(f'  新增列: {key}')
+    for key in stats['skipped_columns']:
+        print(f'  WARNING: 表头中没有 {key}, 未导入 (去掉 --no-add-columns 可自动追加)')
+    for path in sorted(stats['nested']):
+        print(f'  WARNING: 块 {path[0]} 中没有 {"/".join(path[1:])} 列, 请在块内手动插入列后重新导入')
+    other = sorted(stats['unmapped'] - stats['nested'])
+    for path in other:
+        if not args.no_add_columns:
+            print(f'  WARNING: 无法映射 {"/".join(path)}')
+    print(f'Generated {out_path} / {sheet} ({stats["rows"]} 行: 替换 {stats["replaced"]}, 新增 {stats["appended"]}; '
+          f'{elapsed:.2f}s)')
+
+    if args.verify:
+        diffs = verify(entries, out_path, sheet, stats['unmapped'])
+        for name, msg in diffs[:20]:
+            print(f'  ERROR: {name}: {msg}')
+        if diffs:
+            print(f'{len(diffs)} 个条目重新生成后与源 KV 不一致')
+            sys.exit(1)
+        print(f'校验通过: {len(entries)} 个条目重新生成的 KV 与源数据一致')
+
+
+if __name__ == '__main__':
+    main()
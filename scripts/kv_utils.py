@@ -0,0 +1,142 @@
+"""
+Valve KeyValues (KV) 文本读取
+
+- 支持 // 注释、#base 引用、[$WIN32] 之类的条件标记 (忽略)
+- 解析结果为按出现顺序排列的嵌套 dict, 叶子值一律为字符串
+- 同名 key 以后出现的为准
+
+用法:
+    data = load_kv('game/scripts/npc/custom_units.txt')
+    units = kv_root(data)          # 去掉 XLSXContent / DOTAUnits 等根节点
+"""
+import os
+import re
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+NPC_DIR = os.path.join(BASE_DIR, 'game', 'scripts', 'npc')
+
+_TOKEN = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*)
+  | "(?P<str>(?:[^"\\]|\\.)*)"
+  | (?P<open>\{)
+  | (?P<close>\})
+  | (?P<cond>\[[^\]\n]*\])
+  | (?P<bare>[^\s{}"]+)
+''', re.VERBOSE)
+
+_ESCAPES = {'n': '\n', 't': '\t', '\\': '\\', '"': '"'}
+
+
+class KVError(ValueError):
+    pass
+
+
+def _unescape(s):
+    if '\\' not in s:
+        return s
+    return re.sub(r'\\(.)', lambda m: _ESCAPES.get(m.group(1), '\\' + m.group(1)), s)
+
+
+def tokenize(text):
+    """生成 (类型, 值, 位置), 类型为 'str' / 'open' / 'close'"""
+    pos, end = 0, len(text)
+    while pos < end:
+        m = _TOKEN.match(text, pos)
+        if not m:
+            raise KVError(f'无法解析的字符 {text[pos]!r} (offset {pos})')
+        kind = m.lastgroup
+        if kind == 'str':
+            yield 'str', _unescape(m.group('str')), pos
+        elif kind == 'bare':
+            yield 'str', m.group('bare'), pos
+        elif kind in ('open', 'close'):
+            yield kind, None, pos
+        pos = m.end()
+
+
+def parse_kv(text, bases=None):
+    """
+    解析 KV 文本, 返回顶层 dict
+    如果传入 bases 列表, #base 引用的文件名会追加进去
+    """
+    root = {}
+    stack = [root]
+    key = None
+    for kind, val, pos in tokenize(text):
+        if kind == 'str':
+            if key is None:
+                key = val
+            elif key in ('#base', '#include'):
+                if bases is not None:
+                    bases.append(val)
+                key = None
+            else:
+                stack[-1][key] = val
+                key = None
+        elif kind == 'open':
+            if key is None:
+                raise KVError(f'块缺少 key (offset {pos})')
+            child = {}
+            stack[-1][key] = child
+            stack.append(child)
+            key = None
+        else:
+            if len(stack) == 1:
+                raise KVError(f'多余的 }} (offset {pos})')
+            stack.pop()
+            key = None
+    if len(stack) != 1:
+        raise KVError('块未闭合')
+    return root
+
+
+def load_kv(path, follow_bases=False):
+    """读取 KV 文件; follow_bases=True 时把 #base 文件的内容合并进来 (本文件优先)"""
+    with open(path, encoding='utf-8-sig') as f:
+        text = f.read()
+    bases = []
+    data = parse_kv(text, bases)
+    if follow_bases and bases:
+        merged = {}
+        for base in bases:
+            base_data = load_kv(os.path.join(os.path.dirname(path), base), True)
+            _merge(merged, base_data)
+        _merge(merged, data)
+        data = merged
+    return data
+
+
+def _merge(dst, src):
+    for k, v in src.items():
+        if isinstance(v, dict) and isinstance(dst.get(k), dict):
+            _merge(dst[k], v)
+        else:
+            dst[k] = v
+
+
+def kv_root(data):
+    """返回唯一根节点 (XLSXContent / DOTAItems / DOTAUnits ...) 下的内容"""
+    if len(data) == 1:
+        only = next(iter(data.values()))
+        if isinstance(only, dict):
+            return only
+    return data
+
+
+def npc_path(name):
+    """game/scripts/npc 下的文件路径"""
+    return os.path.join(NPC_DIR, name)
+
+
+def to_number(val, default=None):
+    """KV 字符串转数字: 整数文本返回 int, 其他数字返回 float"""
+    if isinstance(val, (int, float)):
+        return val
+    try:
+        text = str(val).strip()
+        if re.match(r'^-?\d+$', text):
+            return int(text)
+        return float(text)
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,393 @@
+"""
+发布时的 Lua 加密, 输出格式与 scripts/encrypt_file.lua (aeslua) 相同, 可由 utils/decrypt.lua 的 GameRules.XDecrypt 解密:
+
+  明文  = "-- " + 路径的最后 40 字节 + "\\n" + 文件内容
+  填充  = r1 r2 r1 r2 + 明文长度 (4 字节大端) + 明文 + 补齐到 16 字节的填充字节
+  密钥  = aeslua 的 pwToKey: 密码补零 / 截断到 16 字节后用自身做密钥加密一次
+  密文  = AES-128-CBC (IV 全 0), 大写十六进制
+  输出  = return (GameRules.XDecrypt("<hex>", ...))
+
+aeslua 用 math.random 生成 r1 / r2 和填充字节; 这里改为由 HMAC(密钥, 明文) 确定性地生成,
+解密结果完全相同, 但同一文件同一密钥的输出固定, 因此可以按 (内容, 密钥) 缓存到 .cache/encrypted/,
+重新发布时只有内容变化的文件需要加密。多个文件用进程池并行; 装有 cryptography 时用它做 AES, 否则用纯 Python 实现
+
+用法:
+  python scripts/lua_encrypt.py encrypt game/scripts/vscripts/a.lua publish/scripts/vscripts/a.lua KEY
+  python scripts/lua_encrypt.py decrypt publish/scripts/vscripts/a.lua KEY      # 调试用, 输出明文
+  python scripts/lua_encrypt.py check      # 自检: AES 标准向量、往返解密; 有 lua 时与 encrypt_file.lua 互相解密
+"""
+import argparse
+import hashlib
+import hmac
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from export_utils import BASE_DIR
+
+CACHE_DIR = os.path.join(BASE_DIR, '.cache', 'encrypted')
+ENCRYPT_SCRIPT = 'scripts/encrypt_file.lua'
+HEADER_PATH_BYTES = 40
+BLOCK = 16
+
+
+# ---------------------------------------------------------------- AES-128
+
+def _xtime(a):
+    a <<= 1
+    return (a ^ 0x11B) if a & 0x100 else a
+
+
+def _build_tables():
+    """S 盒及加密用的 T 表 (每轮 SubBytes + ShiftRows + MixColumns 合并为查表)"""
+    sbox = [0] * 256
+    p = q = 1
+    while True:
+        p = p ^ _xtime(p)  # p *= 3
+        q ^= q << 1
+        q ^= q << 2
+        q ^= q << 4
+        q &= 0xFF
+        if q & 0x80:
+            q ^= 0x09  # q /= 3
+        x = q
+        for shift in range(1, 5):
+            x ^= ((q << shift) | (q >> (8 - shift))) & 0xFF
+        sbox[p] = x ^ 0x63
+        if p == 1:
+            break
+    sbox[0] = 0x63
+    inv = [0] * 256
+    for i, s in enumerate(sbox):
+        inv[s] = i
+    t0 = []
+    for s in sbox:
+        s2 = _xtime(s)
+        t0.append((s2 << 24) | (s << 16) | (s << 8) | (s2 ^ s))
+    ror = lambda t, n: ((t >> n) | (t << (32 - n))) & 0xFFFFFFFF  # noqa: E731
+    return sbox, inv, t0, [ror(t, 8) for t in t0], [ror(t, 16) for t in t0], [ror(t, 24) for t in t0]
+
+
+SBOX, INV_SBOX, T0, T1, T2, T3 = _build_tables()
+
+
+def expand_key(key):
+    """16 字节密钥 -> 44 个 32 位轮密钥字"""
+    w = [int.from_bytes(key[i:i + 4], 'big') for i in range(0, 16, 4)]
+    rcon = 1
+    for i in range(4, 44):
+        t = w[i - 1]
+        if i % 4 == 0:
+            t = ((t << 8) | (t >> 24)) & 0xFFFFFFFF
+            t = (SBOX[t >> 24] << 24) | (SBOX[(t >> 16) & 255] << 16) | (SBOX[(t >> 8) & 255] << 8) | SBOX[t & 255]
+            t ^= rcon << 24
+            rcon = _xtime(rcon)
+        w.append(w[i - 4] ^ t)
+    return w
+
+
+def _encrypt_words(w, s0, s1, s2, s3):
+    s0 ^= w[0]
+    s1 ^= w[1]
+    s2 ^= w[2]
+    s3 ^= w[3]
+    for r in range(4, 40, 4):
+        s0, s1, s2, s3 = (
+            T0[s0 >> 24] ^ T1[(s1 >> 16) & 255] ^ T2[(s2 >> 8) & 255] ^ T3[s3 & 255] ^ w[r],
+            T0[s1 >> 24] ^ T1[(s2 >> 16) & 255] ^ T2[(s3 >> 8) & 255] ^ T3[s0 & 255] ^ w[r + 1],
+            T0[s2 >> 24] ^ T1[(s3 >> 16) & 255] ^ T2[(s0 >> 8) & 255] ^ T3[s1 & 255] ^ w[r + 2],
+            T0[s3 >> 24] ^ T1[(s0 >> 16) & 255] ^ T2[(s1 >> 8) & 255] ^ T3[s2 & 255] ^ w[r + 3],
+        )
+    S = SBOX
+    return (
+        ((S[s0 >> 24] << 24) | (S[(s1 >> 16) & 255] << 16) | (S[(s2 >> 8) & 255] << 8) | S[s3 & 255]) ^ w[40],
+        ((S[s1 >> 24] << 24) | (S[(s2 >> 16) & 255] << 16) | (S[(s3 >> 8) & 255] << 8) | S[s0 & 255]) ^ w[41],
+        ((S[s2 >> 24] << 24) | (S[(s3 >> 16) & 255] << 16) | (S[(s0 >> 8) & 255] << 8) | S[s1 & 255]) ^ w[42],
+        ((S[s3 >> 24] << 24) | (S[(s0 >> 16) & 255] << 16) | (S[(s1 >> 8) & 255] << 8) | S[s2 & 255]) ^ w[43],
+    )
+
+
+def _gmul(a, b):
+    out = 0
+    while b:
+        if b & 1:
+            out ^= a
+        a = _xtime(a)
+        b >>= 1
+    return out
+
+
+# InvMixColumns 用到的 GF(2^8) 乘法表
+M9, M11, M13, M14 = ([_gmul(a, n) for a in range(256)] for n in (9, 11, 13, 14))
+
+
+def _decrypt_block(w, block):
+    """逐字节实现的解密 (只用于自检和调试, 不追求速度)"""
+    rk = [b for word in w for b in word.to_bytes(4, 'big')]
+    s = [b ^ k for b, k in zip(block, rk[160:176])]
+    for r in range(9, -1, -1):
+        # InvShiftRows + InvSubBytes + AddRoundKey
+        s = [INV_SBOX[s[(c * 4 - row * 3) % 16]] ^ rk[r * 16 + c * 4 + row] for c in range(4) for row in range(4)]
+        if r:
+            out = []
+            for c in range(0, 16, 4):
+                a0, a1, a2, a3 = s[c:c + 4]
+                out += [M14[a0] ^ M11[a1] ^ M13[a2] ^ M9[a3],
+                        M9[a0] ^ M14[a1] ^ M11[a2] ^ M13[a3],
+                        M13[a0] ^ M9[a1] ^ M14[a2] ^ M11[a3],
+                        M11[a0] ^ M13[a1] ^ M9[a2] ^ M14[a3]]
+            s = out
+    return bytes(s)
+
+
+def cbc_encrypt(key, data):
+    """AES-128-CBC, IV 全 0, data 长度必须是 16 的倍数 (与 aeslua 的 encryptString 相同)"""
+    try:
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    except ImportError:
+        pass
+    else:
+        encryptor = Cipher(algorithms.AES(key), modes.CBC(bytes(BLOCK))).encryptor()
+        return encryptor.update(data) + encryptor.finalize()
+
+    w = expand_key(key)
+    out = bytearray()
+    c0 = c1 = c2 = c3 = 0
+    for i in range(0, len(data), BLOCK):
+        c0, c1, c2, c3 = _encrypt_words(
+            w,
+            int.from_bytes(data[i:i + 4], 'big') ^ c0,
+            int.from_bytes(data[i + 4:i + 8], 'big') ^ c1,
+            int.from_bytes(data[i + 8:i + 12], 'big') ^ c2,
+            int.from_bytes(data[i + 12:i + 16], 'big') ^ c3,
+        )
+        out += c0.to_bytes(4, 'big') + c1.to_bytes(4, 'big') + c2.to_bytes(4, 'big') + c3.to_bytes(4, 'big')
+    return bytes(out)
+
+
+def cbc_decrypt(key, data):
+    w = expand_key(key)
+    out = bytearray()
+    prev = bytes(BLOCK)
+    for i in range(0, len(data), BLOCK):
+        block = data[i:i + BLOCK]
+        out += bytes(a ^ b for a, b in zip(_decrypt_block(w, block), prev))
+        prev = block
+    return bytes(out)
+
+
+# ---------------------------------------------------------------- aeslua 格式
+
+def password_key(password):
+    """aeslua pwToKey (AES128): 补零 / 截断到 16 字节, 再以自身为密钥加密"""
+    pw = password.encode('utf-8')[:BLOCK].ljust(BLOCK, b'\0')
+    return cbc_encrypt(pw, pw)
+
+
+def plaintext(source, header_path):
+    """encrypt_file.lua 加密的内容: 路径注释行 + 原文"""
+    return b'-- ' + header_path.encode('utf-8')[-HEADER_PATH_BYTES:] + b'\n' + source
+
+
+def pad(data, key):
+    """aeslua padByteString, 随机字节改为由 HMAC(key, data) 生成"""
+    noise = hmac.new(key, data, hashlib.sha256).digest()
+    prefix = bytes([noise[0], noise[1], noise[0], noise[1]]) + len(data).to_bytes(4, 'big')
+    padded = prefix + data
+    return padded + noise[2:2 + (-len(padded)) % BLOCK]
+
+
+def unpad(data):
+    """aeslua unpadByteString; 校验失败返回 None"""
+    if len(data) < 8 or data[0] != data[2] or data[1] != data[3]:
+        return None
+    return data[8:8 + int.from_bytes(data[4:8], 'big')]
+
+
+def encrypt_source(source, header_path, password):
+    """返回加密后的 Lua 文件内容 (bytes)"""
+    key = password_key(password)
+    cipher = cbc_encrypt(key, pad(plaintext(source, header_path), key))
+    return b'return (GameRules.XDecrypt("' + cipher.hex().upper().encode('ascii') + b'", ...))'
+
+
+def decrypt_output(code, password):
+    """加密后的文件内容 -> 明文 (含路径注释行); 无法解密时返回 None"""
+    start = code.find(b'XDecrypt("')
+    if start < 0:
+        return None
+    start += len(b'XDecrypt("')
+    cipher = bytes.fromhex(code[start:code.index(b'"', start)].decode('ascii'))
+    return unpad(cbc_decrypt(password_key(password), cipher))
+
+
+# ---------------------------------------------------------------- 批量加密
+
+def cache_key(source, header_path, password):
+    digest = hashlib.sha1()
+    for part in (password.encode('utf-8'), header_path.encode('utf-8')[-HEADER_PATH_BYTES:], source):
+        digest.update(len(part).to_bytes(8, 'big'))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+def encrypt_file(src, dst, password, header_path=None, cache_dir=CACHE_DIR):
+    """加密单个文件, 返回是否命中缓存; header_path 默认为 src (与 encrypt_file.lua 的 arg[1] 相同)"""
+    header_path = src if header_path is None else header_path
+    with open(src, 'rb') as f:
+        source = f.read()
+    cached = os.path.join(cache_dir, cache_key(source, header_path, password)) if cache_dir else None
+    os.makedirs(os.path.dirname(os.path.abspath(dst)), exist_ok=True)
+    if cached and os.path.exists(cached):
+        shutil.copyfile(cached, dst)
+        return True
+    output = encrypt_source(source, header_path, password)
+    with open(dst, 'wb') as f:
+        f.write(output)
+    if cached:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f'{cached}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(output)
+        os.replace(tmp, cached)
+    return False
+
+
+def _encrypt_job(task):
+    """子进程: 返回 (是否命中缓存, 错误信息)"""
+    try:
+        return encrypt_file(*task), None
+    except OSError as e:
+        return False, str(e)
+
+
+def encrypt_files(jobs, password, workers=None, cache_dir=CACHE_DIR):
+    """jobs 为 [(src, dst, header_path)]; 返回 ({src: 错误信息或 None}, 命中缓存的数量)"""
+    tasks = [(src, dst, password, header, cache_dir) for src, dst, header in jobs]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks) or 1))
+    if workers == 1:
+        outcomes = [_encrypt_job(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(_encrypt_job, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    results = {task[0]: error for task, (_, error) in zip(tasks, outcomes)}
+    return results, sum(1 for hit, _ in outcomes if hit)
+
+
+# ---------------------------------------------------------------- 自检
+
+def _find_lua():
+    for name in ('lua', 'luajit', 'lua5.1'):
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+_LUA_DECRYPT = r'''
+package.path = package.path .. ";scripts/?.lua"
+if table.unpack == nil then table.unpack = unpack end
+require "bit"
+require "aeslua"
+local f = io.open(arg[1], "rb")
+local code = f:read("*all")
+f:close()
+local hex = code:match('XDecrypt%("(%x+)"')
+local text = hex:gsub("..", function(cc) return string.char(tonumber(cc, 16)) end)
+io.write(aeslua.decrypt(arg[2], text, aeslua.AES128, aeslua.CBCMODE))
+'''
+
+
+def self_check():
+    """返回失败项列表"""
+    failures = []
+
+    def expect(name, ok):
+        print(f'  {"OK  " if ok else "FAIL"} {name}')
+        if not ok:
+            failures.append(name)
+
+    # FIPS-197 附录 C.1
+    key = bytes(range(16))
+    block = bytes.fromhex('00112233445566778899aabbccddeeff')
+    expected = bytes.fromhex('69c4e0d86a7b0430d8cdb78070b4c55a')
+    w = expand_key(key)
+    words = _encrypt_words(w, *(int.from_bytes(block[i:i + 4], 'big') for i in range(0, 16, 4)))
+    expect('AES-128 标准向量 (纯 Python 加密)', b''.join(x.to_bytes(4, 'big') for x in words) == expected)
+    expect('AES-128 标准向量 (加密)', cbc_encrypt(key, block) == expected)
+    expect('AES-128 标准向量 (解密)', _decrypt_block(w, expected) == block)
+
+    source = '-- 测试\nlocal x = { 1, 2, 3 }\nreturn x\n'.encode('utf-8') * 7
+    header = 'game/scripts/vscripts/modules/some_long_directory_name/test_module.lua'
+    for password in ('Invalid_NotOnDedicatedServer', '这里需要填入正式的发布密钥', 'k'):
+        code = encrypt_source(source, header, password)
+        expect(f'往返解密 (密钥 {password[:12]}...)', decrypt_output(code, password) == plaintext(source, header))
+    expect('输出固定 (可缓存)', encrypt_source(source, header, 'k') == encrypt_source(source, header, 'k'))
+    expect('错误密钥无法解密', decrypt_output(encrypt_source(source, header, 'k'), 'other') != plaintext(source, header))
+
+    lua = _find_lua()
+    if not lua:
+        print('  SKIP 与 encrypt_file.lua 的对照 (PATH 中找不到 lua / luajit)')
+        return failures
+    password = 'Invalid_NotOnDedicatedServer'
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, 'sample.lua')
+        with open(src, 'wb') as f:
+            f.write(source)
+        lua_out = os.path.join(tmp, 'lua_out.lua')
+        py_out = os.path.join(tmp, 'py_out.lua')
+        decrypt_script = os.path.join(tmp, 'decrypt.lua')
+        with open(decrypt_script, 'w', encoding='utf-8') as f:
+            f.write(_LUA_DECRYPT)
+        try:
+            subprocess.run([lua, ENCRYPT_SCRIPT, src, lua_out, password], cwd=BASE_DIR, check=True,
+                           capture_output=True)
+            with open(lua_out, 'rb') as f:
+                expect('Python 解密 encrypt_file.lua 的输出', decrypt_output(f.read(), password) == plaintext(source, src))
+            encrypt_file(src, py_out, password, cache_dir=None)
+            decrypted = subprocess.run([lua, decrypt_script, py_out, password], cwd=BASE_DIR, check=True,
+                                       capture_output=True).stdout
+            expect('aeslua 解密 Python 的输出', decrypted == plaintext(source, src))
+        except (OSError, subprocess.CalledProcessError) as e:
+            detail = e.stderr.decode(errors='replace').strip() if getattr(e, 'stderr', None) else e
+            expect(f'运行 {os.path.basename(lua)} ({detail})', False)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='与 encrypt_file.lua 兼容的 Lua 加密')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('encrypt', help='加密单个文件 (参数与 encrypt_file.lua 相同)')
+    p.add_argument('source')
+    p.add_argument('target')
+    p.add_argument('key')
+    p.add_argument('--no-cache', action='store_true', help='不读写 .cache/encrypted')
+    p = sub.add_parser('decrypt', help='解密已加密的文件, 输出明文')
+    p.add_argument('file')
+    p.add_argument('key')
+    sub.add_parser('check', help='自检')
+    args = parser.parse_args()
+
+    if args.command == 'encrypt':
+        encrypt_file(args.source, args.target, args.key, cache_dir=None if args.no_cache else CACHE_DIR)
+        print(f'encrypt to {args.source} {args.target}')
+    elif args.command == 'decrypt':
+        with open(args.file, 'rb') as f:
+            plain = decrypt_output(f.read(), args.key)
+        if plain is None:
+            print('ERROR: 无法解密 (密钥错误或不是加密后的文件)')
+            sys.exit(1)
+        sys.stdout.buffer.write(plain)
+    else:
+        failures = self_check()
+        if failures:
+            print(f'{len(failures)} 项失败')
+            sys.exit(1)
+        print('自检通过')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+"""
+从生成的 KV 中收集模型 / 粒子 / 声音资源, 去重后按首次用到的阶段分组, 输出分阶段预载清单
+
+资源来源:
+- game/scripts/npc 下的单位 / 英雄 / 技能 / 物品 KV 中所有 .vmdl / .vpcf / .vsndevts 字符串
+  (包括技能的 precache 块), 单位引用的技能资源算在单位上
+- 技能 ScriptFile 对应的 TS 文件中的 PrecacheResource(...) 调用
+- utils/precache.ts 中手写的预载列表 (计入 setup)
+
+阶段 (按顺序, 每个资源只出现在第一个需要它的阶段):
+- setup:    precache.ts 列表、英雄、物品、不属于任何单位的技能 (技能商店随时可买)
+- town:     TS 代码中直接以字符串引用的单位 (商人、练功房、残影假人等)
+- zone_N:   ZoneManager 的各域守卫
+- wave_N:   WaveManager 各波次的小兵 / BOSS / 护卫
+没有被任何阶段用到的单位列为 unused, 不进入清单
+
+输出 game/scripts/src/json/precache_manifest.json:
+  {"stages": [{"name", "units", "models", "particles", "soundevents"}], "totals": {...}}
+并打印各阶段数量和总数; --compare 旧清单 时显示与上次的差值, 用于观察每个版本的加载量增长
+
+用法:
+  python scripts/precache_manifest.py
+  python scripts/precache_manifest.py --compare .cache/precache_manifest.prev.json
+  python scripts/precache_manifest.py --dry-run -v       # 只打印, 并列出被多处引用的资源
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+
+from export_utils import SRC_JSON_DIR, write_json
+from kv_utils import BASE_DIR, KVError, load_kv, npc_path
+from wave_load import WAVE_MANAGER_TS, parse_wave_manager
+
+OUTPUT_NAME = 'precache_manifest.json'
+TS_SRC_DIR = os.path.join(BASE_DIR, 'game', 'scripts', 'src')
+PRECACHE_TS = os.path.join(TS_SRC_DIR, 'utils', 'precache.ts')
+ZONE_MANAGER_TS = os.path.join(TS_SRC_DIR, 'systems', 'ZoneManager.ts')
+
+# 扩展名 -> 清单中的分类
+RESOURCE_KINDS = {'.vmdl': 'models', '.vpcf': 'particles', '.vsndevts': 'soundevents'}
+KIND_ORDER = ('models', 'particles', 'soundevents')
+
+UNIT_FILES = ['npc_units_custom.txt']
+HERO_FILES = ['npc_heroes_custom.txt']
+ABILITY_FILES = ['npc_abilities_custom.txt']
+ITEM_FILES = ['npc_items_custom.txt', 'npc_items_artifacts.txt', 'npc_neutral_items_custom.txt']
+
+_PRECACHE_CALL = re.compile(r"PrecacheResource\(\s*'\w+',\s*'([^']+)'")
+_QUOTED_RESOURCE = re.compile(r"'([^'\s]+\.(?:vmdl|vpcf|vsndevts))'")
+_UNIT_LITERAL = re.compile(r"'(npc_[A-Za-z0-9_]+)'")
+
+
+def resource_kind(value):
+    return RESOURCE_KINDS.get(os.path.splitext(value)[1].lower())
+
+
+def collect_strings(node, out):
+    """递归收集 KV 节点中的资源路径 (按出现顺序)"""
+    if isinstance(node, dict):
+        for v in node.values():
+            collect_strings(v, out)
+    elif isinstance(node, str) and resource_kind(node.strip()):
+        out.append(node.strip().replace('\\', '/'))
+    return out
+
+
+def load_entries(files):
+    """合并多个 KV 文件 (跟随 #base), 缺失的文件跳过"""
+    entries = {}
+    for name in files:
+        path = npc_path(name)
+        if os.path.exists(path):
+            # #base 合并后可能有多个根节点 (DOTAUnits / XLSXContent), 逐个展开
+            for root in load_kv(path, follow_bases=True).values():
+                if isinstance(root, dict):
+                    entries.update({k: v for k, v in root.items() if isinstance(v, dict)})
+    return entries
+
+
+def script_precaches(ability):
+    """技能 ScriptFile 对应 TS 文件中的 PrecacheResource 资源"""
+    script = ability.get('ScriptFile')
+    if not isinstance(script, str) or not script:
+        return []
+    path = os.path.join(TS_SRC_DIR, script + '.ts')
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return _PRECACHE_CALL.findall(f.read())
+
+
+def static_precaches(path=PRECACHE_TS):
+    """precache.ts 中 precacheResource([...]) 手写列表里的资源 (跳过注释掉的行)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        lines = [line for line in f if not line.lstrip().startswith('//')]
+    return _QUOTED_RESOURCE.findall(''.join(lines))
+
+
+def referenced_units(units, exclude=()):
+    """TS 源码中以字符串字面量出现的单位名 (生成的 json / config 目录除外), 按文件名排序"""
+    found = []
+    for root, dirs, files in os.walk(TS_SRC_DIR):
+        dirs[:] = sorted(d for d in dirs if d not in ('json', 'config'))
+        for name in sorted(files):
+            if not name.endswith('.ts'):
+                continue
+            with open(os.path.join(root, name), encoding='utf-8') as f:
+                for unit in _UNIT_LITERAL.findall(f.read()):
+                    if unit in units and unit not in exclude and unit not in found:
+                        found.append(unit)
+    return found
+
+
+def zone_units(path=ZONE_MANAGER_TS):
+    """[(阶段名, [单位])]: ZONE_COUNT 个域, 守卫名为 UNIT_PREFIX + 编号"""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    count = re.search(r'ZONE_COUNT:\s*(\d+)', text)
+    prefix = re.search(r"UNIT_PREFIX:\s*'([^']+)'", text)
+    if not count or not prefix:
+        return []
+    return [(f'zone_{n}', [f'{prefix.group(1)}{n}']) for n in range(1, int(count.group(1)) + 1)]
+
+
+def wave_units(path=WAVE_MANAGER_TS):
+    """[(阶段名, [单位])]: 每波的小兵、BOSS, 最终 BOSS 波的护卫"""
+    if not os.path.exists(path):
+        return []
+    _, waves, final_guards = parse_wave_manager(path)
+    stages = []
+    for number, kind, unit, boss in sorted(waves):
+        names = [] if kind == 'FinalBoss' else [unit]
+        names += [boss] if boss else []
+        names += final_guards if kind == 'FinalBoss' else []
+        stages.append((f'wave_{number}', list(dict.fromkeys(n for n in names if n))))
+    return stages
+
+
+def build_manifest():
+    """返回 (manifest, 去重前各资源的引用次数, 未用到的单位, KV 中找不到的单位)"""
+    units = load_entries(UNIT_FILES)
+    heroes = load_entries(HERO_FILES)
+    abilities = load_entries(ABILITY_FILES)
+    items = load_entries(ITEM_FILES)
+
+    ability_res = {name: collect_strings(kv, []) + script_precaches(kv) for name, kv in abilities.items()}
+
+    def owner_resources(entry):
+        """单位 / 英雄自身的资源 + 它引用的技能的资源"""
+        out = collect_strings(entry, [])
+        for value in entry.values():
+            if isinstance(value, str) and value in ability_res:
+                out += ability_res[value]
+        return out
+
+    zones = zone_units()
+    waves = wave_units()
+    scheduled = {u for _, names in zones + waves for u in names}
+    town = referenced_units(units, exclude=scheduled)
+    unit_owned = {v for name in scheduled.union(town) if name in units
+                  for v in units[name].values() if isinstance(v, str) and v in ability_res}
+
+    setup = static_precaches()
+    for hero in heroes.values():
+        setup += owner_resources(hero)
+    for item in items.values():
+        setup += collect_strings(item, [])
+    for name, res in ability_res.items():
+        if name not in unit_owned:
+            setup += res
+
+    plan = [('setup', [], setup), ('town', town, None)]
+    plan += [(stage, names, None) for stage, names in zones + waves]
+
+    seen = set()
+    references = []
+    stages = []
+    for stage, names, resources in plan:
+        if resources is None:
+            resources = []
+            for name in names:
+                resources += owner_resources(units.get(name, {}))
+        references += resources
+        grouped = {kind: [] for kind in KIND_ORDER}
+        for res in resources:
+            if res not in seen:
+                seen.add(res)
+                grouped[resource_kind(res)].append(res)
+        stages.append({'name': stage, 'units': [n for n in names if n in units], **grouped})
+
+    listed = {u for s in stages for u in s['units']}
+    unused = sorted(name for name in units if name not in listed)
+    missing = sorted({n for _, names, _ in plan for n in names if n not in units})
+
+    counts = Counter(references)
+    totals = {kind: sum(len(s[kind]) for s in stages) for kind in KIND_ORDER}
+    totals['unique'] = sum(totals[kind] for kind in KIND_ORDER)
+    totals['references'] = len(references)
+    totals['units'] = len(listed)
+    manifest = {'stages': stages, 'totals': totals}
+    return manifest, counts, unused, missing
+
+
+def print_report(manifest, counts, unused, missing, previous=None, verbose=False):
+    totals = manifest['totals']
+    print(f'{"阶段":<12}{"单位":>6}' + ''.join(f'{kind:>13}' for kind in KIND_ORDER))
+    for stage in manifest['stages']:
+        if not any(stage[kind] for kind in KIND_ORDER) and not stage['units']:
+            continue
+        print(f'{stage["name"]:<14}{len(stage["units"]):>6}'
+              + ''.join(f'{len(stage[kind]):>13}' for kind in KIND_ORDER))
+
+    print(f'\n合计: {totals["unique"]} 个资源 ({", ".join(f"{kind} {totals[kind]}" for kind in KIND_ORDER)}), '
+          f'去重前 {totals["references"]} 处引用, {totals["units"]} 个单位')
+    if previous:
+        old = previous.get('totals', {})
+        deltas = [f'{key} {totals[key] - old.get(key, 0):+d}' for key in (*KIND_ORDER, 'unique', 'units')]
+        print(f'与上次相比: {", ".join(deltas)}')
+    if unused:
+        print(f'未被任何阶段用到的单位 ({len(unused)}): {", ".join(unused)}')
+    for name in missing:
+        print(f'  WARNING: KV 中找不到单位 {name}')
+    if verbose:
+        shared = [(res, n) for res, n in counts.most_common() if n > 1]
+        if shared:
+            print('\n被多处引用的资源:')
+            for res, n in shared:
+                print(f'  {n:>3}  {res}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成去重、分阶段的预载清单')
+    parser.add_argument('-o', '--output', default=os.path.join(SRC_JSON_DIR, OUTPUT_NAME), help='输出路径')
+    parser.add_argument('--compare', metavar='PATH', help='与之前生成的清单比较总数')
+    parser.add_argument('--dry-run', action='store_true', help='只打印, 不写文件')
+    parser.add_argument('-v', '--verbose', action='store_true', help='列出被多处引用的资源')
+    args = parser.parse_args()
+
+    previous = None
+    compare = args.compare or (args.output if os.path.exists(args.output) else None)
+    if compare:
+        try:
+            with open(compare, encoding='utf-8') as f:
+                previous = json.load(f)
+        except (OSError, ValueError) as e:
+            if args.compare:
+                print(f'ERROR: 无法读取 {compare}: {e}')
+                sys.exit(1)
+
+    try:
+        manifest, counts, unused, missing = build_manifest()
+    except (OSError, ValueError, KVError) as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
+
+    print_report(manifest, counts, unused, missing, previous, args.verbose)
+    if not args.dry_run:
+        changed = write_json(args.output, manifest)
+        print(f'{"Generated" if changed else "Unchanged"} {args.output}')
+
+
+if __name__ == '__main__':
+    main()
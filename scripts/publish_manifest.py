@@ -0,0 +1,339 @@
+"""
+发布清单: 记录 game/ 下每个要发布的文件的 sha1 / 大小 / 权限 / 处理方式 (复制或加密),
+与上次发布的清单比较, 得到精确的 新增 / 修改 / 删除 列表, 发布时只处理这些文件
+
+- 排除 / 加密规则直接读取 scripts/addon.config.ts 的 exclude_files / encrypt_files (anymatch 写法, 支持 ! 排除)
+- 上次的清单保存在 .cache/publish_manifest.json; 大小和 mtime 都没变的文件沿用上次的 hash, 不重新读取
+- 加密密钥 (按 --mode 取 addon.config.ts 中对应的密钥) 变化时, 所有加密文件都算作修改;
+  publish/ 中缺失的文件也算作修改 (例如 prepublish 清空过发布目录)
+- addon_game_mode.lua 发布时会写入时间戳, 每次都重新处理
+- --apply 时执行增量发布: 复制 / 用 lua_encrypt 在进程池中加密 (--lua-encrypt 时改为调用
+  lua scripts/encrypt_file.lua), 删除已不存在的文件, 然后写入新的清单 (失败的文件下次重试)
+
+用法:
+  python scripts/publish_manifest.py                       # 只显示变化和按目录的大小统计
+  python scripts/publish_manifest.py --mode release --apply
+  python scripts/publish_manifest.py --json .cache/publish_delta.json --depth 2
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+import subprocess
+import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import lua_encrypt
+from export_utils import BASE_DIR, write_if_changed
+from lua_encrypt import ENCRYPT_SCRIPT
+
+GAME_DIR = os.path.join(BASE_DIR, 'game')
+PUBLISH_DIR = os.path.join(BASE_DIR, 'publish')
+ADDON_CONFIG = os.path.join(BASE_DIR, 'scripts', 'addon.config.ts')
+MANIFEST_PATH = os.path.join(BASE_DIR, '.cache', 'publish_manifest.json')
+
+
+# --mode -> addon.config.ts 中的密钥常量
+MODE_KEYS = {
+    'release': 'encryptDedicatedServerKeyRelease',
+    'release_test': 'encryptDedicatedServerKeyRelease_Test',
+    'test': 'encryptDedicatedServerKeyTest',
+}
+# 发布时会被改写 (写入时间戳) 的文件, 每次都重新处理
+ALWAYS_PUBLISH = re.compile(r'addon_game_mode\.lua$')
+
+
+# ---------------------------------------------------------------- addon.config.ts
+
+def _string_array(text, name):
+    m = re.search(r'const %s: string\[\] = \[(.*?)\];' % re.escape(name), text, re.S)
+    if not m:
+        raise ValueError(f'addon.config.ts 中找不到 {name}')
+    lines = [line for line in m.group(1).splitlines() if not line.lstrip().startswith('//')]
+    return re.findall(r"'([^']*)'", '\n'.join(lines))
+
+
+def load_addon_config(path=ADDON_CONFIG):
+    """返回 {'exclude_files': [...], 'encrypt_files': [...], 密钥常量名: 值}"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    config = {name: _string_array(text, name) for name in ('exclude_files', 'encrypt_files')}
+    for name in MODE_KEYS.values():
+        m = re.search(r'const %s: string = `([^`]*)`;' % re.escape(name), text)
+        config[name] = m.group(1) if m else ''
+    return config
+
+
+def glob_to_regex(pattern):
+    """anymatch / picomatch 风格的 glob: ** 跨目录, * ? 不跨目录, {a,b} 多选"""
+    out = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+            continue
+        if pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+            continue
+        if c == '*':
+            out.append('[^/]*')
+        elif c == '?':
+            out.append('[^/]')
+        elif c == '{':
+            end = pattern.find('}', i)
+            if end > i:
+                out.append('(?:' + '|'.join(re.escape(p) for p in pattern[i + 1:end].split(',')) + ')')
+                i = end + 1
+                continue
+            out.append(re.escape(c))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return re.compile(''.join(out) + r'\Z')
+
+
+class Matcher:
+    """anymatch 语义: 任一 ! 规则匹配则不匹配, 否则任一普通规则匹配即匹配"""
+
+    def __init__(self, patterns):
+        self.include = [glob_to_regex(p) for p in patterns if not p.startswith('!')]
+        self.exclude = [glob_to_regex(p[1:]) for p in patterns if p.startswith('!')]
+
+    def __call__(self, path):
+        if any(r.match(path) for r in self.exclude):
+            return False
+        return any(r.match(path) for r in self.include)
+
+
+# ---------------------------------------------------------------- 清单
+
+def file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'files': {}}
+
+
+def build_manifest(config, previous=None, game_dir=GAME_DIR):
+    """返回 (files, ignored): files 为 {'game/...': {'sha1', 'size', 'mode', 'mtime_ns', 'action'}}"""
+    exclude = Matcher(config['exclude_files'])
+    encrypt = Matcher(config['encrypt_files'])
+    old_files = (previous or {}).get('files', {})
+    files, ignored = {}, 0
+    root_dir = os.path.dirname(game_dir)
+    for root, dirs, names in os.walk(game_dir):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            rel = os.path.relpath(path, root_dir).replace(os.sep, '/')
+            if exclude(rel):
+                ignored += 1
+                continue
+            st = os.stat(path)
+            old = old_files.get(rel)
+            if old and old['size'] == st.st_size and old.get('mtime_ns') == st.st_mtime_ns:
+                sha1 = old['sha1']
+            else:
+                sha1 = file_sha1(path)
+            files[rel] = {
+                'sha1': sha1,
+                'size': st.st_size,
+                'mode': oct(stat.S_IMODE(st.st_mode)),
+                'mtime_ns': st.st_mtime_ns,
+                'action': 'encrypt' if encrypt(rel) else 'copy',
+            }
+    return files, ignored
+
+
+def publish_path(rel, publish_dir=PUBLISH_DIR):
+    """game/xxx -> publish/xxx (与 publish.ts 的 getPublishPath 相同)"""
+    return os.path.join(publish_dir, rel.split('/', 1)[1])
+
+
+def diff(files, previous, key_digest, publish_dir=PUBLISH_DIR):
+    """返回 {'added': [...], 'changed': [...], 'removed': [...], 'unchanged': N}"""
+    old_files = previous.get('files', {})
+    key_changed = previous.get('key_digest') != key_digest
+    result = {'added': [], 'changed': [], 'removed': [], 'unchanged': 0}
+    for rel, entry in files.items():
+        old = old_files.get(rel)
+        if old is None:
+            result['added'].append(rel)
+        elif (old['sha1'] != entry['sha1'] or old['action'] != entry['action'] or old['mode'] != entry['mode']
+              or (entry['action'] == 'encrypt' and key_changed) or ALWAYS_PUBLISH.search(rel)
+              or not os.path.exists(publish_path(rel, publish_dir))):
+            result['changed'].append(rel)
+        else:
+            result['unchanged'] += 1
+    result['removed'] = sorted(set(old_files) - set(files))
+    return result
+
+
+def size_report(files, previous, depth):
+    """[(目录, 文件数, 大小, 与上次相比的大小变化)], 按大小降序"""
+    def group(entries):
+        sizes = defaultdict(lambda: [0, 0])
+        for rel, entry in entries.items():
+            key = '/'.join(rel.split('/')[:-1][:depth]) or '.'
+            sizes[key][0] += 1
+            sizes[key][1] += entry['size']
+        return sizes
+
+    now, before = group(files), group(previous.get('files', {}))
+    rows = [(d, n, size, size - before.get(d, [0, 0])[1]) for d, (n, size) in now.items()]
+    rows += [(d, 0, 0, -size) for d, (_, size) in before.items() if d not in now]
+    return sorted(rows, key=lambda r: (-r[2], r[0]))
+
+
+# ---------------------------------------------------------------- 发布
+
+def _timestamp_header(mode):
+    """与 publish.ts 相同的格式 (月 / 时 / 分不补零)"""
+    now = datetime.now()
+    header = f'_G.PUBLISH_TIMESTAMP = "{now.year}-{now.month}-{now.day} {now.hour}:{now.minute}"\n\n'
+    if mode == 'release_test':
+        header = '_G.ONLINE_TEST_MODE = true\n\n' + header
+    return header
+
+
+def _stamp(target, mode):
+    """addon_game_mode.lua: 在发布后的文件开头写入时间戳"""
+    with open(target, encoding='utf-8') as f:
+        text = f.read()
+    with open(target, 'w', encoding='utf-8', newline='') as f:
+        f.write(_timestamp_header(mode) + text)
+
+
+def publish_file(rel, entry, key, publish_dir=PUBLISH_DIR):
+    """复制, 或 (--lua-encrypt 时) 调用 encrypt_file.lua 加密单个文件"""
+    target = publish_path(rel, publish_dir)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if entry['action'] == 'encrypt':
+        subprocess.run(['lua', ENCRYPT_SCRIPT, rel, target, key], cwd=BASE_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    else:
+        shutil.copyfile(os.path.join(BASE_DIR, rel), target)
+    return rel
+
+
+def apply_delta(delta, files, key, mode, jobs, publish_dir=PUBLISH_DIR, use_lua=False):
+    """执行增量发布, 返回 (失败的文件列表, 加密命中缓存的数量)"""
+    failed, hits = [], 0
+    todo = delta['added'] + delta['changed']
+    encrypt = [] if use_lua else [rel for rel in todo if files[rel]['action'] == 'encrypt']
+    if encrypt:
+        # 加密在进程池中进行, 按 (内容, 密钥) 缓存
+        results, hits = lua_encrypt.encrypt_files(
+            [(os.path.join(BASE_DIR, rel), publish_path(rel, publish_dir), rel) for rel in encrypt], key, jobs)
+        for rel in encrypt:
+            error = results[os.path.join(BASE_DIR, rel)]
+            if error:
+                print(f'  ERROR: {rel}: {error}')
+                failed.append(rel)
+    # 复制 (以及 --lua-encrypt 时启动 lua 进程) 用线程池
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {rel: pool.submit(publish_file, rel, files[rel], key, publish_dir)
+                   for rel in todo if rel not in encrypt}
+        for rel, future in futures.items():
+            try:
+                future.result()
+            except (OSError, subprocess.CalledProcessError) as e:
+                detail = e.stderr.decode(errors='replace').strip() if getattr(e, 'stderr', None) else e
+                print(f'  ERROR: {rel}: {detail}')
+                failed.append(rel)
+    for rel in todo:
+        if ALWAYS_PUBLISH.search(rel) and rel not in failed:
+            _stamp(publish_path(rel, publish_dir), mode)
+    for rel in delta['removed']:
+        target = publish_path(rel, publish_dir)
+        if os.path.exists(target):
+            os.remove(target)
+    return failed, hits
+
+
+def _format_size(n):
+    sign = '-' if n < 0 else ''
+    n = abs(n)
+    for unit in ('B', 'KB', 'MB'):
+        if n < 1024 or unit == 'MB':
+            return f'{sign}{n:.0f} {unit}' if unit == 'B' else f'{sign}{n:.1f} {unit}'
+        n /= 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成发布清单, 计算增量发布的文件列表')
+    parser.add_argument('--mode', choices=list(MODE_KEYS), default='test', help='发布模式 (决定加密密钥)')
+    parser.add_argument('--apply', action='store_true', help='执行增量发布并更新清单')
+    parser.add_argument('--json', metavar='PATH', help='把变化列表写入 JSON')
+    parser.add_argument('--depth', type=int, default=3, help='大小统计的目录层级')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='--apply 时的并行数')
+    parser.add_argument('--lua-encrypt', action='store_true', help='用 lua scripts/encrypt_file.lua 加密 (默认用 lua_encrypt)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='列出每个变化的文件')
+    args = parser.parse_args()
+
+    try:
+        config = load_addon_config()
+    except (OSError, ValueError) as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
+    key = config[MODE_KEYS[args.mode]]
+    key_digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    previous = load_manifest()
+    files, ignored = build_manifest(config, previous)
+    delta = diff(files, previous, key_digest)
+
+    total = sum(entry['size'] for entry in files.values())
+    print(f'{len(files)} 个文件 ({_format_size(total)}), 忽略 {ignored} 个')
+    print(f'新增 {len(delta["added"])}, 修改 {len(delta["changed"])}, 删除 {len(delta["removed"])}, '
+          f'未变 {delta["unchanged"]}')
+    if args.verbose:
+        for kind, mark in (('added', '+'), ('changed', '~'), ('removed', '-')):
+            for rel in delta[kind]:
+                action = files[rel]['action'] if rel in files else ''
+                print(f'  {mark} {rel} {action}')
+
+    print(f'\n{"目录":<40}{"文件":>6}{"大小":>12}{"变化":>12}')
+    for d, n, size, change in size_report(files, previous, args.depth):
+        print(f'{d:<42}{n:>6}{_format_size(size):>12}{_format_size(change) if change else "":>12}')
+
+    if args.json:
+        write_if_changed(os.path.abspath(args.json), json.dumps(
+            {kind: delta[kind] for kind in ('added', 'changed', 'removed')}, indent=1) + '\n')
+        print(f'变化列表已写入 {args.json}')
+
+    if args.apply:
+        failed, hits = apply_delta(delta, files, key, args.mode, args.jobs, use_lua=args.lua_encrypt)
+        for rel in failed:
+            # 失败的文件不记入清单, 下次发布时重试
+            files.pop(rel)
+            if rel in previous.get('files', {}):
+                files[rel] = dict(previous['files'][rel], sha1='')
+        write_if_changed(MANIFEST_PATH, json.dumps(
+            {'key_digest': key_digest, 'files': files}, indent=1, sort_keys=True) + '\n')
+        done = len(delta['added']) + len(delta['changed']) - len(failed)
+        print(f'发布完成: 处理 {done} 个文件 (加密命中缓存 {hits} 个), 删除 {len(delta["removed"])} 个, '
+              f'失败 {len(failed)} 个')
+        if failed:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
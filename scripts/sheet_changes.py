@@ -0,0 +1,240 @@
+"""
+工作簿修改的公共层: 先在内存中收集单元格改动, 打印改动表, 确认后再写回
+
+- 所有改动只记录 (sheet, 行, 列, 旧值, 新值), 不直接写 ws
+- 同一单元格多次修改只保留最终值; 最终值与原值相同的改动自动丢弃
+- --dry-run 只打印改动表; 改动为空时不保存, 避免无意义地重写整个工作簿
+- 默认通过 xlsx_patch 只重写被修改的 sheet XML, 其他内容原样保留
+
+用法:
+    wb = open_workbook(EXCEL_PATH, args)
+    changes = ChangeSet(wb['custom_units'])
+    changes.set_field('npc_creep_wave_1', 'StatusHealth', 200)
+    finish(wb, EXCEL_PATH, [changes], args.dry_run, args.quiet, args.openpyxl_save)
+"""
+import unicodedata
+
+from sheet_utils import KEY_ROW, DATA_START_ROW
+
+HEADER_ROW = 1
+NAME_COLUMN = 1
+
+
+def same_value(a, b):
+    """数值按大小比较 (200 == 200.0), 字符串和数字视为不同 ('200' != 200)"""
+    if isinstance(a, str) != isinstance(b, str):
+        return False
+    return a == b
+
+
+class ChangeSet:
+    """一个 sheet 的待写入改动"""
+
+    def __init__(self, ws, name_col=NAME_COLUMN):
+        self.ws = ws
+        self.sheet = ws.title
+        self.name_col = name_col
+        # (row, col) -> [entry, field, old, new]
+        self._cells = {}
+        # 一次性读出所有值, read-only 模式的 worksheet 也可以使用
+        self._values = [list(row) for row in ws.iter_rows(values_only=True)]
+        self.field_to_col = {}
+        if len(self._values) >= KEY_ROW:
+            for c, key in enumerate(self._values[KEY_ROW - 1], start=1):
+                if key is not None and str(key).strip() != '':
+                    self.field_to_col.setdefault(str(key).strip(), c)
+        self.entry_rows = {}
+        for r in range(DATA_START_ROW, len(self._values) + 1):
+            name = self._original(r, name_col)
+            if name is not None and str(name).strip() != '':
+                self.entry_rows[str(name).strip()] = r
+        self._next_col = max((len(row) for row in self._values), default=0) + 1
+        # 最后一个非空行之后追加新条目 (末尾可能有只带格式的空行)
+        self._next_row = 1 + max((r for r, row in enumerate(self._values, start=1)
+                                  if any(v is not None for v in row)), default=0)
+
+    def _original(self, row, col):
+        if row - 1 < len(self._values):
+            values = self._values[row - 1]
+            if col - 1 < len(values):
+                return values[col - 1]
+        return None
+
+    def get(self, row, col):
+        """读取单元格, 已记录的改动优先"""
+        cell = self._cells.get((row, col))
+        return cell[3] if cell else self._original(row, col)
+
+    def set(self, row, col, value, entry='', field=''):
+        """记录一个单元格改动, 返回该单元格最终是否与原值不同"""
+        key = (row, col)
+        cell = self._cells.get(key)
+        if cell is None:
+            old = self._original(row, col)
+            if same_value(old, value):
+                return False
+            cell = self._cells[key] = [entry, field, old, value]
+        cell[3] = value
+        if same_value(cell[2], value):
+            del self._cells[key]
+            return False
+        return True
+
+    def set_field(self, entry, field, value):
+        """按条目名 + KV 字段名修改; 返回 None 表示找不到条目或字段"""
+        row = self.entry_rows.get(entry)
+        col = self.field_to_col.get(field)
+        if row is None or col is None:
+            return None
+        return self.set(row, col, value, entry, field)
+
+    def rename(self, old_name, new_name):
+        row = self.entry_rows.pop(old_name, None)
+        if row is None:
+            return False
+        self.entry_rows[new_name] = row
+        self.set(row, self.name_col, new_name, new_name, '(名称)')
+        return True
+
+    def add_entry(self, name, copy_from=None):
+        """
+        在末尾追加一个条目行, copy_from 为已有条目名时复制它的所有列
+        条目已存在时直接返回原行号
+        """
+        if name in self.entry_rows:
+            return self.entry_rows[name]
+        row = self._next_row
+        self._next_row += 1
+        src = self.entry_rows.get(copy_from)
+        if src is not None:
+            col_to_field = {c: f for f, c in self.field_to_col.items()}
+            for c in range(1, self._next_col):
+                if c != self.name_col:
+                    value = self.get(src, c)
+                    if value is not None:
+                        self.set(row, c, value, name, col_to_field.get(c, ''))
+        self.set(row, self.name_col, name, name, '(新增)')
+        self.entry_rows[name] = row
+        return row
+
+    def add_column(self, field, header=None):
+        """在末尾新增一列 (Row 1 中文表头 + Row 2 字段名), 已存在时直接返回列号"""
+        if field in self.field_to_col:
+            return self.field_to_col[field]
+        col = self._next_col
+        self._next_col += 1
+        self.set(HEADER_ROW, col, header or field, '(表头)', field)
+        self.set(KEY_ROW, col, field, '(表头)', field)
+        self.field_to_col[field] = col
+        return col
+
+    def __len__(self):
+        return len(self._cells)
+
+    def __bool__(self):
+        return bool(self._cells)
+
+    def items(self):
+        """按 (行, 列) 排序的 (row, col, entry, field, old, new)"""
+        for (row, col), (entry, field, old, new) in sorted(self._cells.items()):
+            yield row, col, entry, field, old, new
+
+    def edits(self):
+        """{(row, col): 新值}, 供 xlsx_patch.patch_workbook 使用"""
+        return {(row, col): new for row, col, _, _, _, new in self.items()}
+
+    def apply(self):
+        """把改动写入 openpyxl worksheet (需要以非 read-only 模式打开)"""
+        for row, col, _, _, _, new in self.items():
+            self.ws.cell(row=row, column=col).value = new
+
+
+def column_letter(col):
+    letters = ''
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _fmt(value):
+    if value is None:
+        return '(空)'
+    if isinstance(value, str):
+        return repr(value) if value.strip() != value or value == '' else value
+    return str(value)
+
+
+def _width(text):
+    """终端显示宽度, 中文按 2 计"""
+    return sum(2 if unicodedata.east_asian_width(ch) in 'WF' else 1 for ch in text)
+
+
+def _pad(text, width):
+    return text + ' ' * (width - _width(text))
+
+
+def print_changes(changesets):
+    """以表格形式打印所有改动"""
+    headers = ['sheet', '单元格', '条目', '字段', '旧值', '新值']
+    rows = []
+    for cs in changesets:
+        for row, col, entry, field, old, new in cs.items():
+            rows.append([cs.sheet, f'{column_letter(col)}{row}', str(entry), str(field), _fmt(old), _fmt(new)])
+    if not rows:
+        print('没有改动')
+        return
+    widths = [max([_width(h)] + [_width(r[i]) for r in rows]) for i, h in enumerate(headers)]
+    print(' | '.join(_pad(h, w) for h, w in zip(headers, widths)))
+    print('-+-'.join('-' * w for w in widths))
+    for r in rows:
+        print(' | '.join(_pad(v, w) for v, w in zip(r, widths)))
+    print(f'({len(rows)} 个单元格)')
+
+
+def open_workbook(path, args):
+    """
+    打开要修改的工作簿: 默认 read-only (只读出数值, 保存时由 xlsx_patch 直接改 sheet XML),
+    --openpyxl-save 时按完整模式打开, 沿用 openpyxl 整本保存
+    """
+    import openpyxl
+    return openpyxl.load_workbook(path, read_only=not args.openpyxl_save)
+
+
+def finish(wb, path, changesets, dry_run=False, quiet=False, openpyxl_save=False):
+    """
+    打印改动表; 非 dry-run 且有改动时写入并保存
+    默认用 xlsx_patch 只重写被修改的 sheet, openpyxl_save=True 时用 wb.save 整本保存
+    返回是否保存了文件
+    """
+    if not quiet or dry_run:
+        print_changes(changesets)
+    total = sum(len(cs) for cs in changesets)
+    if dry_run:
+        print('dry-run: 未保存')
+        return False
+    if total == 0:
+        print('没有需要写入的改动, 未保存')
+        return False
+    if openpyxl_save:
+        for cs in changesets:
+            cs.apply()
+        wb.save(path)
+    else:
+        from xlsx_patch import patch_workbook
+        edits = {}
+        for cs in changesets:
+            edits.setdefault(cs.sheet, {}).update(cs.edits())
+        # read-only 模式会一直占用文件句柄, 替换文件前先关闭
+        wb.close()
+        patch_workbook(path, edits)
+    print(f'已保存 {total} 个单元格改动到 {path}')
+    return True
+
+
+def add_mutation_args(parser):
+    """给修改脚本加上 --dry-run / --quiet / --openpyxl-save 参数"""
+    parser.add_argument('-n', '--dry-run', action='store_true', help='只打印改动表, 不保存')
+    parser.add_argument('-q', '--quiet', action='store_true', help='保存时不打印改动明细')
+    parser.add_argument('--openpyxl-save', action='store_true',
+                        help='用 openpyxl 整本保存 (默认只重写被修改的 sheet XML)')
@@ -0,0 +1,131 @@
+"""
+表头驱动的 KV 行输出器
+
+读取一次 Row 2 的 KV 字段名, 为每个 sheet 编译出专用的 emit(row) 函数:
+- 列号全部由表头决定, 插入/移动列不会让输出错位
+- 空表头列、#Loc 等本地化列在编译时就被剔除, 逐行输出只遍历有效列
+- 支持嵌套块 (`AbilityValues[{]` ... `[}]`, `Precache[{]` ... `[}]`)
+- 块内字段名为数字的列按 "key value" 拆分 (AbilityValues 打包列)
+
+用法:
+    emit = compile_row_emitter(key_row)
+    for row in ws.iter_rows(min_row=3, values_only=True):
+        lines = emit(row)          # 条目名为空时返回 None
+"""
+
+NAME_COLUMN = 0
+
+
+def parse_key_row(key_row):
+    """
+    把 Row 2 解析为节点树:
+      ('field', 列下标, 字段名)
+      ('packed', 列下标)
+      ('block', 块名, [子节点])
+    """
+    root = []
+    stack = [root]
+    for i, key in enumerate(key_row):
+        if i == NAME_COLUMN or key is None:
+            continue
+        key = str(key).strip()
+        if key == '' or key.startswith('#'):
+            # #Loc / #ValuesLoc 等列输出到本地化文件, 不写入 KV
+            continue
+        if key.endswith('[{]'):
+            block = ('block', key[:-3], [])
+            stack[-1].append(block)
+            stack.append(block[2])
+        elif key == '[}]':
+            if len(stack) > 1:
+                stack.pop()
+        elif key.isdigit() and len(stack) > 1:
+            stack[-1].append(('packed', i))
+        else:
+            stack[-1].append(('field', i, key))
+    return root
+
+
+def _compile_nodes(nodes, depth, indent, in_block, keep_empty_blocks):
+    """把一层节点编译成 step 列表, 每个 step 签名为 step(row, out)"""
+    pad = indent * depth
+    steps = []
+    fields = []  # 连续的普通字段合并为一个 step
+
+    def flush_fields():
+        if not fields:
+            return
+        plan = tuple(fields)
+        fields.clear()
+        if in_block:
+            def step(row, out, plan=plan):
+                for i, prefix in plan:
+                    val = row[i]
+                    if val is not None and val != '':
+                        out.append(f'{prefix}{val}"')
+        else:
+            def step(row, out, plan=plan):
+                for i, prefix in plan:
+                    val = row[i]
+                    if val is not None:
+                        out.append(f'{prefix}{val}"')
+        steps.append(step)
+
+    for node in nodes:
+        kind = node[0]
+        if kind == 'field':
+            fields.append((node[1], f'{pad}"{node[2]}" "'))
+            continue
+        flush_fields()
+        if kind == 'packed':
+            def step(row, out, i=node[1]):
+                val = row[i]
+                if val is None:
+                    return
+                parts = str(val).split(' ', 1)
+                if len(parts) == 2:
+                    out.append(f'{pad}"{parts[0]}" "{parts[1]}"')
+                else:
+                    out.append(f'{pad}"{parts[0]}" ""')
+            steps.append(step)
+        else:
+            _, name, children = node
+            inner = _compile_nodes(children, depth + 1, indent, True, keep_empty_blocks)
+            open_line = f'{pad}"{name}" {{'
+            close_line = f'{pad}}}'
+
+            def step(row, out, inner=inner, open_line=open_line, close_line=close_line):
+                body = []
+                for s in inner:
+                    s(row, body)
+                if body or keep_empty_blocks:
+                    out.append(open_line)
+                    out.extend(body)
+                    out.append(close_line)
+            steps.append(step)
+    flush_fields()
+    return steps
+
+
+def compile_row_emitter(key_row, indent='\t', depth=1, keep_empty_blocks=False):
+    """
+    根据 Row 2 编译出 emit(row) -> [lines] | None
+    depth 为条目名所在的缩进层级 (XLSXContent 下为 1)
+    """
+    width = len(key_row)
+    steps = _compile_nodes(parse_key_row(key_row), depth + 1, indent, False, keep_empty_blocks)
+    pad = indent * depth
+
+    def emit(row):
+        if len(row) < width:
+            row = tuple(row) + (None,) * (width - len(row))
+        name = row[NAME_COLUMN]
+        if not name:
+            return None
+        out = [f'{pad}"{name}" {{']
+        for step in steps:
+            step(row, out)
+        out.append(f'{pad}}}')
+        return out
+
+    return emit
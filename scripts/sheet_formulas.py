@@ -0,0 +1,302 @@
+"""
+工作簿计算列: 按 sheet_schemas.COMPUTED_COLUMNS 中声明的列公式, 用 NumPy 对整列批量求值, 再一次性写回工作簿
+
+openpyxl 读不出 Excel 公式的结果 (只有公式文本或上次保存时的缓存值), 因此派生数值
+(BountyGoldMax = BountyGoldMin ...) 改为在这里声明, gulp 的 sheet_2_kv 任务在生成 KV 前运行一次:
+- 每个公式编译为表达式树, 按列求值: 每个字段是一个 (行数,) 的 float 数组, 空单元格 / 非数字为 NaN
+- 计算列之间可以相互引用, 按依赖顺序求值, 循环依赖报错
+- 结果为 NaN 的行 (输入为空) 保持原值不动; 整数结果按整数写回
+- 改动通过 sheet_changes.ChangeSet 收集, 默认由 xlsx_patch 只重写被修改的 sheet XML
+
+表达式语法 (Python 表达式的子集):
+- 字段名 (Row 2 中的 KV 字段名, 须为合法标识符)、数字常量
+- + - * / // % **, 比较运算, and / or / not, `a if 条件 else b`
+- 函数: floor ceil round(x, 位数) abs min max clip(x, 下限, 上限) where(条件, a, b)
+  choose(下标, v0, v1, ...) (下标截尾取整后从 0 开始选择对应的值, 越界为 NaN)
+
+用法:
+  python scripts/sheet_formulas.py                     # 计算所有声明了计算列的工作簿并写回
+  python scripts/sheet_formulas.py --check             # 只检查, 有过期的计算列时以状态码 1 退出 (适合 git hook)
+  python scripts/sheet_formulas.py excels/单位表.xlsx -n
+
+写回失败 (如工作簿正被 Excel 占用) 时只打印警告, 不以错误退出, 以免阻塞 gulp 的 sheet_2_kv
+"""
+import argparse
+import ast
+import os
+import sys
+import zipfile
+
+from sheet_changes import ChangeSet, add_mutation_args, finish, open_workbook, print_changes
+from sheet_schemas import COMPUTED_COLUMNS
+from sheet_utils import EXCELS_DIR, coerce_value
+from xlsx_patch import PatchError
+
+
+class FormulaError(ValueError):
+    pass
+
+
+_BINARY = {ast.Add: 'add', ast.Sub: 'subtract', ast.Mult: 'multiply', ast.Div: 'true_divide',
+           ast.FloorDiv: 'floor_divide', ast.Mod: 'mod', ast.Pow: 'power'}
+_COMPARE = {ast.Eq: 'equal', ast.NotEq: 'not_equal', ast.Lt: 'less', ast.LtE: 'less_equal',
+            ast.Gt: 'greater', ast.GtE: 'greater_equal'}
+
+
+def _round(np, x, digits=0):
+    """与 Excel ROUND 相同: 四舍五入, 远离 0"""
+    scale = 10.0 ** digits
+    return np.sign(x) * np.floor(np.abs(x) * scale + 0.5) / scale
+
+
+def _choose(np, index, *values):
+    index = np.trunc(np.asarray(index, dtype=np.float64))
+    out = np.full(index.shape, np.nan)
+    for i, value in enumerate(values):
+        np.copyto(out, value, where=index == i)
+    return out
+
+
+def _reduce(func):
+    def call(np, *args):
+        if not args:
+            raise FormulaError('min / max 至少需要一个参数')
+        result = args[0]
+        for arg in args[1:]:
+            result = getattr(np, func)(result, arg)
+        return result
+    return call
+
+
+FUNCTIONS = {
+    'floor': lambda np, x: np.floor(x),
+    'ceil': lambda np, x: np.ceil(x),
+    'abs': lambda np, x: np.abs(x),
+    'round': _round,
+    'min': _reduce('minimum'),
+    'max': _reduce('maximum'),
+    'clip': lambda np, x, lo, hi: np.clip(x, lo, hi),
+    'where': lambda np, cond, a, b: np.where(cond, a, b),
+    'choose': _choose,
+}
+
+
+def parse_formula(text):
+    """返回 (表达式树, 引用的字段集合); 不支持的语法抛出 FormulaError"""
+    try:
+        tree = ast.parse(str(text).strip(), mode='eval').body
+    except SyntaxError as e:
+        raise FormulaError(f'无法解析公式 {text!r}: {e.msg}') from None
+    fields = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+                raise FormulaError(f'公式 {text!r} 中有不支持的函数调用')
+        elif isinstance(node, ast.Name):
+            if node.id not in FUNCTIONS:
+                fields.add(node.id)
+        elif isinstance(node, ast.Constant):
+            if not isinstance(node.value, (int, float)) or isinstance(node.value, bool):
+                raise FormulaError(f'公式 {text!r} 中只能使用数字常量')
+        elif isinstance(node, ast.BinOp) and type(node.op) not in _BINARY:
+            raise FormulaError(f'公式 {text!r} 中有不支持的运算符')
+        elif isinstance(node, ast.Compare) and any(type(op) not in _COMPARE for op in node.ops):
+            raise FormulaError(f'公式 {text!r} 中有不支持的比较运算')
+        elif not isinstance(node, (ast.Call, ast.Name, ast.Constant, ast.BinOp, ast.UnaryOp, ast.Compare,
+                                   ast.BoolOp, ast.IfExp, ast.Load, ast.operator, ast.unaryop, ast.cmpop,
+                                   ast.boolop)):
+            raise FormulaError(f'公式 {text!r} 中有不支持的语法 ({type(node).__name__})')
+    return tree, fields
+
+
+def evaluate(tree, columns):
+    """对整列求值, columns 为 {字段: float 数组}"""
+    import numpy as np
+
+    def ev(node):
+        if isinstance(node, ast.Constant):
+            return float(node.value)
+        if isinstance(node, ast.Name):
+            return columns[node.id]
+        if isinstance(node, ast.BinOp):
+            return getattr(np, _BINARY[type(node.op)])(ev(node.left), ev(node.right))
+        if isinstance(node, ast.UnaryOp):
+            value = ev(node.operand)
+            if isinstance(node.op, ast.Not):
+                return np.logical_not(value)
+            return -value if isinstance(node.op, ast.USub) else value
+        if isinstance(node, ast.Compare):
+            result, left = None, ev(node.left)
+            for op, right_node in zip(node.ops, node.comparators):
+                right = ev(right_node)
+                part = getattr(np, _COMPARE[type(op)])(left, right)
+                result = part if result is None else np.logical_and(result, part)
+                left = right
+            return result
+        if isinstance(node, ast.BoolOp):
+            func = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = ev(node.values[0])
+            for value in node.values[1:]:
+                result = func(result, ev(value))
+            return result
+        if isinstance(node, ast.IfExp):
+            return np.where(ev(node.test), ev(node.body), ev(node.orelse))
+        return FUNCTIONS[node.func.id](np, *[ev(arg) for arg in node.args])
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        return ev(tree)
+
+
+def evaluation_order(formulas, available):
+    """
+    formulas 为 {字段: (树, 依赖)}, available 为 sheet 中已有的字段
+    返回按依赖排好的字段列表; 引用不存在的字段或循环依赖时抛出 FormulaError
+    """
+    order, state = [], {}
+
+    def visit(field, chain):
+        if state.get(field) == 'done':
+            return
+        if state.get(field) == 'visiting':
+            raise FormulaError(f'计算列循环依赖: {" -> ".join(chain + [field])}')
+        state[field] = 'visiting'
+        for dep in sorted(formulas[field][1]):
+            if dep in formulas:
+                visit(dep, chain + [field])
+            elif dep not in available:
+                raise FormulaError(f'{field} 的公式引用了不存在的字段 {dep}')
+        state[field] = 'done'
+        order.append(field)
+
+    for field in formulas:
+        visit(field, [])
+    return order
+
+
+def _number(value):
+    value = coerce_value(value)
+    return float(value) if isinstance(value, (int, float)) else float('nan')
+
+
+def _cell_value(x):
+    x = round(float(x), 9)
+    return int(x) if x.is_integer() else x
+
+
+def compute_sheet(changes, declared):
+    """
+    按声明的公式计算一个 sheet, 改动记录到 ChangeSet
+    返回 (改动单元格数, 跳过的 (字段, 行数)) ; 公式或字段有误时抛出 FormulaError
+    """
+    import numpy as np
+
+    formulas = {field: parse_formula(text) for field, text in declared.items()}
+    missing = sorted(f for f in formulas if f not in changes.field_to_col)
+    if missing:
+        raise FormulaError(f'Row 2 中没有计算列 {", ".join(missing)}')
+    order = evaluation_order(formulas, changes.field_to_col)
+
+    entries = sorted(changes.entry_rows.items(), key=lambda item: item[1])
+    rows = [row for _, row in entries]
+    needed = set().union(*(deps for _, deps in formulas.values())) | set(formulas)
+    columns = {}
+    for field in needed:
+        col = changes.field_to_col[field]
+        columns[field] = np.fromiter((_number(changes.get(row, col)) for row in rows), np.float64, len(rows))
+
+    changed, skipped = 0, []
+    for field in order:
+        result = np.broadcast_to(np.asarray(evaluate(formulas[field][0], columns), dtype=np.float64), (len(rows),))
+        valid = np.isfinite(result)
+        # 只有与原值不同的行才逐个写入 ChangeSet (原值为文本 / 公式时为 NaN, 也会被覆盖)
+        stale = valid & ~np.isclose(result, columns[field], rtol=0, atol=1e-9)
+        # 后续公式引用本列时使用新值, 无法计算的行保留原值
+        columns[field] = np.where(valid, result, columns[field])
+        col = changes.field_to_col[field]
+        for i in np.flatnonzero(stale):
+            changed += changes.set(rows[i], col, _cell_value(result[i]), entries[i][0], field)
+        if not valid.all():
+            skipped.append((field, int((~valid).sum())))
+    return changed, skipped
+
+
+def declared_workbooks(excels_dir=EXCELS_DIR):
+    """{工作簿路径: {sheet: {字段: 公式}}}"""
+    books = {}
+    for (workbook, sheet), declared in COMPUTED_COLUMNS.items():
+        books.setdefault(os.path.join(excels_dir, workbook), {})[sheet] = declared
+    return books
+
+
+def main():
+    parser = argparse.ArgumentParser(description='按声明的列公式批量计算工作簿中的派生列并写回')
+    parser.add_argument('workbooks', nargs='*', help='默认处理 sheet_schemas.COMPUTED_COLUMNS 中登记的所有工作簿')
+    parser.add_argument('--check', action='store_true', help='只检查计算列是否过期, 不保存')
+    add_mutation_args(parser)
+    args = parser.parse_args()
+
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print('ERROR: 需要 numpy (pip install numpy)')
+        sys.exit(1)
+
+    declared = declared_workbooks()
+    if args.workbooks:
+        by_name = {os.path.basename(path): sheets for path, sheets in declared.items()}
+        targets = {}
+        for path in args.workbooks:
+            if os.path.basename(path) not in by_name:
+                print(f'  WARNING: {path} 没有声明计算列, 跳过')
+                continue
+            targets[path] = by_name[os.path.basename(path)]
+    else:
+        targets = declared
+
+    stale = 0
+    for path, sheets in targets.items():
+        workbook = os.path.basename(path)
+        if not os.path.exists(path):
+            print(f'  WARNING: 找不到 {path}, 跳过')
+            continue
+        try:
+            wb = open_workbook(path, args)
+        except (OSError, zipfile.BadZipFile) as e:
+            print(f'  WARNING: 跳过 {workbook}: {e}')
+            continue
+        changesets = []
+        for sheet, formulas in sheets.items():
+            if sheet not in wb.sheetnames:
+                print(f'  WARNING: {workbook} 中找不到 sheet {sheet}, 跳过')
+                continue
+            changes = ChangeSet(wb[sheet])
+            try:
+                count, skipped = compute_sheet(changes, formulas)
+            except FormulaError as e:
+                print(f'ERROR: {workbook} / {sheet}: {e}')
+                sys.exit(1)
+            for field, n in skipped:
+                print(f'  WARNING: {workbook} / {sheet}: {field} 有 {n} 行输入为空或非数字, 保持原值')
+            print(f'{workbook} / {sheet}: {len(formulas)} 个计算列, {len(changes.entry_rows)} 行, {count} 个单元格需要更新')
+            changesets.append(changes)
+        if args.check:
+            stale += sum(len(cs) for cs in changesets)
+            if not args.quiet:
+                print_changes(changesets)
+            wb.close()
+        else:
+            try:
+                finish(wb, path, changesets, args.dry_run, args.quiet, args.openpyxl_save)
+            except (OSError, PatchError) as e:
+                # 通常是 Excel 仍占用刚保存的工作簿; 不中断 gulp 生成 KV, 本次 KV 中的计算列沿用工作簿中的旧值
+                wb.close()
+                print(f'  WARNING: 无法写回 {workbook}: {e}')
+                print(f'  WARNING: 计算列未更新, 关闭工作簿后重新运行 python -m scripts compute')
+
+    if args.check and stale:
+        print(f'{stale} 个计算列单元格与公式不一致, 请运行 python -m scripts compute')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
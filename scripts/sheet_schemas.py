@@ -0,0 +1,198 @@
+"""
+项目各 Excel 表的列结构定义 (Row1 中文表头, Row2 KV 字段名)
+
+与 gulp-dotax sheetToKV 的约定保持一致:
+- Row 1 为中文说明, Row 2 为 KV 字段名, 数据从 Row 3 开始
+- `Xxx[{]` 开启一个嵌套块, `[}]` 关闭当前块
+- 嵌套块中字段名为纯数字的列, 单元格内容按 "key value" 打包
+- `#Loc` 开头的列输出到本地化文件, 不写入 KV
+
+列号与 generate_abilities_kv.py / _update_units.py 中记录的列号一一对应
+"""
+
+# 技能表.xlsx - npc_abilities_custom (35 列)
+ABILITY_COLUMNS = [
+    ('技能名', 'name'),
+    ('基类', 'BaseClass'),
+    ('脚本路径', 'ScriptFile'),
+    ('图标', 'AbilityTextureName'),
+    ('技能行为', 'AbilityBehavior'),
+    ('最大等级', 'MaxLevel'),
+    ('冷却', 'AbilityCooldown'),
+    ('魔耗', 'AbilityManaCost'),
+    ('技能类型', 'AbilityType'),
+    ('伤害类型', 'AbilityUnitDamageType'),
+    ('施法距离', 'AbilityCastRange'),
+    ('施法前摇', 'AbilityCastPoint'),
+    ('目标团队', 'AbilityUnitTargetTeam'),
+    ('目标类型', 'AbilityUnitTargetType'),
+    ('分类', 'AbilityCategory'),
+    ('星级', 'AbilityStar'),
+    ('元素', 'AbilityElement'),
+    ('数值区域', 'AbilityValues[{]'),
+    ('数值1', '1'),
+    ('数值2', '2'),
+    ('数值3', '3'),
+    ('数值4', '4'),
+    ('数值5', '5'),
+    ('数值6', '6'),
+    ('数值7', '7'),
+    ('数值8', '8'),
+    ('数值9', '9'),
+    ('数值10', '10'),
+    (None, '[}]'),
+    ('预载区域', 'Precache[{]'),
+    ('粒子', 'particle'),
+    ('音效', 'soundfile'),
+    (None, '[}]'),
+    ('名称(中)', '#LocDOTA_Tooltip_ability_{}'),
+    ('描述(中)', '#LocDOTA_Tooltip_ability_{}_Description'),
+]
+
+# 物品表.xlsx - npc_items_artifacts
+ARTIFACT_COLUMNS = [
+    ('物品名', 'ItemName'),
+    ('名称(中)', '#LocItemCn_{}'),
+    ('描述(中)', '#LocItemDesc_{}'),
+    ('基类', 'BaseClass'),
+    ('脚本路径', 'ScriptFile'),
+    ('技能行为', 'AbilityBehavior'),
+    ('价格', 'ItemCost'),
+    ('可购买', 'ItemPurchasable'),
+    ('可出售', 'ItemSellable'),
+    ('槽位', 'ArtifactSlot'),
+    ('阶级', 'ArtifactTier'),
+    ('神器名', 'ArtifactName'),
+    ('升阶经验', 'XPRequired'),
+    ('攻击', 'BonusDamage'),
+    ('护甲穿透', 'BonusArmorPen'),
+    ('生命', 'BonusHP'),
+    ('护甲', 'BonusArmor'),
+    ('根骨', 'BonusConstitution'),
+    ('武道', 'BonusMartial'),
+    ('神念', 'BonusDivinity'),
+    ('身法', 'BonusAgility'),
+    ('回蓝', 'BonusManaRegen'),
+    ('暴击%', 'BonusCritChance'),
+    ('爆伤%', 'BonusCritDamage'),
+    ('移速', 'BonusMoveSpeed'),
+    ('闪避%', 'BonusEvasion'),
+    ('全属性', 'BonusAllStats'),
+    ('终伤减%', 'BonusFinalDmgReduct'),
+    ('技能伤害%', 'BonusSpellDamage'),
+    ('格挡', 'BonusBlock'),
+    ('终伤增%', 'BonusFinalDmgIncrease'),
+    ('图标', 'AbilityTextureName'),
+]
+
+# 物品表.xlsx - npc_items_custom
+ITEM_COLUMNS = [
+    ('物品名', 'ItemName'),
+    ('名称(中)', '#LocItemCn_{}'),
+    ('描述(中)', '#LocItemDesc_{}'),
+    ('图标', 'AbilityTextureName'),
+    ('基类', 'BaseClass'),
+    ('脚本路径', 'ScriptFile'),
+    ('技能行为', 'AbilityBehavior'),
+    ('ID', 'ID'),
+    ('价格', 'ItemCost'),
+    ('可购买', 'ItemPurchasable'),
+    ('可出售', 'ItemSellable'),
+    ('可堆叠', 'ItemStackable'),
+    ('共享', 'ItemShareability'),
+    ('永久', 'ItemPermanent'),
+    ('初始次数', 'ItemInitialCharges'),
+    ('保留特效', 'ItemRetainParticles'),
+    ('购买通告', 'ItemDeclarations'),
+    ('品质', 'ItemQuality'),
+    ('学习技能', 'LearnAbilityName'),
+    ('图标路径', 'IconPath'),
+    ('可使用', 'ItemUsable'),
+    ('是否技能书', 'IsSkillBook'),
+    ('技能书分类', 'SkillBookCategory'),
+]
+
+# 单位表.xlsx - custom_units (66 列, 列号见 _update_units.py 文档)
+UNIT_COLUMNS = [
+    ('单位名', 'UnitName'),                             # 1
+    ('名称(中)', '#LocUnitNameCn_{}'),                  # 2
+    ('名称(英)', '#LocUnitNameEn_{}'),                  # 3
+    ('基类', 'BaseClass'),                              # 4
+    ('模型', 'Model'),                                  # 5
+    ('音效集', 'SoundSet'),                             # 6
+    ('模型缩放', 'ModelScale'),                         # 7
+    ('生物', 'Creature[{]'),                            # 8
+    ('饰品', 'AttachWearables[{]'),                     # 9
+] + [('饰品%d' % i, str(i)) for i in range(1, 16)] + [  # 10-24
+    (None, '[}]'),                                      # 25
+    (None, '[}]'),                                      # 26
+] + [('技能%d' % i, 'Ability%d' % i) for i in range(1, 7)] + [  # 27-32
+    ('血条高度', 'HealthBarOffset'),                    # 33
+    ('移速', 'MovementSpeed'),                          # 34
+    ('转身速率', 'MovementTurnRate'),                   # 35
+    ('有物品栏', 'HasInventory'),                       # 36
+    ('移动能力', 'MovementCapabilities'),               # 37
+    ('攻击能力', 'AttackCapabilities'),                 # 38
+    ('护甲', 'ArmorPhysical'),                          # 39
+    ('魔抗', 'MagicalResistance'),                      # 40
+    ('生命', 'StatusHealth'),                           # 41
+    ('生命回复', 'StatusHealthRegen'),                  # 42
+    ('魔法', 'StatusMana'),                             # 43
+    ('魔法回复', 'StatusManaRegen'),                    # 44
+    ('金钱下限', 'BountyGoldMin'),                      # 45
+    ('金钱上限', 'BountyGoldMax'),                      # 46
+    ('攻击下限', 'AttackDamageMin'),                    # 47
+    ('攻击上限', 'AttackDamageMax'),                    # 48
+    ('攻击间隔', 'AttackRate'),                         # 49
+    ('攻击前摇', 'AttackAnimationPoint'),               # 50
+    ('攻击距离', 'AttackRange'),                        # 51
+    ('碰撞体积', 'BoundsHullName'),                     # 52
+    ('选择圈', 'RingRadius'),                           # 53
+    ('白天视野', 'VisionDaytimeRange'),                 # 54
+    ('索敌范围', 'AttackAcquisitionRange'),             # 55
+    ('追击距离', 'ChaseDistance'),                      # 56
+    ('攻击类型', 'CombatClassAttack'),                  # 57
+    ('护甲类型', 'CombatClassDefend'),                  # 58
+    ('掉落金币', 'CustomDrop_Coin'),                    # 59
+    ('掉落信仰', 'CustomDrop_Faith'),                   # 60
+    ('属性标签', 'StatLabel'),                          # 61
+    ('经验', 'HaveLevel'),                              # 62
+    ('守护点', 'CustomDrop_DefenderPoints'),            # 63
+    ('神器经验类型', 'Artifact_Drop_Type'),             # 64
+    ('神器经验', 'Artifact_Drop_XP'),                   # 65
+    ('队伍', 'TeamName'),                               # 66
+]
+
+# 工作簿文件名 -> [(sheet 名, 列定义), ...]
+WORKBOOK_SCHEMAS = {
+    '技能表.xlsx': [('npc_abilities_custom', ABILITY_COLUMNS)],
+    '物品表.xlsx': [('npc_items_artifacts', ARTIFACT_COLUMNS),
+                   ('npc_items_custom', ITEM_COLUMNS)],
+    '单位表.xlsx': [('custom_units', UNIT_COLUMNS)],
+}
+
+# 计算列: (工作簿, sheet) -> {KV 字段: 表达式}
+# 表达式按 Row 2 字段名引用同一行的其他列, 由 sheet_formulas 在生成 KV 前 (gulp sheet_2_kv) 按列批量求值并写回工作簿,
+# 语法见 sheet_formulas.py; 计算列中手填的值或 Excel 公式会被覆盖, 因此只声明纯粹由其他列派生的列,
+# 由设计填写的数值 (如神器的 XPRequired, 各阶是否一致由 gen_artifact_tables 检查) 不要放在这里
+COMPUTED_COLUMNS = {
+    ('单位表.xlsx', 'custom_units'): {
+        'BountyGoldMax': 'BountyGoldMin',
+        'AttackDamageMax': 'AttackDamageMin',
+    },
+}
+
+
+def header_rows(columns):
+    """返回 (Row1 中文表头, Row2 KV 字段名) 两行"""
+    return [cn for cn, _ in columns], [key for _, key in columns]
+
+
+def column_index(columns):
+    """KV 字段名 -> 列号 (1-based), 块标记和打包数值列除外"""
+    index = {}
+    for c, (_, key) in enumerate(columns, start=1):
+        if key.endswith('[{]') or key == '[}]' or key.isdigit():
+            continue
+        index.setdefault(key, c)
+    return index
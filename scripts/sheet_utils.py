@@ -0,0 +1,143 @@
+"""
+Excel 表读取的公共函数
+
+约定与 gulp sheet_2_kv 一致:
+- Row 2 为 KV 字段名, 数据从 Row 3 开始, 第 1 列为条目名
+- 忽略以两个下划线开头的 sheet 和默认的 Sheet1~Sheet3
+"""
+import os
+import re
+import posixpath
+import zipfile
+import zlib
+import xml.etree.ElementTree as ET
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXCELS_DIR = os.path.join(BASE_DIR, 'excels')
+
+KEY_ROW = 2
+DATA_START_ROW = 3
+SHEETS_IGNORE = re.compile(r'^__.*|^Sheet[1-3]$')
+
+NS_MAIN = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+NS_REL = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+NS_PKG_REL = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+_NUMBER = re.compile(r'^-?\d+(\.\d+)?$')
+
+
+WORKBOOK_EXTENSIONS = ('.xlsx', '.xls')
+
+
+def list_workbooks(excels_dir=EXCELS_DIR, extensions=WORKBOOK_EXTENSIONS):
+    """列出目录下所有工作簿 (xlsx 和旧版 xls, 不含 ~$ 临时文件)"""
+    paths = []
+    for name in sorted(os.listdir(excels_dir)):
+        if name.startswith('~$') or not name.endswith(extensions):
+            continue
+        paths.append(os.path.join(excels_dir, name))
+    return paths
+
+
+def is_ignored_sheet(sheet_name):
+    return bool(SHEETS_IGNORE.match(sheet_name))
+
+
+def read_headers(rows):
+    """从 Row 2 读取 {列号(1-based): KV 字段名}, rows 为按行的值列表"""
+    headers = {}
+    if len(rows) < KEY_ROW:
+        return headers
+    for c, key in enumerate(rows[KEY_ROW - 1], start=1):
+        if key is not None and str(key).strip() != '':
+            headers[c] = str(key).strip()
+    return headers
+
+
+def iter_sheet_values(ws):
+    """按行迭代 sheet 的单元格值 (兼容 read-only 模式)"""
+    for row in ws.iter_rows(values_only=True):
+        yield list(row)
+
+
+def coerce_value(val):
+    """单元格值规范化: 去空白, 数字字符串转为数字, 空串视为 None"""
+    if val is None:
+        return None
+    if isinstance(val, bool):
+        return int(val)
+    if isinstance(val, (int, float)):
+        return val
+    text = str(val).strip()
+    if text == '':
+        return None
+    if _NUMBER.match(text):
+        return float(text) if '.' in text else int(text)
+    return text
+
+
+def sheet_xml_paths(path):
+    """读取 xlsx 的 workbook.xml, 返回 {sheet 名: zip 内 sheet XML 路径}"""
+    with zipfile.ZipFile(path) as zf:
+        return _sheet_xml_paths(zf)
+
+
+SHARED_STRINGS_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings'
+
+
+def _workbook_rels(zf):
+    """读取 xl/_rels/workbook.xml.rels, 返回 [(Id, Type, zip 内路径)]; 没有该文件时返回空列表"""
+    try:
+        rels = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+    except KeyError:
+        return []
+    result = []
+    for rel in rels.iter(NS_PKG_REL + 'Relationship'):
+        target = rel.get('Target')
+        if target.startswith('/'):
+            target = target.lstrip('/')
+        else:
+            target = posixpath.normpath(posixpath.join('xl', target))
+        result.append((rel.get('Id'), rel.get('Type'), target))
+    return result
+
+
+def _sheet_xml_paths(zf):
+    targets = {rid: target for rid, _, target in _workbook_rels(zf)}
+    workbook = ET.fromstring(zf.read('xl/workbook.xml'))
+    result = {}
+    for sheet in workbook.iter(NS_MAIN + 'sheet'):
+        rid = sheet.get(NS_REL + 'id')
+        if rid in targets:
+            result[sheet.get('name')] = targets[rid]
+    return result
+
+
+def _shared_strings_path(zf):
+    """共享字符串表在 zip 内的路径 (按 workbook.xml.rels 解析, 不一定是 xl/sharedStrings.xml), 没有时返回 None"""
+    for _, rel_type, target in _workbook_rels(zf):
+        if rel_type == SHARED_STRINGS_TYPE:
+            return target
+    return None
+
+
+def sheet_fingerprints(path):
+    """
+    不解析单元格, 直接用 zip 目录中的 CRC 计算每个 sheet 的指纹
+    共享字符串表变化时所有 sheet 的指纹都会变化
+    返回 {sheet 名: 'sheetCRC-sharedStringsCRC'}
+    旧版 .xls 不是 zip, 所有 sheet 共用整个文件的 CRC
+    """
+    if not zipfile.is_zipfile(path):
+        from workbook_reader import open_workbook
+        with open(path, 'rb') as f:
+            crc = zlib.crc32(f.read())
+        with open_workbook(path) as wb:
+            return {name: '%08x' % crc for name in wb.sheetnames}
+    with zipfile.ZipFile(path) as zf:
+        crcs = {info.filename: info.CRC for info in zf.infolist()}
+        shared = crcs.get(_shared_strings_path(zf), 0)
+        return {
+            name: '%08x-%08x' % (crcs.get(member, 0), shared)
+            for name, member in _sheet_xml_paths(zf).items()
+        }
@@ -0,0 +1,209 @@
+"""
+为 panorama 的 UI 图片生成按布局尺寸缩小的多分辨率版本, 避免客户端每次都把 1024px 的原图缩放显示
+
+- content/panorama/ui_textures.json 中按通配符配置每类图片的布局尺寸 (1080p 下的 px),
+  按 scales (默认 1x / 1.5x / 2x) 生成对应像素的版本; 第一个匹配的规则生效, 不匹配的图片不处理
+- size 为数字时按长边缩放, 为 [宽, 高] 时缩放到放得进该框的最大尺寸; 保持宽高比, 不放大原图
+- 使用 LANCZOS 滤波, 多进程并行; 按原图内容 + 目标尺寸的 hash 缓存 (.cache/ui_textures.json),
+  原图和配置都没变的图片不会重新生成; 不再需要的旧版本会被删除
+- 原图的尺寸和 hash 取自 image_index 的索引, 不重复读取图片
+
+输出:
+- content/panorama/images/scaled/<原路径>_<长边像素>.png (不进入图片索引和 image_precache0.css, 由面板按需加载)
+- content/panorama/src/json/ui_textures.json:
+    {"<images 下的相对路径>": {"size": [宽, 高], "variants": [[宽, 高, "file://{images}/scaled/..."], ...]}}
+  variants 按尺寸从小到大排列; panorama 取第一个宽高都不小于实际显示像素的版本, 都不够大时用原图
+
+用法:
+  python scripts/ui_textures.py
+  python scripts/ui_textures.py --jobs 4 --force
+  python scripts/ui_textures.py --dry-run          # 只列出需要重新生成的图片
+"""
+import argparse
+import fnmatch
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import image_index
+from export_utils import BASE_DIR, PANORAMA_JSON_DIR, write_if_changed, write_json
+from image_index import IMAGES_DIR, PANORAMA_DIR
+
+CONFIG_PATH = image_index.UI_TEXTURES_CONFIG
+CACHE_PATH = os.path.join(BASE_DIR, '.cache', 'ui_textures.json')
+OUTPUT_NAME = 'ui_textures.json'
+
+# PIL 能缩放的格式 (psd 只在图片索引中登记)
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.tga')
+# 缓存 key 的一部分, 修改缩放 / 保存方式后递增, 让旧缓存失效
+RENDER_VERSION = 1
+
+
+def load_config(path=CONFIG_PATH):
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+    config.setdefault('scales', [1, 1.5, 2])
+    config.setdefault('output', image_index.DEFAULT_SCALED_OUTPUT)
+    config.setdefault('rules', [])
+    return config
+
+
+def match_rule(rel, rules):
+    for rule in rules:
+        if fnmatch.fnmatch(rel, rule['match']):
+            return rule
+    return None
+
+
+def fit_size(source, box):
+    """source 缩放到放得进 box 的最大尺寸 (保持宽高比, 至少 1px)"""
+    w, h = source
+    ratio = min(box[0] / w, box[1] / h)
+    return max(1, round(w * ratio)), max(1, round(h * ratio))
+
+
+def target_sizes(source, rule, scales):
+    """按 scales 计算要生成的尺寸, 去重并跳过不小于原图的尺寸"""
+    size = rule['size']
+    sizes = []
+    for scale in scales:
+        if isinstance(size, (int, float)):
+            box = (size * scale, size * scale)
+        else:
+            box = (size[0] * scale, size[1] * scale)
+        target = fit_size(source, box)
+        if target[0] < source[0] and target not in sizes:
+            sizes.append(target)
+    return sorted(sizes)
+
+
+def variant_rel(rel, output, size):
+    """images 相对路径 -> 缩放版本相对 content/panorama 的路径"""
+    stem = os.path.splitext(rel)[0]
+    return f'{output}/{stem}_{max(size)}.png'
+
+
+def render(src, outputs):
+    """子进程: 把 src 缩放为 outputs = [(宽, 高, 输出路径)] 中的各个尺寸"""
+    from PIL import Image
+
+    with Image.open(src) as im:
+        im.load()
+        if im.mode not in ('RGB', 'RGBA'):
+            im = im.convert('RGBA' if 'transparency' in im.info or im.mode in ('LA', 'PA', 'P') else 'RGB')
+        for w, h, path in outputs:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # reducing_gap 先用整数倍 reduce 缩小, 再用 LANCZOS 精确缩放, 质量不变但快很多
+            im.resize((w, h), Image.LANCZOS, reducing_gap=3.0).save(path, optimize=True)
+    return src
+
+
+def scan(config):
+    """返回 [(images 相对路径, 索引项, 规则)], 跳过输出目录中已生成的版本"""
+    output_dir = os.path.relpath(os.path.join(PANORAMA_DIR, config['output']), IMAGES_DIR).replace(os.sep, '/')
+    output_prefix = output_dir + '/'
+    # 缩放版本不进入图片索引 (也就不会被预载); --config 指定了其他输出目录时一并排除
+    images, _ = image_index.scan(exclude={image_index.scaled_output_dir(), output_dir})
+    found = []
+    for rel, entry in images.items():
+        if rel.startswith(output_prefix) or not rel.lower().endswith(IMAGE_EXTENSIONS):
+            continue
+        rule = match_rule(rel, config['rules'])
+        if rule:
+            found.append((rel, entry, rule))
+    return found
+
+
+def load_cache():
+    try:
+        with open(CACHE_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='生成 panorama UI 图片的多分辨率版本')
+    parser.add_argument('--config', default=CONFIG_PATH, help='尺寸配置')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1, help='并行进程数')
+    parser.add_argument('--force', action='store_true', help='忽略缓存, 全部重新生成')
+    parser.add_argument('--dry-run', action='store_true', help='只列出需要重新生成的图片')
+    args = parser.parse_args()
+
+    try:
+        config = load_config(args.config)
+    except (OSError, ValueError) as e:
+        print(f'ERROR: 无法读取 {args.config}: {e}')
+        sys.exit(1)
+
+    cache = {} if args.force else load_cache()
+    new_cache, mapping, jobs, errors = {}, {}, [], []
+    for rel, entry, rule in scan(config):
+        src = os.path.join(IMAGES_DIR, rel)
+        if not entry['width']:
+            errors.append(f'{rel}: 无法识别的图片')
+            continue
+        source = (entry['width'], entry['height'])
+        sizes = target_sizes(source, rule, config['scales'])
+        if not sizes:
+            continue
+        outputs = [(w, h, variant_rel(rel, config['output'], (w, h))) for w, h in sizes]
+        key = f'{entry["sha1"]}:{RENDER_VERSION}:{sizes}'
+        new_cache[rel] = {'key': key, 'outputs': [path for _, _, path in outputs]}
+        mapping[rel] = {
+            'size': list(source),
+            'variants': [[w, h, 'file://{images}/' + os.path.relpath(path, 'images').replace(os.sep, '/')]
+                         for w, h, path in outputs],
+        }
+        up_to_date = cache.get(rel, {}).get('key') == key and all(
+            os.path.exists(os.path.join(PANORAMA_DIR, path)) for _, _, path in outputs)
+        if not up_to_date:
+            jobs.append((src, [(w, h, os.path.join(PANORAMA_DIR, path)) for w, h, path in outputs]))
+
+    # 原图已删除或尺寸改变后不再需要的旧版本
+    keep = {path for entry in new_cache.values() for path in entry['outputs']}
+    stale = [path for entry in cache.values() for path in entry.get('outputs', [])
+             if path not in keep and os.path.exists(os.path.join(PANORAMA_DIR, path))]
+
+    for msg in errors:
+        print(f'  ERROR: {msg}')
+    if args.dry_run:
+        for src, outputs in jobs:
+            print(f'  {os.path.relpath(src, IMAGES_DIR)} -> {", ".join(f"{w}x{h}" for w, h, _ in outputs)}')
+        print(f'{len(jobs)} 张需要生成, {len(mapping) - len(jobs)} 张已是最新, {len(stale)} 个旧版本待删除')
+        sys.exit(1 if errors else 0)
+
+    done = 0
+    if jobs:
+        with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            futures = [pool.submit(render, src, outputs) for src, outputs in jobs]
+            for (src, _), future in zip(jobs, futures):
+                try:
+                    future.result()
+                    done += 1
+                except Exception as e:  # 单张图片失败不影响其他图片
+                    rel = os.path.relpath(src, IMAGES_DIR).replace(os.sep, '/')
+                    print(f'  ERROR: {rel}: {e}')
+                    new_cache.pop(rel, None)
+                    mapping.pop(rel, None)
+                    errors.append(rel)
+    for path in stale:
+        os.remove(os.path.join(PANORAMA_DIR, path))
+
+    source_bytes = sum(os.path.getsize(os.path.join(IMAGES_DIR, rel)) for rel in mapping)
+    largest_bytes = sum(os.path.getsize(os.path.join(PANORAMA_DIR, new_cache[rel]['outputs'][-1]))
+                        for rel in mapping)
+    print(f'生成 {done} 张, {len(mapping) - done} 张使用缓存, 删除 {len(stale)} 个旧版本')
+    print(f'原图 {source_bytes / 1048576:.1f} MB -> 最大版本合计 {largest_bytes / 1048576:.1f} MB')
+
+    write_if_changed(CACHE_PATH, json.dumps(new_cache, indent=1, sort_keys=True) + '\n')
+    path = os.path.join(PANORAMA_JSON_DIR, OUTPUT_NAME)
+    changed = write_json(path, mapping)
+    print(f'{"Generated" if changed else "Unchanged"} {path} ({len(mapping)} images)')
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,506 @@
+"""
+波次 / BOSS / 练功房 / 守卫单位的数值曲线
+
+_update_units.py 里每个单位的生命、护甲、攻击、金币、经验都是手填的, 但大体沿指数曲线增长
+(波次生命 200 -> 2 亿, 共 19 波)。这里把每一族单位的每个数值列拟合成一条曲线:
+
+- exp     log(1 + v) 为序号 i 的多项式 (默认二次), 适合生命 / 攻击 / 金币 / 经验这类指数增长
+- linear  v 为 i 的多项式, 适合 StatLabel 这类阶梯标签 (结果取整并限制在已有范围内)
+- 离群点 (如最终 BOSS 不掉金币) 用留一法检测: 每次去掉一个点, 用其余点拟合后预测它;
+  取去掉后其余点拟合得最好的那个点, 预测值与原值相差超过 OUTLIER_RATIO 倍时记入 outliers 并排除出拟合,
+  重复直到没有离群点 (4 个单位的小族也会检查)
+- 曲线只用来生成新单位, 已有单位的数值是手调的, 永远不会被改写:
+  新序号从该族最后一个已有单位 (anchor) 出发, 按末端的增长率外推 (每级乘以 tail_growth),
+  与已有数值连续衔接, 二次项也不会在 50~100 波时失控; anchor 处是离群点的字段改从曲线上的值出发
+
+拟合结果保存在 excels/unit_curves.json, 每族只有几组系数; 改 count 即可生成任意波数,
+改 tail_growth / scale 即可做难度变体。新单位的所有数值列用 NumPy 一次算出,
+再通过 sheet_changes 一次性写回 单位表.xlsx (从该族最后一个单位复制一行); 只有显式指定 --from 时,
+才会按曲线重新生成该序号及之后的已有单位
+
+用法:
+  python scripts/unit_curves.py fit                          # 从 custom_units.txt 拟合, 写入 unit_curves.json
+  python scripts/unit_curves.py show wave --count 50         # 打印数值 (已有单位为 KV 中的原值, * 为生成的新单位)
+  python scripts/unit_curves.py apply --count wave=50 -n     # 追加新单位 (先 dry-run 查看改动)
+  python scripts/unit_curves.py apply --scale StatusHealth=1.5 --from wave=20
+  python scripts/unit_curves.py check                        # 自检: 在当前 KV 上 apply 不产生任何改动
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from decimal import Decimal
+
+import numpy as np
+
+from kv_utils import load_kv, kv_root, npc_path, to_number
+from sheet_utils import EXCELS_DIR
+
+PARAMS_PATH = os.path.join(EXCELS_DIR, 'unit_curves.json')
+EXCEL_PATH = os.path.join(EXCELS_DIR, '单位表.xlsx')
+SHEET_NAME = 'custom_units'
+CN_NAME_FIELD = '#LocUnitNameCn_{}'
+
+# 族名 -> (单位名模板, 新增单位的中文名模板)
+FAMILIES = {
+    'wave': ('npc_creep_wave_{}', '第{}波'),
+    'boss': ('npc_boss_wave_{}', '第{}波首领'),
+    'train': ('npc_creep_train_tier{}', '{}阶练功怪'),
+    'guard': ('npc_guardian_zone_{}', '{}号守卫'),
+}
+
+# 参与拟合的数值列 -> 曲线类型
+STAT_KINDS = {
+    'StatusHealth': 'exp',
+    'StatusHealthRegen': 'exp',
+    'ArmorPhysical': 'exp',
+    'AttackDamageMin': 'exp',
+    'CustomDrop_Coin': 'exp',
+    'CustomDrop_Faith': 'exp',
+    'HaveLevel': 'exp',
+    'CustomDrop_DefenderPoints': 'exp',
+    'StatLabel': 'linear',
+}
+
+# 允许小数的列 (如练功房 0.5 回血), 其余列取整
+FRACTIONAL_FIELDS = {'StatusHealthRegen'}
+
+# 与其他列取相同值的列
+DERIVED_FIELDS = {'AttackDamageMax': 'AttackDamageMin'}
+
+DEFAULT_DEGREE = 2
+SIG_DIGITS = 2
+OUTLIER_RATIO = 4.0
+
+
+# ---------------------------------------------------------------- 拟合
+
+def existing_units(units, family):
+    """返回 [(序号, 条目)], 按序号排序"""
+    pattern = re.compile('^' + re.escape(FAMILIES[family][0]).replace(r'\{\}', r'(\d+)') + '$')
+    found = []
+    for name, entry in units.items():
+        m = pattern.match(name)
+        if m and isinstance(entry, dict):
+            found.append((int(m.group(1)), entry))
+    return sorted(found, key=lambda item: item[0])
+
+
+def _fit_degree(degree, n):
+    """拟合至少保留 1 个自由度 (n 个点最多 n - 2 次), 至少为线性"""
+    return max(1, min(degree, n - 2))
+
+
+def find_outliers(x, target, degree):
+    """
+    留一法离群点检测, 返回离群点下标
+    每轮对每个点: 用其余点拟合 (每个系数至少 3 个点, 最多 degree 次), 记录其余点的残差平方和和对该点的预测误差;
+    残差平方和最小 (去掉后其余点最吻合) 的点, 预测误差超过 log(OUTLIER_RATIO) 时记为离群点, 继续下一轮
+    """
+    keep = np.ones(len(x), dtype=bool)
+    while keep.sum() >= 4:
+        idx = np.flatnonzero(keep)
+        d = max(1, min(degree, (len(idx) - 1) // 3))
+        best = None
+        for k in idx:
+            others = idx[idx != k]
+            coef = np.polyfit(x[others], target[others], d)
+            rss = float(np.sum((np.polyval(coef, x[others]) - target[others]) ** 2))
+            if best is None or rss < best[0]:
+                best = (rss, k, abs(float(np.polyval(coef, x[k])) - target[k]))
+        if best[2] <= np.log(OUTLIER_RATIO):
+            break
+        keep[best[1]] = False
+    return np.flatnonzero(~keep)
+
+
+def _fit_curve(x, y, kind, degree):
+    """返回 (系数, 被视为离群点的下标); linear 曲线不检测离群点"""
+    target = np.log1p(y) if kind == 'exp' else y
+    outliers = find_outliers(x, target, degree) if kind == 'exp' else np.array([], dtype=int)
+    keep = np.ones(len(x), dtype=bool)
+    keep[outliers] = False
+    coef = np.polyfit(x[keep], target[keep], _fit_degree(degree, int(keep.sum())))
+    return coef, outliers
+
+
+def fit_family(entries, degree=DEFAULT_DEGREE, old=None):
+    """entries: [(序号, 条目)]; old: 原参数, 保留其中手动调整过的 count / tail_growth / scale"""
+    old = old or {}
+    x = np.array([i for i, _ in entries], dtype=float)
+    step = int(np.min(np.diff(x))) if len(x) > 1 else 1
+    params = {
+        'start': int(x[0]),
+        'step': step,
+        'count': max(old.get('count', 0), len(x)),
+        'fit_range': [int(x[0]), int(x[-1])],
+        'curves': {},
+        'anchor': {'index': int(x[-1]), 'values': {}},
+        'outliers': {},
+    }
+    for field, kind in STAT_KINDS.items():
+        y = np.array([to_number(entry.get(field), 0) for _, entry in entries], dtype=float)
+        coef, outliers = _fit_curve(x, y, kind, degree)
+        curve = {'kind': kind, 'coef': [round(float(c), 6) for c in coef]}
+        if kind == 'linear':
+            curve['clamp'] = [float(y.min()), float(y.max())]
+        old_curve = old.get('curves', {}).get(field, {})
+        if 'tail_growth' in old_curve:
+            curve['tail_growth'] = old_curve['tail_growth']
+        params['curves'][field] = curve
+        for k in outliers:
+            params['outliers'].setdefault(str(int(x[k])), {})[field] = _plain(y[k])
+        # 新单位从最后一个已有单位的数值出发; 该值是离群点时从曲线上的值出发
+        last = y[-1]
+        if len(x) - 1 in outliers:
+            last = np.polyval(coef, x[-1])
+            last = _round_sig(np.expm1(last) if kind == 'exp' else last)
+        params['anchor']['values'][field] = _plain(last)
+    if old.get('scale'):
+        params['scale'] = old['scale']
+    return params
+
+
+def _plain(value):
+    value = float(value)
+    if not value.is_integer():
+        return value
+    # 经过有效数字取整的大数按十进制还原, 避免 int(1e20) 带出二进制误差的尾数
+    return int(Decimal(format(value, '.15g'))) if abs(value) >= 2 ** 53 else int(value)
+
+
+# ---------------------------------------------------------------- 计算
+
+def _round_sig(values, sig=SIG_DIGITS):
+    """保留 sig 位有效数字 (向量化), 0 保持为 0"""
+    values = np.asarray(values, dtype=float)
+    mag = np.floor(np.log10(np.where(values == 0, 1, np.abs(values))))
+    factor = 10.0 ** (sig - 1 - mag)
+    return np.round(values * factor) / factor
+
+
+def evaluate(params, indices, scale=None):
+    """
+    计算一族单位的所有数值列 (不区分已有 / 新增, 由调用方决定写入哪些)
+    返回 (字段列表, 矩阵 [len(indices), len(字段)])
+    """
+    fields = list(params['curves'])
+    curves = [params['curves'][f] for f in fields]
+    x = np.asarray(indices, dtype=float)
+    lo, hi = params['fit_range']
+
+    degree = max(len(c['coef']) for c in curves) - 1
+    coef = np.zeros((len(fields), degree + 1))
+    for k, c in enumerate(curves):
+        coef[k, degree + 1 - len(c['coef']):] = c['coef']
+    is_exp = np.array([c['kind'] == 'exp' for c in curves])
+
+    # 拟合范围内直接求多项式; 范围外从端点按端点斜率线性外推 (exp 曲线即每级固定倍率)
+    xc = np.clip(x, lo, hi)
+    inner = np.vander(xc, degree + 1) @ coef.T
+    deriv = coef[:, :-1] * np.arange(degree, 0, -1)
+    slope_lo = np.vander([float(lo)], degree) @ deriv.T
+    slope_hi = np.vander([float(hi)], degree) @ deriv.T
+    # tail_growth 为手动指定的每级倍率, 换算为 log 空间的斜率
+    tail = np.array([c.get('tail_growth', np.nan) for c in curves], dtype=float)
+    has_tail = is_exp & ~np.isnan(tail)
+    slope_hi = np.where(has_tail, np.log(np.where(has_tail, tail, 1)), slope_hi)
+    # 外推不允许反向 (二次项可能让端点斜率为负)
+    slope = np.maximum(np.where(x[:, None] > hi, slope_hi, slope_lo), 0)
+    raw = inner + slope * (x - xc)[:, None]
+
+    # anchor 之后的序号从 anchor 处的实际数值出发外推, 与最后一个已有单位连续
+    anchor = params.get('anchor')
+    if anchor:
+        a = anchor['index']
+        base = np.array([anchor['values'].get(f, np.nan) for f in fields], dtype=float)
+        base = np.where(is_exp, np.log1p(np.maximum(base, 0)), base)
+        after = (x > a)[:, None] & ~np.isnan(base)
+        tail_slope = np.maximum(slope_hi, 0)
+        raw = np.where(after, base + tail_slope * (x - a)[:, None], raw)
+
+    values = np.where(is_exp, np.expm1(raw), raw)
+    values = np.maximum(values, 0)
+
+    factors = np.ones(len(fields))
+    for field, factor in {**params.get('scale', {}), **(scale or {})}.items():
+        if field in fields:
+            factors[fields.index(field)] *= factor
+    values = values * factors
+
+    rounded = _round_sig(values)
+    # 小数列中小于 1 的值 (如 0.5 回血) 保留有效数字, 其余取整
+    fractional = np.array([f in FRACTIONAL_FIELDS for f in fields])
+    values = np.where(fractional & (rounded < 1), rounded, np.round(rounded))
+
+    clamp_lo = np.array([c.get('clamp', [-np.inf, np.inf])[0] for c in curves], dtype=float)
+    clamp_hi = np.array([c.get('clamp', [-np.inf, np.inf])[1] for c in curves], dtype=float)
+    values = np.clip(values, clamp_lo, clamp_hi)
+    return fields, values
+
+
+def family_indices(params, count=None):
+    count = params['count'] if count is None else count
+    return [params['start'] + params['step'] * k for k in range(count)]
+
+
+def generate(params, family, count=None, scale=None, first=None):
+    """返回 [(单位名, 序号, {字段: 值})]"""
+    indices = [i for i in family_indices(params, count) if first is None or i >= first]
+    if not indices:
+        return []
+    fields, values = evaluate(params, indices, scale)
+    result = []
+    for row, i in enumerate(indices):
+        stats = {f: _plain(v) for f, v in zip(fields, values[row])}
+        for field, source in DERIVED_FIELDS.items():
+            if source in stats:
+                stats[field] = stats[source]
+        result.append((FAMILIES[family][0].format(i), i, stats))
+    return result
+
+
+# ---------------------------------------------------------------- 参数文件
+
+def load_params(path=PARAMS_PATH):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f'ERROR: 找不到 {path}, 请先运行 fit')
+        sys.exit(1)
+
+
+def save_params(params, path=PARAMS_PATH):
+    text = json.dumps(params, ensure_ascii=False, indent=2)
+    # 系数数组写在一行, 便于手动查看和修改
+    text = re.sub(r'\[\s+([^\[\]{}]*?)\s+\]', lambda m: '[' + re.sub(r'\s*\n\s*', ' ', m.group(1)) + ']', text)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text + '\n')
+
+
+def _parse_pairs(items, cast):
+    result = {}
+    for item in items or []:
+        key, sep, value = item.partition('=')
+        if not sep:
+            print(f'ERROR: 格式应为 KEY=VALUE: {item}')
+            sys.exit(1)
+        result[key] = cast(value)
+    return result
+
+
+# ---------------------------------------------------------------- 命令
+
+def _load_units():
+    return kv_root(load_kv(npc_path('custom_units.txt')))
+
+
+def cmd_fit(args):
+    units = _load_units()
+    old = {}
+    if os.path.exists(args.params):
+        with open(args.params, encoding='utf-8') as f:
+            old = json.load(f)
+    params = {}
+    print(f'{"族":<8}{"字段":<28}{"最大偏差":>10}  (不含离群点; 曲线只用于生成新单位)')
+    for family in FAMILIES:
+        entries = existing_units(units, family)
+        if len(entries) < 2:
+            print(f'  WARNING: {family} 只有 {len(entries)} 个单位, 跳过')
+            continue
+        params[family] = fit_family(entries, args.degree, old.get(family))
+        outliers = params[family]['outliers']
+        indices = [i for i, _ in entries]
+        # 评估曲线本身的误差, 不经过 anchor
+        fields, values = evaluate({**params[family], 'scale': {}, 'anchor': None}, indices)
+        for k, field in enumerate(fields):
+            actual = np.array([to_number(e.get(field), 0) for _, e in entries], dtype=float)
+            inlier = np.array([field not in outliers.get(str(i), {}) for i in indices])
+            err = np.max(np.abs(values[inlier, k] - actual[inlier]) / np.maximum(np.abs(actual[inlier]), 1))
+            print(f'{family:<8}{field:<28}{err:>9.0%}')
+        for i, fields in outliers.items():
+            print(f'  {family} {i}: 离群点, 不参与拟合 {fields}')
+    save_params(params, args.params)
+    print(f'已写入 {args.params}')
+
+
+def cmd_show(args):
+    params = load_params(args.params)
+    if args.family not in params:
+        print(f'ERROR: 没有 {args.family} 的参数, 可选: {", ".join(params)}')
+        sys.exit(1)
+    rows = generate(params[args.family], args.family, args.count, _parse_pairs(args.scale, float))
+    if not rows:
+        return
+    # 已有单位显示 KV 中的原值 (apply 不会改动它们), 生成的新单位以 * 标记
+    existing = dict(existing_units(_load_units(), args.family))
+    table = []
+    for name, i, stats in rows:
+        if i in existing:
+            stats = {f: _plain(to_number(existing[i].get(f), 0)) for f in stats}
+            table.append((name, stats))
+        else:
+            table.append((name + ' *', stats))
+    fields = list(rows[0][2])
+    widths = [max([len(f)] + [len(str(stats[f])) for _, stats in table]) for f in fields]
+    name_width = max(len(name) for name, _ in table) + 2
+    print(f'{"单位":<{name_width - 2}}' + ''.join(f'{f:>{w + 2}}' for f, w in zip(fields, widths)))
+    for name, stats in table:
+        print(f'{name:<{name_width}}' + ''.join(f'{stats[f]:>{w + 2}}' for f, w in zip(fields, widths)))
+
+
+def apply_curves(changes, params, families, counts=None, firsts=None, scale=None, verbose=True):
+    """
+    把生成的数值记录到 ChangeSet, 返回新增的单位名列表
+    已有单位保持不变; 只有 firsts 中指定了该族时, 序号 >= firsts[族] 的已有单位才按曲线重新生成
+    """
+    counts, firsts = counts or {}, firsts or {}
+    cn_col = changes.field_to_col.get(CN_NAME_FIELD)
+    added = []
+    for family in families:
+        if family not in params:
+            print(f'  WARNING: 没有 {family} 的参数, 跳过')
+            continue
+        first = firsts.get(family)
+        rows = generate(params[family], family, counts.get(family), scale)
+        # 新增单位从该族已有的最后一个单位复制模型、音效等非数值列
+        template = None
+        for i in reversed(family_indices(params[family])):
+            if FAMILIES[family][0].format(i) in changes.entry_rows:
+                template = FAMILIES[family][0].format(i)
+                break
+        written = kept = 0
+        before = len(added)
+        for name, i, stats in rows:
+            if name in changes.entry_rows:
+                if first is None or i < first:
+                    kept += 1
+                    continue
+            else:
+                changes.add_entry(name, template)
+                if cn_col:
+                    changes.set(changes.entry_rows[name], cn_col, FAMILIES[family][1].format(i), name, CN_NAME_FIELD)
+                added.append(name)
+            written += 1
+            for field, value in stats.items():
+                if changes.set_field(name, field, value) is None:
+                    print(f'  WARNING: 找不到字段列 {field}')
+        if verbose:
+            new = len(added) - before
+            print(f'  {family}: 写入 {written} 个单位' + (f' (新增 {new} 个)' if new else '')
+                  + (f', 保留已有 {kept} 个' if kept else ''))
+    return added
+
+
+def cmd_apply(args):
+    from sheet_changes import ChangeSet, finish, open_workbook
+
+    params = load_params(args.params)
+    if not os.path.exists(args.excel):
+        print(f'ERROR: Excel not found: {args.excel}')
+        sys.exit(1)
+    wb = open_workbook(args.excel, args)
+    changes = ChangeSet(wb[SHEET_NAME])
+    apply_curves(changes, params, args.family or list(params), _parse_pairs(args.count, int),
+                 _parse_pairs(args.first, int), _parse_pairs(args.scale, float))
+    if finish(wb, args.excel, [changes], args.dry_run, args.quiet, args.openpyxl_save):
+        print('请运行 yarn dev 重新生成 KV 文件')
+
+
+def cmd_check(args):
+    """
+    自检: 把 custom_units.txt 导入临时工作簿 (kv_import), 再在上面执行
+    1. 默认参数的 apply: 必须没有任何改动 (已有单位一个都不改)
+    2. 每族多生成 3 个单位: 只能新增这些单位, 已有单位不变, 且新单位不低于最后一个已有单位
+    """
+    import tempfile
+    import openpyxl
+    from kv_import import import_kv
+    from sheet_changes import ChangeSet, print_changes
+
+    params = load_params(args.params)
+    units = _load_units()
+    entries = {name: entry for name, entry in units.items() if isinstance(entry, dict)}
+    errors = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'units.xlsx')
+        import_kv(entries, path, SHEET_NAME)
+        wb = openpyxl.load_workbook(path, read_only=True)
+        try:
+            changes = ChangeSet(wb[SHEET_NAME])
+            apply_curves(changes, params, list(params), verbose=False)
+            if changes:
+                print_changes([changes])
+                errors.append(f'apply 改动了 {len(changes)} 个已有单元格')
+
+            changes = ChangeSet(wb[SHEET_NAME])
+            counts = {family: p['count'] + 3 for family, p in params.items()}
+            added = apply_curves(changes, params, list(params), counts, verbose=False)
+            expected = sum(3 + p['count'] - len(existing_units(units, family)) for family, p in params.items())
+            if len(added) != expected:
+                errors.append(f'应新增 {expected} 个单位, 实际新增 {len(added)} 个')
+            added_set = set(added)
+            for row, col, entry, field, old, new in changes.items():
+                if entry not in added_set:
+                    errors.append(f'追加单位时改动了已有单位 {entry}.{field}: {old} -> {new}')
+            for family, p in params.items():
+                last = FAMILIES[family][0].format(p['anchor']['index'])
+                first_new = FAMILIES[family][0].format(p['anchor']['index'] + p['step'])
+                for field, kind in STAT_KINDS.items():
+                    base = p['anchor']['values'].get(field)
+                    col = changes.field_to_col.get(field)
+                    row = changes.entry_rows.get(first_new)
+                    if kind != 'exp' or base is None or col is None or row is None:
+                        continue
+                    value = changes.get(row, col)
+                    if not isinstance(value, (int, float)) or value < _round_sig(base) * 0.95:
+                        errors.append(f'{first_new}.{field} = {value}, 低于 {last} 处的 {base}')
+        finally:
+            wb.close()
+    for err in errors:
+        print(f'  ERROR: {err}')
+    if errors:
+        print(f'{len(errors)} 个错误')
+        sys.exit(1)
+    print(f'检查通过: apply 不改动已有的 {sum(len(existing_units(units, f)) for f in params)} 个单位, '
+          f'追加的单位与最后一个已有单位衔接')
+
+
+def main():
+    from sheet_changes import add_mutation_args
+
+    parser = argparse.ArgumentParser(description='拟合 / 生成单位数值曲线')
+    parser.add_argument('--params', default=PARAMS_PATH, help='曲线参数文件')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('fit', help='从 custom_units.txt 拟合曲线参数')
+    p.add_argument('--degree', type=int, default=DEFAULT_DEGREE, help='log 空间多项式次数')
+    p.set_defaults(func=cmd_fit)
+
+    p = sub.add_parser('show', help='打印某一族生成的数值')
+    p.add_argument('family', choices=list(FAMILIES))
+    p.add_argument('--count', type=int, help='单位个数 (默认按参数文件)')
+    p.add_argument('--scale', action='append', metavar='FIELD=倍率', help='数值倍率, 可重复')
+    p.set_defaults(func=cmd_show)
+
+    p = sub.add_parser('apply', help='把生成的新单位写入 单位表.xlsx (已有单位不变)')
+    p.add_argument('--excel', default=EXCEL_PATH, help='工作簿路径')
+    p.add_argument('--family', action='append', choices=list(FAMILIES), help='只更新指定族, 可重复')
+    p.add_argument('--count', action='append', metavar='族=个数', help='如 wave=50, 可重复')
+    p.add_argument('--from', dest='first', action='append', metavar='族=序号',
+                   help='序号不小于此值的已有单位也按曲线重新生成 (会覆盖手调的数值)')
+    p.add_argument('--scale', action='append', metavar='FIELD=倍率', help='生成数值的倍率, 可重复')
+    add_mutation_args(p)
+    p.set_defaults(func=cmd_apply)
+
+    p = sub.add_parser('check', help='自检: 在由 custom_units.txt 导入的临时工作簿上 apply 不产生改动')
+    p.set_defaults(func=cmd_check)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,261 @@
+"""
+修炼商店 (UpgradeSystem.ts) 的境界价格 / 进度分析: 按波次金币收入求最快的购买顺序, 找出价格曲线卡住玩家的位置
+
+数据来源:
+- UpgradeSystem.ts 的 UPGRADE_TIER_CONFIG (每境界 8 个槽位, cost_per_slot) 和 GetMaxTierForRank (境界上限 = 阶位 + N)
+- RankSystem.ts 的升阶信仰消耗 (GetRankUpCost) 和最高阶位
+- WaveManager.ts 的出怪表 (wave_load) + custom_units.txt 的 CustomDrop_Coin / CustomDrop_Faith;
+  与 EconomySystem 相同, 没有任何掉落的单位按 10 金币计算; 每波的掉落在该波结束时到账
+
+模型:
+- 每个境界必须买满 8 个槽位才能突破, 突破还要求 境界 ≤ 阶位上限; 信仰够时立即升阶 (不考虑等级上限)
+- 战力 = 已购槽位数值 / 该属性在 1 境的数值 之和 (1 境每个槽位记 1 点), --weight 可调整各属性的权重;
+  同一境界价格相同, 因此先买权重高的槽位
+- 动态规划: 状态为 (波次, 已购槽位数) (金币余额和境界都由这两者决定), 记忆化求到达目标战力的最早波次;
+  每个境界完成时的战力都作为一个目标
+- 卡点: 连续 --stall 波以上买不了任何槽位的区间, 原因分为金币不足和阶位上限
+
+用法:
+  python scripts/upgrade_plan.py
+  python scripts/upgrade_plan.py --cost 4=5000 --cost 5=15000        # 价格变体, 与当前价格对比
+  python scripts/upgrade_plan.py --scale 1.5 --farm 500 --players 2
+"""
+import argparse
+import os
+import re
+import sys
+
+from kv_utils import BASE_DIR, KVError, load_kv, kv_root, npc_path, to_number
+from wave_load import parse_wave_manager, wave_schedule
+
+SYSTEMS_DIR = os.path.join(BASE_DIR, 'game', 'scripts', 'src', 'systems')
+UPGRADE_SYSTEM_TS = os.path.join(SYSTEMS_DIR, 'UpgradeSystem.ts')
+RANK_SYSTEM_TS = os.path.join(SYSTEMS_DIR, 'RankSystem.ts')
+
+SLOTS_PER_TIER = 8
+DEFAULT_COIN = 10
+
+_TIER_ENTRY = re.compile(r"tier:\s*(\d+),\s*name:\s*'([^']*)',\s*cost_per_slot:\s*([\d.]+),\s*slots:\s*\[(.*?)\]", re.S)
+_SLOT_ENTRY = re.compile(r"stat_type:\s*'(\w+)',\s*name:\s*'([^']*)',\s*value:\s*([\d.]+)")
+
+
+def parse_tiers(path=UPGRADE_SYSTEM_TS):
+    """返回 (tiers, tier_offset): tiers 为 [{'tier', 'name', 'cost', 'slots': [(属性, 名称, 数值)]}]"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    tiers = [{'tier': int(tier), 'name': name, 'cost': float(cost),
+              'slots': [(stat, label, float(value)) for stat, label, value in _SLOT_ENTRY.findall(slots)]}
+             for tier, name, cost, slots in _TIER_ENTRY.findall(text)]
+    if not tiers:
+        raise ValueError(f'{path} 中找不到 UPGRADE_TIER_CONFIG')
+    m = re.search(r'GetMaxTierForRank\(rank: number\): number \{\s*return rank \+ (\d+);', text)
+    if not m:
+        raise ValueError(f'{path} 中找不到 GetMaxTierForRank')
+    return sorted(tiers, key=lambda t: t['tier']), int(m.group(1))
+
+
+def parse_rank_rules(path=RANK_SYSTEM_TS):
+    """返回 (每阶信仰系数, 最高阶位): 升到 r+1 阶消耗 系数 × (r + 1)"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    cost = re.search(r'GetRankUpCost\(currentRank: number\): number \{\s*return (\d+) \* \(currentRank \+ 1\);', text)
+    top = re.search(r'if \(currentRank >= (\d+)\)', text)
+    if not cost or not top:
+        raise ValueError(f'{path} 中找不到 GetRankUpCost / 最高阶位')
+    return int(cost.group(1)), int(top.group(1))
+
+
+def wave_income(units, players=1, farm=0.0):
+    """[(波次, 结束时间, 金币, 信仰)]; 多人时掉落按人数平分, farm 为每波额外金币 (练功房等)"""
+    config, waves, final_guards = parse_wave_manager()
+    period = config['SPAWN_DURATION'] + config['BREAK_TIME']
+    income = []
+    for number, start, spawns in wave_schedule(config, waves, final_guards):
+        coin = faith = 0.0
+        for _, name in spawns:
+            unit = units.get(name) or {}
+            drops = [to_number(unit.get(k), 0) for k in
+                     ('CustomDrop_Coin', 'CustomDrop_Faith', 'HaveLevel', 'CustomDrop_DefenderPoints')]
+            coin += drops[0] if any(drops) else DEFAULT_COIN
+            faith += drops[1]
+        income.append((number, start + period, coin / players + farm, faith / players))
+    return income
+
+
+def slot_order(tiers, weights):
+    """按购买顺序展开所有槽位: [(境界序号, 属性, 名称, 价格, 战力)]; 同一境界内战力高的在前"""
+    base = {}
+    for stat, _, value in tiers[0]['slots']:
+        base.setdefault(stat, value)
+    order = []
+    for index, tier in enumerate(tiers):
+        slots = [(index, stat, label, tier['cost'],
+                  value / base.get(stat, value or 1) * weights.get(stat, 1.0)) for stat, label, value in tier['slots']]
+        order += sorted(slots, key=lambda s: -s[4])
+    return order
+
+
+class Plan:
+    """给定价格和收入的进度模型; solve() 为记忆化的动态规划 (memo)"""
+
+    def __init__(self, tiers, tier_offset, rank_rules, income, weights):
+        self.tiers = tiers
+        self.order = slot_order(tiers, weights)
+        self.cost_prefix = [0.0]
+        self.power_prefix = [0.0]
+        for _, _, _, cost, power in self.order:
+            self.cost_prefix.append(self.cost_prefix[-1] + cost)
+            self.power_prefix.append(self.power_prefix[-1] + power)
+        self.income = income
+        self.coin_prefix, self.cap = [], []
+        coin = faith = 0.0
+        rank = 0
+        rank_cost, max_rank = rank_rules
+        for _, _, c, f in income:
+            coin += c
+            faith += f
+            # 信仰够时立即升阶 (升阶消耗累计)
+            while rank < max_rank and faith >= rank_cost * (rank + 1):
+                faith -= rank_cost * (rank + 1)
+                rank += 1
+            self.coin_prefix.append(coin)
+            # 阶位上限内最多能买到的槽位数: 上限境界的 8 个槽位都可以买, 但不能突破
+            self.cap.append(min(len(self.order), (rank + tier_offset) * SLOTS_PER_TIER))
+        self.memo = {}
+
+    def affordable(self, r, n):
+        """第 r 波结束时 (已购 n 个) 最多能买到第几个槽位"""
+        limit = self.cap[r]
+        budget = self.coin_prefix[r]
+        m = n
+        while m < limit and self.cost_prefix[m + 1] <= budget:
+            m += 1
+        return m
+
+    def solve(self, r, n, target):
+        """从第 r 波 (已购 n 个) 开始, 达到 target 战力的最早波次下标; 无法达到时为 None"""
+        key = (r, n, target)
+        if key in self.memo:
+            return self.memo[key]
+        best = None
+        if r < len(self.income):
+            for m in range(self.affordable(r, n), n - 1, -1):
+                if self.power_prefix[m] >= target:
+                    best = r
+                    break
+                later = self.solve(r + 1, m, target)
+                if later is not None and (best is None or later < best):
+                    best = later
+        self.memo[key] = best
+        return best
+
+    def milestones(self):
+        """[(境界名, 完成时的战力, 最早完成的波次下标或 None)]"""
+        result = []
+        for index, tier in enumerate(self.tiers):
+            power = self.power_prefix[(index + 1) * SLOTS_PER_TIER]
+            result.append((tier['name'], power, self.solve(0, 0, power)))
+        return result
+
+    def timeline(self):
+        """尽早购买时每波结束后的 (已购槽位数, 金币余额, 下一个槽位受阻的原因)"""
+        rows, n = [], 0
+        for r in range(len(self.income)):
+            n = self.affordable(r, n)
+            if n >= len(self.order):
+                reason = 'done'
+            elif n >= self.cap[r]:
+                reason = 'rank'
+            else:
+                reason = 'coin'
+            rows.append((n, self.coin_prefix[r] - self.cost_prefix[n], reason))
+        return rows
+
+    def stalls(self, min_waves):
+        """连续 min_waves 波以上没有购买的区间: [(开始波次下标, 结束波次下标, 原因, 境界序号)]"""
+        found, start, last = [], None, 0
+        rows = self.timeline()
+        for r, (n, _, reason) in enumerate(rows + [(None, 0, '')]):
+            if n is not None and n == last and reason != 'done':
+                start = r if start is None else start
+                continue
+            if start is not None and r - start >= min_waves:
+                found.append((start, r - 1, rows[start][2], min(last // SLOTS_PER_TIER, len(self.tiers) - 1)))
+            start = None
+            last = n if n is not None else last
+        return found
+
+
+def _wave_label(plan, r):
+    if r is None:
+        return '达不到'
+    number, end, _, _ = plan.income[r]
+    return f'第 {number} 波 ({end / 60:.0f} 分)'
+
+
+def print_plan(title, plan, stall):
+    print(title)
+    total_income = plan.coin_prefix[-1] if plan.coin_prefix else 0
+    print(f'  全部 {len(plan.income)} 波金币 {total_income:,.0f}, 买满所有境界需要 {plan.cost_prefix[-1]:,.0f}')
+    print(f'  {"境界":<6}{"单价":>10}{"整境价格":>12}{"战力":>10}  最早完成')
+    for (name, power, r), tier in zip(plan.milestones(), plan.tiers):
+        print(f'  {name:<6}{tier["cost"]:>10,.0f}{tier["cost"] * SLOTS_PER_TIER:>12,.0f}{power:>10.0f}  '
+              f'{_wave_label(plan, r)}')
+    stalls = plan.stalls(stall)
+    if stalls:
+        print(f'  卡点 (连续 {stall} 波以上无法购买):')
+        for start, end, reason, tier in stalls:
+            cause = '阶位上限' if reason == 'rank' else '金币不足'
+            n = plan.timeline()[end][0]
+            need = plan.cost_prefix[min(n + 1, len(plan.order))] - plan.cost_prefix[n] if reason == 'coin' else 0
+            extra = f', 下一个槽位 {need:,.0f}' if need else ''
+            print(f'    {_wave_label(plan, start)} ~ {_wave_label(plan, end)}: {plan.tiers[tier]["name"]} {cause}{extra}')
+    else:
+        print(f'  没有连续 {stall} 波以上的卡点')
+
+
+def _parse_pairs(items, name):
+    pairs = {}
+    for item in items:
+        key, sep, value = item.partition('=')
+        try:
+            pairs[key] = float(value)
+        except ValueError:
+            sep = ''
+        if not sep:
+            raise ValueError(f'无效的 --{name} {item}')
+    return pairs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='修炼商店境界价格与金币收入的进度分析')
+    parser.add_argument('--cost', action='append', default=[], metavar='境界=单价', help='覆盖某境界的槽位单价 (可重复)')
+    parser.add_argument('--scale', type=float, default=1.0, help='所有单价的倍率')
+    parser.add_argument('--weight', action='append', default=[], metavar='属性=权重', help='战力中各属性的权重 (默认 1)')
+    parser.add_argument('--players', type=int, default=1, help='平分掉落的玩家数')
+    parser.add_argument('--farm', type=float, default=0, help='每波额外的金币 (练功房等)')
+    parser.add_argument('--stall', type=int, default=2, help='连续多少波无法购买算作卡点')
+    args = parser.parse_args()
+
+    try:
+        tiers, tier_offset = parse_tiers()
+        rank_rules = parse_rank_rules()
+        income = wave_income(kv_root(load_kv(npc_path('custom_units.txt'))), max(1, args.players), args.farm)
+        costs = {int(k): v for k, v in _parse_pairs(args.cost, 'cost').items()}
+        weights = _parse_pairs(args.weight, 'weight')
+    except (OSError, KVError, ValueError) as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
+
+    print(f'阶位上限: 境界 ≤ 阶位 + {tier_offset}; 升阶信仰 {rank_rules[0]} × (阶位 + 1), 最高 {rank_rules[1]} 阶')
+    print()
+    baseline = Plan(tiers, tier_offset, rank_rules, income, weights)
+    print_plan('当前价格 (UpgradeSystem.ts)', baseline, args.stall)
+    if costs or args.scale != 1.0:
+        variant = [dict(tier, cost=costs.get(tier['tier'], tier['cost']) * args.scale) for tier in tiers]
+        print()
+        print_plan('变体价格', Plan(variant, tier_offset, rank_rules, income, weights), args.stall)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+检查 excels/ 下的工作簿是否符合表结构约定, 不生成任何文件 (适合放在 git hook / gulp 流程中)
+
+- sheet_schemas 中登记的 sheet 必须存在, Row 2 缺少的 KV 字段报错, 多出的字段只提示
+- `Xxx[{]` / `[}]` 块标记必须成对
+- 条目名 (第 1 列) 不能重复
+
+只依赖标准库 (通过 workbook_reader 的 xml 后端读取), 有错误时以状态码 1 退出
+
+用法:
+  python scripts/validate_sheets.py
+  python scripts/validate_sheets.py excels/单位表.xlsx
+"""
+import argparse
+import os
+import sys
+
+from sheet_schemas import WORKBOOK_SCHEMAS
+from sheet_utils import DATA_START_ROW, EXCELS_DIR, KEY_ROW, is_ignored_sheet, list_workbooks
+from workbook_reader import WorkbookError, open_workbook
+
+
+def check_key_row(key_row):
+    """检查块标记是否成对, 返回错误列表"""
+    errors = []
+    depth = 0
+    for c, key in enumerate(key_row, start=1):
+        key = str(key).strip() if key is not None else ''
+        if key.endswith('[{]'):
+            depth += 1
+        elif key == '[}]':
+            depth -= 1
+            if depth < 0:
+                errors.append(f'第 {c} 列的 [}}] 没有对应的块开始')
+                depth = 0
+    if depth > 0:
+        errors.append(f'有 {depth} 个块没有以 [}}] 结束')
+    return errors
+
+
+def check_sheet(rows, columns=None):
+    """rows 为按行的值序列 (可以是迭代器), 返回 (errors, warnings)"""
+    errors, warnings = [], []
+    seen = {}
+    key_row = ()
+    for r, row in enumerate(rows, start=1):
+        if r == KEY_ROW:
+            key_row = row
+            continue
+        if r < DATA_START_ROW or not row:
+            continue
+        name = row[0]
+        if name is None or str(name).strip() == '':
+            continue
+        name = str(name).strip()
+        if name in seen:
+            errors.append(f'条目 {name} 重复 (第 {seen[name]} 行和第 {r} 行)')
+        else:
+            seen[name] = r
+
+    errors[:0] = check_key_row(key_row)
+    if columns is not None:
+        keys = {str(k).strip() for k in key_row if k is not None and str(k).strip() != ''}
+        expected = {key for _, key in columns if key != 'name'}
+        missing = sorted(k for k in expected - keys if not k.isdigit() and k != '[}]')
+        extra = sorted(k for k in keys - expected if not k.isdigit() and k not in ('[}]', 'name'))
+        if missing:
+            errors.insert(0, f'Row {KEY_ROW} 缺少字段: {", ".join(missing)}')
+        if extra:
+            warnings.append(f'Row {KEY_ROW} 有 sheet_schemas 未登记的字段: {", ".join(extra)}')
+    return errors, warnings
+
+
+def validate_workbook(path):
+    """返回 [(sheet, errors, warnings)]"""
+    workbook = os.path.basename(path)
+    schemas = dict(WORKBOOK_SCHEMAS.get(workbook, []))
+    results = []
+    with open_workbook(path) as wb:
+        for sheet, _ in WORKBOOK_SCHEMAS.get(workbook, []):
+            if sheet not in wb.sheetnames:
+                results.append((sheet, [f'找不到 sheet {sheet}'], []))
+        for sheet in wb.sheetnames:
+            if is_ignored_sheet(sheet):
+                continue
+            errors, warnings = check_sheet(wb.iter_rows(sheet), schemas.get(sheet))
+            results.append((sheet, errors, warnings))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='检查工作簿表头和条目名')
+    parser.add_argument('workbooks', nargs='*', help='默认检查 excels/ 下的所有工作簿')
+    parser.add_argument('--strict', action='store_true', help='提示也按错误处理')
+    args = parser.parse_args()
+
+    error_count = 0
+    for path in args.workbooks or list_workbooks(EXCELS_DIR):
+        workbook = os.path.basename(path)
+        try:
+            results = validate_workbook(path)
+        except (WorkbookError, OSError) as e:
+            print(f'  WARNING: 跳过 {workbook}: {e}')
+            continue
+        for sheet, errors, warnings in results:
+            for msg in errors:
+                print(f'  ERROR: {workbook} / {sheet}: {msg}')
+            for msg in warnings:
+                print(f'  {"ERROR" if args.strict else "WARNING"}: {workbook} / {sheet}: {msg}')
+            error_count += len(errors) + (len(warnings) if args.strict else 0)
+
+    if error_count:
+        print(f'发现 {error_count} 个问题')
+        sys.exit(1)
+    print('检查通过')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,342 @@
+"""
+按波次估算同时存活的怪物数量 (服务器负载), 在试玩前发现会堆怪卡顿的波次
+
+出怪时间表:
+- 默认读取 game/scripts/src/systems/WaveManager.ts 中的 WAVE_CONFIG / WAVE_CONFIGS
+  (准备期后每波出怪 SPAWN_DURATION 秒, 每秒每条出生路线 1 只; BOSS 波出完小兵后出 BOSS;
+  最终 BOSS 波为 BOSS + 护卫)
+- --rounds 时改为读取 round_settings.txt (每 Interval 秒出 Count 只, 持续 SPAWN_DURATION 秒)
+
+击杀模型:
+- 单位按 custom_units.txt 的生命和护甲折算为有效生命 (护甲减伤公式与 Dota 相同)
+- 玩家输出为与怪物数值无关的绝对战力曲线:
+  默认取 hero_stats 的英雄期望普攻 DPS (跳过模板 / 测试英雄后取平均) × --players,
+  等级和神器阶级按波次线性对应 (第 1 波 1 级 0 阶, 最后一波满级最高阶);
+  --dps-table 时改为读取 CSV (wave,dps) 中每波的玩家总 DPS (如试玩统计)
+- 每个场景为该曲线的倍数 (默认 weak=0.5 / par=1 / strong=2); 表中同时列出 par 场景 DPS 相对
+  "刚好跟上"的需求 DPS (该波总有效生命 / 波次间隔) 的比值, 小于 1 即英雄落后于波次血量曲线
+- 输出同时打在最早出生的 --targets 个单位上 (1 为集火, 更大的值近似 AOE)
+
+离散事件模拟: 事件队列 (heapq) 中只有出怪和 DPS 变化两类事件, 两个事件之间按当前 DPS
+直接算出下一次击杀的时间, 不按帧步进。超过 --budget 的波次标记出来, --strict 时以状态码 1 退出
+
+用法:
+  python scripts/wave_load.py
+  python scripts/wave_load.py --scenario weak=0.3 --scenario par=1 --budget 150 --targets 3
+  python scripts/wave_load.py --dps-table playtest_dps.csv    # 使用实测的每波玩家 DPS
+  python scripts/wave_load.py --csv .cache/wave_load.csv      # 输出存活数量时间序列
+"""
+import argparse
+import csv
+import heapq
+import os
+import re
+import sys
+from collections import deque
+
+from kv_utils import BASE_DIR, KVError, load_kv, kv_root, npc_path, to_number
+
+WAVE_MANAGER_TS = os.path.join(BASE_DIR, 'game', 'scripts', 'src', 'systems', 'WaveManager.ts')
+
+DEFAULT_SCENARIOS = {'weak': 0.5, 'par': 1.0, 'strong': 2.0}
+DEFAULT_BUDGET = 120
+# 与 GameConfig 中 SetCustomGameTeamMaxPlayers(GOODGUYS, 4) 一致
+DEFAULT_PLAYERS = 4
+# CreepThink 最短 0.5 秒执行一次, 用于估算每秒的 think 调用数
+THINK_INTERVAL = 0.5
+
+_CONFIG_NUMBER = re.compile(r'\b(\w+):\s*(-?[\d.]+),')
+_WAVE_ENTRY = re.compile(
+    r"\{\s*waveNumber:\s*(\d+),\s*type:\s*WaveType\.(\w+),\s*unitName:\s*'([^']*)'"
+    r"(?:,\s*bossName:\s*'([^']*)')?\s*\}")
+
+
+def armor_multiplier(armor):
+    """Dota 护甲减伤: 1 - 0.06a / (1 + 0.06|a|)"""
+    return 1 - 0.06 * armor / (1 + 0.06 * abs(armor))
+
+
+def effective_hp(unit):
+    hp = to_number(unit.get('StatusHealth'), 0)
+    armor = to_number(unit.get('ArmorPhysical'), 0)
+    return hp / armor_multiplier(armor)
+
+
+# ---------------------------------------------------------------- 出怪时间表
+
+def parse_wave_manager(path=WAVE_MANAGER_TS):
+    """返回 (config, waves, final_guards): config 为 WAVE_CONFIG 数值项, waves 为 [(波次, 类型, 小兵, BOSS)]"""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    m = re.search(r'export const WAVE_CONFIG = \{(.*?)\n\}', text, re.S)
+    if not m:
+        raise ValueError(f'{path} 中找不到 WAVE_CONFIG')
+    body = m.group(1)
+    config = {k: float(v) for k, v in _CONFIG_NUMBER.findall(body)}
+    points = re.search(r'SPAWN_POINTS:\s*\[(.*?)\]', body, re.S)
+    config['LANES'] = len(re.findall(r"'[^']*'", points.group(1))) if points else 1
+
+    waves = [(int(n), kind, unit, boss or '') for n, kind, unit, boss in _WAVE_ENTRY.findall(text)]
+
+    # SpawnFinalBossWave: BOSS 周围 guardPositions 个护卫
+    final_guards = []
+    m = re.search(r'private SpawnFinalBossWave\(.*?\n    \}', text, re.S)
+    if m:
+        positions = re.search(r'guardPositions = \[(.*?)\];', m.group(0), re.S)
+        unit = re.search(r"CreateUnitByName\(\s*'([^']+)'", m.group(0))
+        if positions and unit:
+            final_guards = [unit.group(1)] * positions.group(1).count('Vector(')
+    return config, waves, final_guards
+
+
+def wave_schedule(config, waves, final_guards):
+    """返回 [(波次, 开始时间, [(出生时间, 单位名)])]"""
+    period = config['SPAWN_DURATION'] + config['BREAK_TIME']
+    lanes = int(config.get('LANES', 1)) * int(config.get('SPAWN_RATE', 1))
+    schedule = []
+    for number, kind, unit, boss in sorted(waves):
+        if number > config.get('TOTAL_WAVES', number):
+            continue
+        start = config['PREP_TIME'] + (number - 1) * period
+        spawns = []
+        if kind == 'FinalBoss':
+            spawns += [(start, boss)] if boss else []
+            spawns += [(start, guard) for guard in final_guards]
+        else:
+            for tick in range(int(config['SPAWN_DURATION'])):
+                spawns += [(start + tick, unit)] * lanes
+            if kind == 'Boss' and boss:
+                spawns.append((start + config['SPAWN_DURATION'], boss))
+        schedule.append((number, start, spawns))
+    return schedule
+
+
+def round_schedule(config, rounds):
+    """round_settings.txt: 每 Interval 秒出 Count 只, 出怪时长与波次相同"""
+    period = config['SPAWN_DURATION'] + config['BREAK_TIME']
+    schedule = []
+    names = sorted(rounds, key=lambda n: int(re.sub(r'\D', '', n) or 0))
+    for k, name in enumerate(names):
+        entry = rounds[name]
+        count = int(to_number(entry.get('Count'), 0))
+        interval = to_number(entry.get('Interval'), 1) or 1
+        start = config['PREP_TIME'] + k * period
+        spawns = []
+        t = 0.0
+        while t < config['SPAWN_DURATION']:
+            spawns += [(start + t, entry.get('Name', ''))] * count
+            t += interval
+        schedule.append((k + 1, start, spawns))
+    return schedule
+
+
+# ---------------------------------------------------------------- 模拟
+
+def par_dps(schedule, ehp, period):
+    """{波次: 刚好在一个波次间隔内清完该波的 DPS}"""
+    return {number: sum(ehp.get(u, 0) for _, u in spawns) / period for number, _, spawns in schedule}
+
+
+def hero_dps_curve(numbers, players=DEFAULT_PLAYERS):
+    """{波次: 玩家总 DPS}, 由 hero_stats 的英雄成长表得到, 与怪物数值无关"""
+    from gen_artifact_tables import ARTIFACTS_KV, build_artifact_tables
+    from hero_stats import HEROES_KV, artifact_totals, compute, expected_dps, hero_params, is_test_hero, progression
+
+    params = {n: p for n, p in hero_params(kv_root(load_kv(HEROES_KV))).items() if not is_test_hero(n)}
+    if not params:
+        raise ValueError(f'{HEROES_KV} 中没有可用的英雄')
+    stats, _, _, _, errors = build_artifact_tables(kv_root(load_kv(ARTIFACTS_KV)))
+    if errors:
+        raise ValueError(f'神器表有误: {errors[0]}')
+    names, table = compute(params, artifact_totals(stats))
+    dps = expected_dps(params, names, table).mean(axis=0)  # (等级, 阶级)
+    numbers = sorted(numbers)
+    levels, tiers = progression(dps.shape[0], dps.shape[1], len(numbers))
+    return {w: players * float(dps[level, tier]) for w, level, tier in zip(numbers, levels, tiers)}
+
+
+def read_dps_table(path):
+    """CSV (wave,dps) -> {波次: 玩家总 DPS}"""
+    table = {}
+    with open(path, encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            try:
+                table[int(row['wave'])] = float(row['dps'])
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f'{path}: 需要 wave,dps 两列数值, 无法解析 {row}')
+    return table
+
+
+def simulate(schedule, ehp, dps_by_wave, targets=1):
+    """
+    返回 (每波统计, 时间序列)
+    每波统计: {波次: {'peak': 峰值存活, 'peak_time': 时间, 'carry': 下一波开始时的存活数, 'clear': 清完的时间}}
+    时间序列: [(时间, 存活数)]
+    """
+    # 事件: (时间, 顺序, 类型, 数据); 类型 0 = DPS 变化 (同一时刻先于出怪处理), 1 = 出怪
+    events = []
+    seq = 0
+    for number, start, spawns in schedule:
+        heapq.heappush(events, (start, seq, 0, number))
+        seq += 1
+        for t, unit in spawns:
+            heapq.heappush(events, (t, seq, 1, unit))
+            seq += 1
+
+    alive = deque()   # 每项 [剩余有效生命, 所属波次]
+    now, dps, wave = 0.0, 0.0, None
+    stats = {number: {'peak': 0, 'peak_time': start, 'carry': 0, 'clear': None}
+             for number, start, _ in schedule}
+    series = [(0.0, 0)]
+
+    def advance(until):
+        """按当前 DPS 推进到 until, 期间依次结算击杀"""
+        nonlocal now
+        while alive and dps > 0:
+            k = min(targets, len(alive))
+            per_target = dps / k
+            soonest = min(alive[i][0] for i in range(k))
+            t_kill = now + soonest / per_target
+            if t_kill > until:
+                break
+            # 只有队首 k 个单位受到伤害, 也只有它们会死亡: 逐个弹出, 存活的按原顺序放回队首
+            survivors = []
+            for _ in range(k):
+                unit = alive.popleft()
+                unit[0] -= soonest
+                if unit[0] > 1e-9:
+                    survivors.append(unit)
+            alive.extendleft(reversed(survivors))
+            now = t_kill
+            series.append((now, len(alive)))
+            if not alive and wave is not None and stats[wave]['clear'] is None:
+                stats[wave]['clear'] = now
+        if alive and dps > 0:
+            k = min(targets, len(alive))
+            for i in range(k):
+                alive[i][0] -= dps / k * (until - now)
+        now = until
+
+    while events:
+        t, _, kind, data = heapq.heappop(events)
+        advance(t)
+        if kind == 0:
+            if wave is not None:
+                stats[wave]['carry'] = len(alive)
+            wave = data
+            dps = dps_by_wave.get(wave, dps)
+            continue
+        hp = ehp.get(data, 0.0)
+        if hp <= 0:
+            continue
+        alive.append([hp, wave])
+        series.append((now, len(alive)))
+        if len(alive) > stats[wave]['peak']:
+            stats[wave]['peak'] = len(alive)
+            stats[wave]['peak_time'] = now
+    advance(float('inf') if dps > 0 else now)
+    return stats, series
+
+
+# ---------------------------------------------------------------- CLI
+
+def _parse_scenarios(items):
+    if not items:
+        return dict(DEFAULT_SCENARIOS)
+    scenarios = {}
+    for item in items:
+        name, sep, factor = item.partition('=')
+        if not sep:
+            print(f'ERROR: 场景格式应为 名称=倍率: {item}')
+            sys.exit(1)
+        scenarios[name] = float(factor)
+    return scenarios
+
+
+def main():
+    parser = argparse.ArgumentParser(description='估算各波次的同时存活怪物数量')
+    parser.add_argument('--rounds', action='store_true', help='使用 round_settings.txt 而不是 WaveManager.ts 的波次表')
+    parser.add_argument('--scenario', action='append', metavar='名称=倍率',
+                        help='玩家输出相对玩家战力曲线的倍率, 可重复 (默认 weak=0.5 par=1 strong=2)')
+    parser.add_argument('--players', type=int, default=DEFAULT_PLAYERS, help='玩家人数 (英雄战力曲线的倍数)')
+    parser.add_argument('--dps-table', metavar='CSV', help='每波玩家总 DPS 表 (wave,dps), 代替英雄战力曲线')
+    parser.add_argument('--budget', type=int, default=DEFAULT_BUDGET, help='同时存活单位的上限')
+    parser.add_argument('--targets', type=int, default=1, help='同时承受输出的单位数 (1 为集火)')
+    parser.add_argument('--csv', help='输出存活数量时间序列 (scenario, time, alive)')
+    parser.add_argument('--strict', action='store_true', help='有波次超出上限时以状态码 1 退出')
+    args = parser.parse_args()
+
+    try:
+        config, waves, final_guards = parse_wave_manager()
+        units = kv_root(load_kv(npc_path('custom_units.txt')))
+        if args.rounds:
+            schedule = round_schedule(config, kv_root(load_kv(npc_path('round_settings.txt'))))
+        else:
+            schedule = wave_schedule(config, waves, final_guards)
+        numbers = [number for number, _, _ in schedule]
+        if args.dps_table:
+            player = read_dps_table(args.dps_table)
+        else:
+            player = hero_dps_curve(numbers, args.players)
+    except (OSError, ValueError, KVError) as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
+
+    ehp = {name: effective_hp(entry) for name, entry in units.items() if isinstance(entry, dict)}
+    missing = sorted({u for _, _, spawns in schedule for _, u in spawns if u not in ehp})
+    for name in missing:
+        print(f'  WARNING: custom_units 中找不到 {name}, 按 0 生命计算')
+
+    missing = [n for n in numbers if n not in player]
+    if missing:
+        print(f'ERROR: 玩家 DPS 表缺少第 {", ".join(map(str, missing))} 波')
+        sys.exit(1)
+
+    period = config['SPAWN_DURATION'] + config['BREAK_TIME']
+    need = par_dps(schedule, ehp, period)
+    scenarios = _parse_scenarios(args.scenario)
+
+    results = {}
+    rows = []
+    for name, factor in scenarios.items():
+        stats, series = simulate(schedule, ehp, {w: d * factor for w, d in player.items()}, max(1, args.targets))
+        results[name] = stats
+        rows += [(name, round(t, 2), n) for t, n in series]
+
+    header = (f'{"波次":<6}{"出怪":>6}{"玩家 DPS":>12}{"DPS/需求":>10}'
+              + ''.join(f'{name + " 峰值":>14}{"残留":>6}' for name in scenarios))
+    print(header)
+    flagged = []
+    for number, start, spawns in schedule:
+        ratio = player[number] / need[number] if need[number] > 0 else float('inf')
+        line = f'{number:<8}{len(spawns):>6}{player[number]:>14.3g}{ratio:>10.2g}'
+        for name in scenarios:
+            s = results[name][number]
+            mark = '!' if s['peak'] > args.budget else ' '
+            line += f'{s["peak"]:>15}{mark}{s["carry"]:>5}'
+            if s['peak'] > args.budget:
+                flagged.append((name, number, s))
+        print(line)
+
+    print(f'\nDPS/需求 < 1 表示玩家输出跟不上该波的有效生命 (需求 = 总有效生命 / 波次间隔 {period:g}s)')
+    print(f'上限 {args.budget} 个单位, 每秒 think 估算 = 存活数 / {THINK_INTERVAL}')
+    for name, number, s in flagged:
+        print(f'  {name}: 第 {number} 波峰值 {s["peak"]} 个 (t={s["peak_time"]:.0f}s, '
+              f'约 {s["peak"] / THINK_INTERVAL:.0f} 次 think/s)')
+    if not flagged:
+        print('  所有场景都未超出上限')
+
+    if args.csv:
+        os.makedirs(os.path.dirname(os.path.abspath(args.csv)), exist_ok=True)
+        with open(args.csv, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['scenario', 'time', 'alive'])
+            writer.writerows(rows)
+        print(f'时间序列已写入 {args.csv}')
+
+    if flagged and args.strict:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
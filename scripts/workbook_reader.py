@@ -0,0 +1,418 @@
+"""
+工作簿只读访问层: 同一接口, 可替换的读取后端
+
+  xml       zipfile + iterparse 流式读取 sheet XML, 共享字符串表在第一次遇到字符串单元格时才解析;
+            逐行读取、读完即释放, 大表内存占用不随行数增长 (仅依赖标准库)
+  openpyxl  openpyxl read-only 模式
+  xlrd      旧版 BIFF .xls (如 资源.xls), 需要安装 xlrd
+
+各后端返回的单元格值保持一致: 空单元格为 None, 整数为 int, 小数为 float, 布尔为 bool;
+xml / xlrd 后端不做日期格式转换 (配置表中没有日期列)
+
+用法:
+    with open_workbook('excels/单位表.xlsx') as wb:       # 按文件类型自动选择最快的可用后端
+        for row in wb['custom_units'].iter_rows(values_only=True):
+            ...
+    python scripts/workbook_reader.py dump excels/资源.xls Sheet1
+    python scripts/workbook_reader.py bench                    # 在 excels/ 下的工作簿上比较各后端
+"""
+import abc
+import argparse
+import importlib.util
+import os
+import sys
+import time
+import tracemalloc
+import unicodedata
+import zipfile
+import xml.etree.ElementTree as ET
+
+from sheet_utils import NS_MAIN, _shared_strings_path, _sheet_xml_paths, list_workbooks
+
+XLSX_MAGIC = b'PK\x03\x04'
+XLS_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+LFS_MAGIC = b'version https://git-lfs'
+
+_C = NS_MAIN + 'c'
+_V = NS_MAIN + 'v'
+_T = NS_MAIN + 't'
+_IS = NS_MAIN + 'is'
+_ROW = NS_MAIN + 'row'
+_RPH = NS_MAIN + 'rPh'
+_SI = NS_MAIN + 'si'
+_SHEET_DATA = NS_MAIN + 'sheetData'
+_DIMENSION = NS_MAIN + 'dimension'
+
+
+class WorkbookError(ValueError):
+    pass
+
+
+def detect_format(path):
+    """按文件头判断格式: 'xlsx' / 'xls'; 不认识的文件 (包括 Git LFS 指针) 抛出 WorkbookError"""
+    with open(path, 'rb') as f:
+        head = f.read(len(LFS_MAGIC))
+    if head.startswith(XLSX_MAGIC):
+        return 'xlsx'
+    if head.startswith(XLS_MAGIC):
+        return 'xls'
+    if head.startswith(LFS_MAGIC):
+        raise WorkbookError(f'{os.path.basename(path)} 是 Git LFS 指针文件, 请先执行 git lfs pull')
+    raise WorkbookError(f'无法识别的工作簿格式: {path}')
+
+
+def column_index(letters):
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+def _number(text):
+    # 与 openpyxl 一致: 含小数点或指数的按 float, 否则按 int
+    if '.' in text or 'E' in text or 'e' in text:
+        return float(text)
+    return int(text)
+
+
+def _text(elem):
+    """<si> / <is> 的文本: 拼接所有 run 的 <t>, 跳过注音 <rPh>"""
+    parts = []
+    for child in elem:
+        if child.tag == _T:
+            parts.append(child.text or '')
+        elif child.tag != _RPH:
+            parts.extend(t.text or '' for t in child.iter(_T))
+    return ''.join(parts)
+
+
+class Sheet:
+    """与 openpyxl worksheet 兼容的最小接口: title + iter_rows(values_only=True)"""
+
+    def __init__(self, book, title):
+        self.book = book
+        self.title = title
+
+    def iter_rows(self, min_row=1, values_only=True):
+        if not values_only:
+            raise WorkbookError('只支持 values_only=True')
+        for r, row in enumerate(self.book.iter_rows(self.title), start=1):
+            if r >= min_row:
+                yield row
+
+
+class BaseReader(abc.ABC):
+    """读取后端的公共接口; 子类实现 sheetnames / iter_rows, 需要释放资源时覆盖 close"""
+    name = ''
+    formats = ()
+
+    @classmethod
+    def available(cls):
+        return True
+
+    def __init__(self, path):
+        self.path = path
+
+    @property
+    @abc.abstractmethod
+    def sheetnames(self):
+        """sheet 名列表, 顺序与工作簿中一致"""
+
+    @abc.abstractmethod
+    def iter_rows(self, sheet):
+        """逐行返回值元组; 空行也会返回 (全为 None), 行号与 Excel 行号一一对应"""
+
+    def close(self):
+        pass
+
+    def __getitem__(self, sheet):
+        if sheet not in self.sheetnames:
+            raise KeyError(f'Worksheet {sheet} does not exist.')
+        return Sheet(self, sheet)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class XmlReader(BaseReader):
+    name = 'xml'
+    formats = ('xlsx',)
+
+    def __init__(self, path):
+        super().__init__(path)
+        self._zf = zipfile.ZipFile(path)
+        self._paths = _sheet_xml_paths(self._zf)
+        self._strings = None
+
+    @property
+    def sheetnames(self):
+        return list(self._paths)
+
+    def shared_strings(self):
+        if self._strings is None:
+            self._strings = []
+            path = _shared_strings_path(self._zf)
+            if path in self._zf.NameToInfo:
+                with self._zf.open(path) as f:
+                    for _, elem in ET.iterparse(f):
+                        if elem.tag == _SI:
+                            self._strings.append(_text(elem))
+                            elem.clear()
+        return self._strings
+
+    def _value(self, c):
+        kind = c.get('t', 'n')
+        if kind == 'inlineStr':
+            inline = c.find(_IS)
+            return _text(inline) if inline is not None else None
+        v = c.find(_V)
+        if v is None or v.text is None:
+            return None
+        if kind == 'n':
+            return _number(v.text)
+        if kind == 's':
+            return self.shared_strings()[int(v.text)]
+        if kind == 'b':
+            return v.text == '1'
+        # str (公式字符串结果) / e (错误值) / d (ISO 日期)
+        return v.text
+
+    def iter_rows(self, sheet):
+        width = 0
+        expected = 1
+        sheet_data = None
+        with self._zf.open(self._paths[sheet]) as f:
+            for event, elem in ET.iterparse(f, events=('start', 'end')):
+                if event == 'start':
+                    if elem.tag == _SHEET_DATA:
+                        sheet_data = elem
+                    continue
+                if elem.tag == _DIMENSION:
+                    last = (elem.get('ref') or 'A1').split(':')[-1]
+                    width = column_index(last.rstrip('0123456789'))
+                elif elem.tag == _ROW:
+                    row_num = int(elem.get('r', expected))
+                    values = [None] * width
+                    col = 0
+                    for c in elem.iter(_C):
+                        ref = c.get('r')
+                        col = column_index(ref.rstrip('0123456789')) if ref else col + 1
+                        if col > len(values):
+                            values.extend([None] * (col - len(values)))
+                        values[col - 1] = self._value(c)
+                    while expected < row_num:
+                        yield (None,) * width
+                        expected += 1
+                    yield tuple(values)
+                    expected = row_num + 1
+                    # 已输出的行从 sheetData 中移除, 保证内存占用与行数无关
+                    if sheet_data is not None:
+                        sheet_data.clear()
+
+    def close(self):
+        self._zf.close()
+
+
+class OpenpyxlReader(BaseReader):
+    name = 'openpyxl'
+    formats = ('xlsx',)
+
+    @classmethod
+    def available(cls):
+        return importlib.util.find_spec('openpyxl') is not None
+
+    def __init__(self, path):
+        super().__init__(path)
+        import openpyxl
+        # 传文件对象: openpyxl 会按扩展名拒绝 .xlsx.disabled 之类的文件
+        self._fp = open(path, 'rb')
+        self._wb = openpyxl.load_workbook(self._fp, read_only=True, data_only=True)
+
+    @property
+    def sheetnames(self):
+        return self._wb.sheetnames
+
+    def iter_rows(self, sheet):
+        yield from self._wb[sheet].iter_rows(values_only=True)
+
+    def close(self):
+        self._wb.close()
+        self._fp.close()
+
+
+class XlrdReader(BaseReader):
+    name = 'xlrd'
+    formats = ('xls',)
+
+    @classmethod
+    def available(cls):
+        return importlib.util.find_spec('xlrd') is not None
+
+    def __init__(self, path):
+        super().__init__(path)
+        import xlrd
+        self._xlrd = xlrd
+        # on_demand: 只在访问某个 sheet 时才解析它
+        self._book = xlrd.open_workbook(path, on_demand=True)
+
+    @property
+    def sheetnames(self):
+        return self._book.sheet_names()
+
+    def _value(self, cell):
+        xlrd = self._xlrd
+        if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+            return None
+        if cell.ctype == xlrd.XL_CELL_NUMBER:
+            # BIFF 中数字都是 double, 整数值还原为 int, 与 xlsx 后端一致
+            return int(cell.value) if cell.value.is_integer() else cell.value
+        if cell.ctype == xlrd.XL_CELL_BOOLEAN:
+            return bool(cell.value)
+        if cell.ctype == xlrd.XL_CELL_ERROR:
+            return xlrd.error_text_from_code.get(cell.value)
+        return cell.value
+
+    def iter_rows(self, sheet):
+        ws = self._book.sheet_by_name(sheet)
+        try:
+            for r in range(ws.nrows):
+                values = [self._value(cell) for cell in ws.row(r)]
+                values.extend([None] * (ws.ncols - len(values)))
+                yield tuple(values)
+        finally:
+            self._book.unload_sheet(sheet)
+
+    def close(self):
+        self._book.release_resources()
+
+
+# 同一格式下按速度从快到慢排列 (见 bench 子命令的结果)
+BACKENDS = [XmlReader, OpenpyxlReader, XlrdReader]
+BACKENDS_BY_NAME = {cls.name: cls for cls in BACKENDS}
+
+
+def backends_for(fmt):
+    return [cls for cls in BACKENDS if fmt in cls.formats and cls.available()]
+
+
+def open_workbook(path, backend='auto'):
+    """打开工作簿; backend='auto' 时按文件格式选择最快的可用后端"""
+    fmt = detect_format(path)
+    if backend == 'auto':
+        candidates = backends_for(fmt)
+        if not candidates:
+            raise WorkbookError(f'没有可读取 {fmt} 的后端 (.xls 需要 pip install xlrd)')
+        return candidates[0](path)
+    cls = BACKENDS_BY_NAME.get(backend)
+    if cls is None:
+        raise WorkbookError(f'未知的后端: {backend} (可选: {", ".join(BACKENDS_BY_NAME)})')
+    if fmt not in cls.formats:
+        raise WorkbookError(f'{backend} 后端不支持 {fmt} 文件')
+    if not cls.available():
+        raise WorkbookError(f'{backend} 后端不可用, 请先安装对应的包')
+    return cls(path)
+
+
+def read_all(path, backend='auto'):
+    """读取整本工作簿: {sheet 名: [行元组]}"""
+    with open_workbook(path, backend) as wb:
+        return {name: list(wb.iter_rows(name)) for name in wb.sheetnames}
+
+
+# ---------------------------------------------------------------- CLI
+
+def _bench_one(path, cls, repeat):
+    """返回 (最快耗时秒, 峰值内存字节, 行数, 内容是否可比较的摘要)"""
+    best, rows, digest = None, 0, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with cls(path) as wb:
+            rows, h = 0, 0
+            for name in wb.sheetnames:
+                for row in wb.iter_rows(name):
+                    rows += 1
+                    h = hash((h, row))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        digest = h
+    tracemalloc.start()
+    with cls(path) as wb:
+        for name in wb.sheetnames:
+            for _ in wb.iter_rows(name):
+                pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak, rows, digest
+
+
+def _ljust(text, width):
+    # 中文按 2 个字符宽度对齐
+    return text + ' ' * (width - sum(2 if unicodedata.east_asian_width(ch) in 'WF' else 1 for ch in text))
+
+
+def bench(paths, repeat):
+    print(f'{_ljust("工作簿", 28)}{_ljust("后端", 10)}{"耗时(ms)":>10}{"峰值内存(KB)":>14}{"行数":>8}')
+    for path in paths:
+        label = _ljust(os.path.basename(path), 28)
+        try:
+            fmt = detect_format(path)
+        except WorkbookError as e:
+            print(f'{label}跳过: {e}')
+            continue
+        digests = set()
+        for cls in backends_for(fmt):
+            seconds, peak, rows, digest = _bench_one(path, cls, repeat)
+            digests.add(digest)
+            print(f'{label}{cls.name:<10}{seconds * 1000:>10.1f}{peak / 1024:>14.0f}{rows:>8}')
+        if len(digests) > 1:
+            print(f'{label}WARNING: 各后端读出的内容不一致')
+
+
+def default_bench_paths():
+    from sheet_utils import EXCELS_DIR
+    paths = list_workbooks(EXCELS_DIR)
+    disabled = [os.path.join(EXCELS_DIR, n) for n in sorted(os.listdir(EXCELS_DIR)) if n.endswith('.xlsx.disabled')]
+    return paths + disabled
+
+
+def main():
+    parser = argparse.ArgumentParser(description='工作簿读取后端: 查看内容 / 性能比较')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('dump', help='打印 sheet 内容 (制表符分隔)')
+    p.add_argument('workbook')
+    p.add_argument('sheet', nargs='?', help='sheet 名 (默认列出所有 sheet)')
+    p.add_argument('-b', '--backend', default='auto', help='xml / openpyxl / xlrd (默认自动选择)')
+
+    p = sub.add_parser('bench', help='比较各后端的读取耗时和峰值内存')
+    p.add_argument('workbooks', nargs='*', help='默认 excels/ 下的所有工作簿')
+    p.add_argument('-r', '--repeat', type=int, default=3, help='每个后端重复次数, 取最快一次')
+
+    args = parser.parse_args()
+    if args.command == 'bench':
+        bench(args.workbooks or default_bench_paths(), max(1, args.repeat))
+        return
+
+    try:
+        wb = open_workbook(args.workbook, args.backend)
+    except (WorkbookError, OSError, zipfile.BadZipFile) as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
+    with wb:
+        if not args.sheet:
+            print(f'[{wb.name}]')
+            for name in wb.sheetnames:
+                print(name)
+            return
+        if args.sheet not in wb.sheetnames:
+            print(f'ERROR: Sheet "{args.sheet}" not found')
+            sys.exit(1)
+        for row in wb.iter_rows(args.sheet):
+            print('\t'.join('' if v is None else str(v) for v in row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,368 @@
+"""
+直接修改 xlsx 中的单元格, 不经过 openpyxl 的整本重新序列化
+
+- 只重写被修改的 sheet XML (以及需要追加字符串时的 sharedStrings.xml)
+- 其他 zip 成员 (样式、其他 sheet、图片、数据验证、批注 ...) 按压缩后的原始字节复制
+- sheet XML 中只替换被修改的 <c> 元素, 其余内容 (列宽、条件格式、x14 扩展等) 原样保留
+- 被修改单元格保留原来的样式 (s 属性); 覆盖公式单元格时同时从 calcChain.xml 中移除
+
+用法:
+    patch_workbook('excels/单位表.xlsx', {'custom_units': {(3, 41): 200, (3, 2): '腐化猎犬'}})
+    python scripts/xlsx_patch.py excels/单位表.xlsx custom_units B3=腐化猎犬 AO3=200
+"""
+import argparse
+import os
+import re
+import struct
+import sys
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+
+from sheet_utils import NS_MAIN, _shared_strings_path, _sheet_xml_paths, coerce_value
+
+_SHEET_DATA = re.compile(rb'<sheetData\s*/>|<sheetData\b[^>]*>(.*?)</sheetData>', re.S)
+_ROW = re.compile(rb'<row\b([^>]*?)(?:/>|>(.*?)</row>)', re.S)
+_CELL = re.compile(rb'<c\b([^>]*?)(?:/>|>(.*?)</c>)', re.S)
+_ATTR = re.compile(rb'\s([\w:]+)="([^"]*)"')
+_CELL_REF = re.compile(r'^([A-Z]+)(\d+)$')
+_DIMENSION = re.compile(rb'<dimension\b[^>]*\bref="([^"]*)"[^>]*/>')
+
+
+class PatchError(ValueError):
+    pass
+
+
+def column_index(letters):
+    n = 0
+    for ch in letters:
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+def column_letter(col):
+    letters = ''
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def parse_ref(ref):
+    m = _CELL_REF.match(ref.upper())
+    if not m:
+        raise PatchError(f'无效的单元格地址: {ref}')
+    return int(m.group(2)), column_index(m.group(1))
+
+
+def escape(text):
+    # 与 xml.sax.saxutils.escape 相同; 那个模块会连带 import urllib, 拖慢 CLI 启动
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _attrs(raw):
+    return {k.decode(): v.decode() for k, v in _ATTR.findall(raw)}
+
+
+def _attr_bytes(attrs):
+    return b''.join(b' %s="%s"' % (k.encode(), v.encode()) for k, v in attrs.items())
+
+
+# ---------------------------------------------------------------- shared strings
+
+class SharedStrings:
+    """sharedStrings.xml 的追加写入: 复用已有的纯文本字符串, 新字符串追加到末尾"""
+
+    def __init__(self, data):
+        self.data = data
+        self._index = None
+        self._count = 0
+        self.added = []
+        self.refs = 0
+
+    def _load(self):
+        self._index = {}
+        if self.data is None:
+            return
+        root = ET.fromstring(self.data)
+        for i, si in enumerate(root.iter(NS_MAIN + 'si')):
+            t = si.find(NS_MAIN + 't')
+            # 富文本 (<r> 片段) 不参与复用
+            if t is not None and si.find(NS_MAIN + 'r') is None:
+                self._index.setdefault(t.text or '', i)
+            self._count = i + 1
+
+    def index(self, text):
+        if self._index is None:
+            self._load()
+        self.refs += 1
+        if text not in self._index:
+            self._index[text] = self._count + len(self.added)
+            self.added.append(text)
+        return self._index[text]
+
+    def render(self):
+        """返回新的 sharedStrings.xml, 没有追加时返回 None"""
+        if not self.added:
+            return None
+        items = []
+        for text in self.added:
+            space = ' xml:space="preserve"' if text != text.strip() or '\n' in text else ''
+            items.append(f'<si><t{space}>{escape(text)}</t></si>')
+        data = self.data.replace(b'</sst>', ''.join(items).encode('utf-8') + b'</sst>', 1)
+
+        def bump(m):
+            attrs = _attrs(m.group(1))
+            if 'uniqueCount' in attrs:
+                attrs['uniqueCount'] = str(int(attrs['uniqueCount']) + len(self.added))
+            if 'count' in attrs:
+                attrs['count'] = str(int(attrs['count']) + self.refs)
+            return b'<sst' + _attr_bytes(attrs) + b'>'
+        return re.sub(rb'<sst\b([^>]*)>', bump, data, count=1)
+
+
+# ---------------------------------------------------------------- sheet xml
+
+def _cell_xml(ref, value, style, strings):
+    attrs = {'r': ref}
+    if style is not None:
+        attrs['s'] = style
+    if value is None or value == '':
+        return b'<c' + _attr_bytes(attrs) + b'/>'
+    if isinstance(value, bool):
+        attrs['t'] = 'b'
+        body = '1' if value else '0'
+    elif isinstance(value, (int, float)):
+        body = repr(int(value)) if isinstance(value, float) and value.is_integer() and abs(value) < 1e15 else repr(value)
+    elif strings is not None:
+        attrs['t'] = 's'
+        body = str(strings.index(str(value)))
+    else:
+        # 工作簿没有共享字符串表时写内联字符串, 不新增 zip 成员
+        attrs['t'] = 'inlineStr'
+        text = str(value)
+        space = ' xml:space="preserve"' if text != text.strip() else ''
+        return b'<c' + _attr_bytes(attrs) + f'><is><t{space}>{escape(text)}</t></is></c>'.encode('utf-8')
+    return b'<c' + _attr_bytes(attrs) + b'><v>' + body.encode() + b'</v></c>'
+
+
+def _patch_row(row_num, attrs_raw, body, cells, strings, formulas):
+    """重写一行, cells: {列号: 值}"""
+    attrs = _attrs(attrs_raw)
+    attrs['r'] = str(row_num)
+    # spans 只是提示, 新增列后可能不准确, 直接去掉
+    attrs.pop('spans', None)
+
+    out, pending = [], dict(cells)
+    col = 0
+    for m in _CELL.finditer(body or b''):
+        c_attrs = _attrs(m.group(1))
+        col = column_index(_CELL_REF.match(c_attrs['r']).group(1)) if 'r' in c_attrs else col + 1
+        # 插入位于当前单元格之前的新单元格
+        for new_col in sorted(c for c in pending if c < col):
+            out.append(_cell_xml(f'{column_letter(new_col)}{row_num}', pending.pop(new_col), None, strings))
+        if col in pending:
+            if m.group(2) and b'<f' in m.group(2):
+                formulas.append(f'{column_letter(col)}{row_num}')
+            out.append(_cell_xml(f'{column_letter(col)}{row_num}', pending.pop(col), c_attrs.get('s'), strings))
+        else:
+            out.append(m.group(0))
+    for new_col in sorted(pending):
+        out.append(_cell_xml(f'{column_letter(new_col)}{row_num}', pending[new_col], None, strings))
+    return b'<row' + _attr_bytes(attrs) + b'>' + b''.join(out) + b'</row>'
+
+
+def patch_sheet_xml(data, edits, strings):
+    """
+    edits: {(row, col): value}
+    返回 (新的 sheet XML, 被覆盖的公式单元格列表)
+    """
+    by_row = {}
+    for (row, col), value in edits.items():
+        by_row.setdefault(row, {})[col] = value
+
+    m = _SHEET_DATA.search(data)
+    if not m:
+        raise PatchError('找不到 <sheetData>')
+    body = m.group(1) or b''
+
+    out, formulas = [], []
+    row_num = 0
+    for rm in _ROW.finditer(body):
+        attrs = _attrs(rm.group(1))
+        row_num = int(attrs['r']) if 'r' in attrs else row_num + 1
+        for new_row in sorted(r for r in by_row if r < row_num):
+            out.append(_patch_row(new_row, b'', b'', by_row.pop(new_row), strings, formulas))
+        if row_num in by_row:
+            out.append(_patch_row(row_num, rm.group(1), rm.group(2), by_row.pop(row_num), strings, formulas))
+        else:
+            out.append(rm.group(0))
+    for new_row in sorted(by_row):
+        out.append(_patch_row(new_row, b'', b'', by_row[new_row], strings, formulas))
+
+    new_data = data[:m.start()] + b'<sheetData>' + b''.join(out) + b'</sheetData>' + data[m.end():]
+    return _update_dimension(new_data, edits), formulas
+
+
+def _update_dimension(data, edits):
+    m = _DIMENSION.search(data)
+    if not m or not edits:
+        return data
+    ref = m.group(1).decode()
+    parts = ref.split(':')
+    try:
+        r1, c1 = parse_ref(parts[0])
+        r2, c2 = parse_ref(parts[-1])
+    except PatchError:
+        return data
+    max_row = max([r2] + [r for r, _ in edits])
+    max_col = max([c2] + [c for _, c in edits])
+    if (max_row, max_col) == (r2, c2):
+        return data
+    new_ref = f'{column_letter(c1)}{r1}:{column_letter(max_col)}{max_row}'.encode()
+    return data[:m.start(1)] + new_ref + data[m.end(1):]
+
+
+def _strip_calc_chain(data, sheet_id, cells):
+    """从 calcChain.xml 中移除被覆盖的公式单元格"""
+    targets = set(cells)
+    state = {'i': '', 'carry': False}
+
+    def keep(m):
+        attrs = _attrs(m.group(1))
+        explicit = 'i' in attrs
+        # calcChain 中省略 i 表示与上一条相同
+        state['i'] = attrs.get('i', state['i'])
+        if state['i'] == sheet_id and attrs.get('r') in targets:
+            # 被删除的条目带有 i 时, 下一条保留的条目需要补上
+            state['carry'] = state['carry'] or explicit
+            return b''
+        if state['carry'] and not explicit:
+            attrs['i'] = state['i']
+            state['carry'] = False
+            return b'<c' + _attr_bytes(attrs) + b'/>'
+        state['carry'] = False
+        return m.group(0)
+    return re.sub(rb'<c\b([^>]*)/>', keep, data)
+
+
+# ---------------------------------------------------------------- zip
+
+def _copy_raw(src_fp, zin_info, zout):
+    """
+    把一个 zip 成员的压缩数据原样复制到 zout
+    zipfile 没有公开的原始复制接口, 这里手动写本地文件头 + 压缩数据, 再登记到 zout 的中央目录
+    """
+    src_fp.seek(zin_info.header_offset)
+    header = src_fp.read(30)
+    name_len, extra_len = struct.unpack('<HH', header[26:30])
+    src_fp.seek(zin_info.header_offset + 30 + name_len + extra_len)
+    raw = src_fp.read(zin_info.compress_size)
+
+    info = zipfile.ZipInfo(zin_info.filename, zin_info.date_time)
+    for attr in ('compress_type', 'comment', 'extra', 'create_system', 'create_version',
+                 'extract_version', 'external_attr', 'internal_attr', 'CRC', 'compress_size', 'file_size'):
+        setattr(info, attr, getattr(zin_info, attr))
+    # 大小和 CRC 已写在本地文件头里, 不再需要数据描述符
+    info.flag_bits = zin_info.flag_bits & ~0x08
+    info.header_offset = zout.fp.tell()
+    zout.fp.write(info.FileHeader())
+    zout.fp.write(raw)
+    zout.filelist.append(info)
+    zout.NameToInfo[info.filename] = info
+    zout.start_dir = zout.fp.tell()
+
+
+def _sheet_ids(zf):
+    workbook = ET.fromstring(zf.read('xl/workbook.xml'))
+    return {s.get('name'): s.get('sheetId') for s in workbook.iter(NS_MAIN + 'sheet')}
+
+
+def patch_workbook(path, edits, out_path=None):
+    """
+    edits: {sheet 名: {(row, col): value}}, value 为 None 表示清空 (保留样式)
+    返回重写的 zip 成员列表
+    """
+    out_path = out_path or path
+    edits = {sheet: cells for sheet, cells in edits.items() if cells}
+    if not edits:
+        return []
+
+    with zipfile.ZipFile(path) as zin:
+        sheet_paths = _sheet_xml_paths(zin)
+        missing = [s for s in edits if s not in sheet_paths]
+        if missing:
+            raise PatchError(f'找不到 sheet: {", ".join(missing)}')
+
+        sst_path = _shared_strings_path(zin)
+        strings = SharedStrings(zin.read(sst_path)) if sst_path in zin.NameToInfo else None
+
+        replaced, formulas = {}, {}
+        for sheet, cells in edits.items():
+            member = sheet_paths[sheet]
+            replaced[member], formulas[sheet] = patch_sheet_xml(zin.read(member), cells, strings)
+
+        if strings is not None:
+            sst = strings.render()
+            if sst is not None:
+                replaced[sst_path] = sst
+        if any(formulas.values()) and 'xl/calcChain.xml' in zin.NameToInfo:
+            ids = _sheet_ids(zin)
+            chain = zin.read('xl/calcChain.xml')
+            for sheet, cells in formulas.items():
+                if cells:
+                    chain = _strip_calc_chain(chain, ids.get(sheet), cells)
+            replaced['xl/calcChain.xml'] = chain
+
+        fd, tmp_path = tempfile.mkstemp(suffix='.xlsx', dir=os.path.dirname(os.path.abspath(out_path)))
+        os.close(fd)
+        try:
+            with open(path, 'rb') as src_fp, zipfile.ZipFile(tmp_path, 'w') as zout:
+                for info in zin.infolist():
+                    if info.filename in replaced:
+                        new_info = zipfile.ZipInfo(info.filename, info.date_time)
+                        new_info.compress_type = zipfile.ZIP_DEFLATED
+                        new_info.external_attr = info.external_attr
+                        zout.writestr(new_info, replaced[info.filename])
+                    else:
+                        _copy_raw(src_fp, info, zout)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    try:
+        os.replace(tmp_path, out_path)
+    finally:
+        # 替换失败 (如 Windows 上 Excel 正占用该文件) 时删除临时文件, 否则 excels/ 中会留下一个会被 sheet_2_kv 读取的 tmp*.xlsx
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return sorted(replaced)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='直接修改 xlsx 单元格 (不重写整本工作簿)')
+    parser.add_argument('workbook', help='xlsx 路径')
+    parser.add_argument('sheet', help='sheet 名')
+    parser.add_argument('cells', nargs='+', help='单元格赋值, 如 B3=腐化猎犬 AO3=200 C5= (清空)')
+    parser.add_argument('-o', '--output', help='输出路径 (默认覆盖原文件)')
+    parser.add_argument('--text', action='store_true', help='数字也按文本写入')
+    args = parser.parse_args()
+
+    cells = {}
+    for item in args.cells:
+        ref, sep, text = item.partition('=')
+        if not sep:
+            print(f'ERROR: 格式应为 REF=VALUE: {item}')
+            sys.exit(1)
+        cells[parse_ref(ref)] = text if args.text else coerce_value(text)
+
+    try:
+        members = patch_workbook(args.workbook, {args.sheet: cells}, args.output)
+    except (PatchError, KeyError, zipfile.BadZipFile) as e:
+        print(f'ERROR: {e}')
+        sys.exit(1)
+    print(f'已修改 {len(cells)} 个单元格, 重写 {", ".join(members)}')
+
+
+if __name__ == '__main__':
+    main()